@@ -1,75 +1,117 @@
+import os
+import sys
+
 import swisseph as swe
-from datetime import datetime
-import pytz
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, "gazetteer"))
+
+from timezoneResolver import resolve_timezone, utc_offset
+from fixedLongitude import NAKSHATRAS, RASHIS, nakshatra_index, rashi_index, to_mas
 
 # Set Lahiri ayanamsa for Vedic astrology
 swe.set_sid_mode(swe.SIDM_LAHIRI)
 
-def get_planetary_positions(date, time, latitude, longitude):
-    # Convert to Julian Day (astronomical time format)
-    dt = datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M:%S")
-    dt = pytz.timezone('Asia/Kolkata').localize(dt)
-    dt_utc = dt.astimezone(pytz.UTC)
-    
-    jd = swe.julday(
-        dt_utc.year, 
-        dt_utc.month, 
-        dt_utc.day,
-        dt_utc.hour + dt_utc.minute / 60.0 + dt_utc.second / 3600.0
-    )
-    
-    # Calculate positions for all planets
-    planets = {
-        'Sun': swe.SUN,
-        'Moon': swe.MOON,
-        'Mars': swe.MARS,
-        'Mercury': swe.MERCURY,
-        'Jupiter': swe.JUPITER,
-        'Venus': swe.VENUS,
-        'Saturn': swe.SATURN,
-        'Rahu': swe.TRUE_NODE,  # North Node
-        'Ketu': swe.TRUE_NODE   # South Node (180° from Rahu)
+# Planets used throughout the app, in display order
+PLANET_IDS = {
+    'Sun': swe.SUN,
+    'Moon': swe.MOON,
+    'Mars': swe.MARS,
+    'Mercury': swe.MERCURY,
+    'Jupiter': swe.JUPITER,
+    'Venus': swe.VENUS,
+    'Saturn': swe.SATURN,
+    'Rahu': swe.TRUE_NODE,  # North Node
+    'Ketu': swe.TRUE_NODE   # South Node (180° from Rahu)
+}
+
+# Classical combustion orbs (degrees from the Sun); Mercury and Venus
+# have narrower ones while retrograde. The Sun and the nodes are never combust.
+COMBUSTION_ORBS = {'Moon': 12, 'Mars': 17, 'Mercury': 14, 'Jupiter': 11, 'Venus': 10, 'Saturn': 15}
+RETROGRADE_COMBUSTION_ORBS = {'Mercury': 12, 'Venus': 8}
+
+def get_julian_day(date, time, timezone):
+    """
+    Local date and time strings -> Julian Day (UT). timezone is an IANA
+    name (historical offsets apply) or a fixed UTC offset in hours.
+    """
+    year, month, day = (int(p) for p in date.split("-"))
+    h, m, s = (int(p) for p in time.split(":"))
+    local_hours = h + m / 60.0 + s / 3600.0
+    return swe.julday(year, month, day, local_hours - utc_offset(timezone, date, time))
+
+def get_tropical_longitudes(jd):
+    """Ecliptic longitude of every planet in PLANET_IDS at one instant"""
+    longitudes = {}
+    rahu = None
+    for planet_name, planet_id in PLANET_IDS.items():
+        if planet_name == 'Ketu':
+            longitudes[planet_name] = (rahu + 180) % 360  # Opposite of Rahu
+            continue
+        longitude = swe.calc_ut(jd, planet_id)[0][0]  # Degrees (0-360)
+        if planet_name == 'Rahu':
+            rahu = longitude
+        longitudes[planet_name] = longitude
+    return longitudes
+
+def get_tropical_motion(jd):
+    """(longitude, speed in degrees/day) of every planet in PLANET_IDS at one instant"""
+    motion = {}
+    for planet_name, planet_id in PLANET_IDS.items():
+        if planet_name == 'Ketu':
+            rahu, speed = motion['Rahu']
+            motion[planet_name] = ((rahu + 180) % 360, speed)
+            continue
+        position = swe.calc_ut(jd, planet_id, swe.FLG_SPEED)[0]
+        motion[planet_name] = (position[0], position[3])
+    return motion
+
+def combustion_orb(planet, retrograde=False):
+    """Combustion orb of a planet in degrees, None for the Sun and the nodes"""
+    if retrograde and planet in RETROGRADE_COMBUSTION_ORBS:
+        return RETROGRADE_COMBUSTION_ORBS[planet]
+    return COMBUSTION_ORBS.get(planet)
+
+def motion_state(planet, longitude, speed, sun_longitude):
+    """Speed, retrograde flag, distance from the Sun and combust flag of a planet"""
+    retrograde = speed < 0
+    sun_distance = abs((longitude - sun_longitude + 180) % 360 - 180)
+    orb = combustion_orb(planet, retrograde)
+    return {
+        'speed': speed,
+        'retrograde': retrograde,
+        'sun_distance': sun_distance,
+        'combust': orb is not None and sun_distance < orb
     }
+
+def get_planetary_positions(date, time, latitude, longitude, timezone=None):
+    # Convert to Julian Day (astronomical time format); the local time is in
+    # `timezone`, or the zone resolved from the coordinates
+    if timezone is None:
+        timezone = resolve_timezone(latitude, longitude)
+    jd = get_julian_day(date, time, timezone)
     
+    motion = get_tropical_motion(jd)
+    sun_longitude = motion['Sun'][0]
     positions = {}
-    for planet_name, planet_id in planets.items():
-        # Get ecliptic longitude
-        result = swe.calc_ut(jd, planet_id)
-        longitude = result[0][0]  # Degrees (0-360)
-        
-        if planet_name == 'Ketu':
-            longitude = (longitude + 180) % 360  # Opposite of Rahu
-        
+    for planet_name, (planet_longitude, speed) in motion.items():
         positions[planet_name] = {
-            'longitude': longitude,
-            'rashi': get_rashi(longitude),
-            'nakshatra': get_nakshatra(longitude),
-            'degrees': longitude % 30  # Degrees within sign
+            'longitude': planet_longitude,
+            'rashi': get_rashi(planet_longitude),
+            'nakshatra': get_nakshatra(planet_longitude),
+            'degrees': planet_longitude % 30,  # Degrees within sign
+            **motion_state(planet_name, planet_longitude, speed, sun_longitude)
         }
     
     return positions
 
 def get_rashi(longitude):
     """Convert longitude to Rashi (zodiac sign)"""
-    rashis = [
-        'Aries', 'Taurus', 'Gemini', 'Cancer', 
-        'Leo', 'Virgo', 'Libra', 'Scorpio',
-        'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces'
-    ]
-    return rashis[int(longitude / 30)]
+    return RASHIS[rashi_index(to_mas(longitude))]
 
 def get_nakshatra(longitude):
-    """Convert longitude to Nakshatra (lunar mansion)"""
-    nakshatras = [
-        'Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira',
-        'Ardra', 'Punarvasu', 'Pushya', 'Ashlesha', 'Magha',
-        'Purva Phalguni', 'Uttara Phalguni', 'Hasta', 'Chitra',
-        'Swati', 'Vishakha', 'Anuradha', 'Jyeshtha', 'Mula',
-        'Purva Ashadha', 'Uttara Ashadha', 'Shravana', 'Dhanishta',
-        'Shatabhisha', 'Purva Bhadrapada', 'Uttara Bhadrapada', 'Revati'
-    ]
-    # Each nakshatra spans 13°20' (13.333°)
-    return nakshatras[int(longitude / 13.333333)]
+    """Convert longitude to Nakshatra (lunar mansion), exact at the 13°20' boundaries"""
+    return NAKSHATRAS[nakshatra_index(to_mas(longitude))]
 
 if __name__ == "__main__":
     data = get_planetary_positions(
@@ -0,0 +1,185 @@
+"""
+ephemerisPool.py
+----------------
+Ephemeris service backed by a pool of pre-initialized worker processes.
+
+swisseph keeps its configuration (sidereal mode, ephemeris path, topocentric
+position) in global C state, so changing it from one Streamlit session
+thread affects every other session. Here each configuration lives in its
+own worker processes, set once by the pool initializer, and callers only
+exchange plain job tuples and results with them.
+
+The Streamlit app does not go through the pool. Its charts are tropical, and
+after Swiss_Ephemeris sets Lahiri at import it never changes the swisseph
+configuration, so its direct calls are safe across session threads
+(ayanamsaComparison's brief mode switch is serialized by a lock). The pool is
+for scripts and batch tools that need another configuration (sidereal mode,
+ephemeris path, topocentric positions) or many positions in parallel.
+
+    with EphemerisService(sid_mode=swe.SIDM_RAMAN, sidereal=True) as eph:
+        futures = eph.submit([("calc_ut", jd, swe.MOON), ("houses", jd, 28.6, 77.2)])
+        moon, houses = eph.gather(futures)
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import swisseph as swe
+
+# Per-worker state, set once by _init_worker
+_WORKER_FLAGS = 0
+
+
+def _init_worker(sid_mode, ephe_path, sidereal, topo):
+    global _WORKER_FLAGS
+    # Swiss_Ephemeris sets Lahiri at import time; import it before applying
+    # this worker's own configuration so it cannot override it later
+    import Swiss_Ephemeris  # noqa: F401
+    if ephe_path:
+        swe.set_ephe_path(ephe_path)
+    swe.set_sid_mode(sid_mode, 0, 0)
+    flags = swe.FLG_SWIEPH | swe.FLG_SPEED
+    if sidereal:
+        flags |= swe.FLG_SIDEREAL
+    if topo:
+        swe.set_topo(*topo)
+        flags |= swe.FLG_TOPOCTR
+    _WORKER_FLAGS = flags
+
+
+def _job_calc_ut(jd, planet_id):
+    return swe.calc_ut(jd, planet_id, _WORKER_FLAGS)[0]
+
+
+def _job_houses(jd, latitude, longitude, hsys=b'P'):
+    flags = swe.FLG_SIDEREAL if _WORKER_FLAGS & swe.FLG_SIDEREAL else 0
+    return swe.houses_ex(jd, latitude, longitude, hsys, flags)
+
+
+def _job_ayanamsa(jd):
+    return swe.get_ayanamsa_ut(jd)
+
+
+def _job_positions(date, time, latitude, longitude, timezone=None):
+    from Swiss_Ephemeris import get_planetary_positions
+    return get_planetary_positions(date, time, latitude, longitude, timezone)
+
+
+JOBS = {
+    "calc_ut": _job_calc_ut,
+    "houses": _job_houses,
+    "ayanamsa": _job_ayanamsa,
+    "positions": _job_positions,
+}
+
+
+def _run_batch(jobs):
+    """Worker: run a batch of (kind, *args) jobs, one IPC round trip per batch"""
+    return [JOBS[job[0]](*job[1:]) for job in jobs]
+
+
+class EphemerisService:
+    """
+    Pool of worker processes sharing one swisseph configuration.
+
+    submit() accepts a list of job tuples, splits it into batches and
+    returns futures; gather() flattens the batch results back into input
+    order. Jobs: ("calc_ut", jd, planet_id), ("houses", jd, lat, lon[, hsys]),
+    ("ayanamsa", jd), ("positions", date, time, lat, lon).
+    """
+
+    def __init__(self, workers=None, sid_mode=swe.SIDM_LAHIRI, ephe_path=None,
+                 sidereal=False, topo=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.config = (sid_mode, ephe_path, sidereal, tuple(topo) if topo else None)
+        # spawn: never fork a multi-threaded (Streamlit) process
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=self.config
+        )
+
+    def submit(self, jobs, batch_size=None):
+        """Submit jobs in batches; returns one future per batch"""
+        jobs = list(jobs)
+        for job in jobs:
+            if job[0] not in JOBS:
+                raise ValueError(f"Unknown ephemeris job {job[0]!r}")
+        if batch_size is None:
+            batch_size = max(1, -(-len(jobs) // (self.workers * 4)))
+        return [
+            self._pool.submit(_run_batch, jobs[i:i + batch_size])
+            for i in range(0, len(jobs), batch_size)
+        ]
+
+    @staticmethod
+    def gather(futures):
+        """Wait for submitted batches and return all results in job order"""
+        results = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def run(self, jobs, batch_size=None):
+        """submit + gather"""
+        return self.gather(self.submit(jobs, batch_size))
+
+    def warm_up(self):
+        """Start every worker process now instead of on first use"""
+        self.run([("ayanamsa", 2451545.0)] * self.workers, batch_size=1)
+        return self
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+
+_services = {}
+_services_lock = threading.Lock()
+
+
+def get_service(workers=None, sid_mode=swe.SIDM_LAHIRI, ephe_path=None,
+                sidereal=False, topo=None):
+    """
+    Process-wide shared service per configuration, so concurrent sessions
+    reuse warm workers instead of starting their own pools
+    """
+    key = (workers, sid_mode, ephe_path, sidereal, tuple(topo) if topo else None)
+    with _services_lock:
+        service = _services.get(key)
+        if service is None:
+            service = EphemerisService(workers, sid_mode, ephe_path, sidereal, topo)
+            _services[key] = service
+        return service
+
+
+if __name__ == "__main__":
+    import time
+
+    jd0 = swe.julday(1995, 8, 15, 5.0)
+    jobs = [("calc_ut", jd0 + i * 0.01, p) for i in range(20000) for p in (swe.SUN, swe.MOON)]
+
+    start = time.perf_counter()
+    for job in jobs:
+        swe.calc_ut(job[1], job[2], swe.FLG_SWIEPH | swe.FLG_SPEED)
+    print(f"in-process: {len(jobs) / (time.perf_counter() - start):,.0f} calc/s")
+
+    for n in sorted({1, os.cpu_count() or 1}):
+        with EphemerisService(workers=n, sidereal=True) as eph:
+            eph.warm_up()
+            start = time.perf_counter()
+            eph.run(jobs)
+            print(f"{n} worker(s): {len(jobs) / (time.perf_counter() - start):,.0f} calc/s")
+
+    with EphemerisService(workers=1, sid_mode=swe.SIDM_RAMAN, sidereal=True) as raman, \
+            EphemerisService(workers=1, sid_mode=swe.SIDM_LAHIRI, sidereal=True) as lahiri:
+        print("Moon (Raman): ", raman.run([("calc_ut", jd0, swe.MOON)])[0][0])
+        print("Moon (Lahiri):", lahiri.run([("calc_ut", jd0, swe.MOON)])[0][0])
@@ -0,0 +1,177 @@
+"""
+fixedLongitude.py
+-----------------
+Canonical fixed-point longitudes: integer milli-arcseconds (mas) in
+[0, FULL_CIRCLE). A full circle is 1,296,000,000 mas, which fits int32,
+and every division the app uses (sign 30°, nakshatra 13°20', pada and
+navamsa 3°20', tithi 12°, karana 6°) is a whole number of mas, so the
+classifications below are exact integer divisions.
+
+Every kernel takes either a Python int or a numpy integer array from
+to_mas() and returns the same kind, so single charts and vectorized
+sweeps share one implementation.
+"""
+
+import numpy as np
+
+MAS_PER_DEGREE = 3_600_000
+FULL_CIRCLE = 360 * MAS_PER_DEGREE
+RASHI_SPAN = 30 * MAS_PER_DEGREE
+NAKSHATRA_SPAN = FULL_CIRCLE // 27      # 13°20'
+PADA_SPAN = NAKSHATRA_SPAN // 4         # 3°20', also one navamsa
+TITHI_SPAN = 12 * MAS_PER_DEGREE
+KARANA_SPAN = TITHI_SPAN // 2
+
+# Storage type for bulk longitude arrays
+LONGITUDE_DTYPE = np.int32
+
+RASHIS = [
+    "Aries", "Taurus", "Gemini", "Cancer",
+    "Leo", "Virgo", "Libra", "Scorpio",
+    "Sagittarius", "Capricorn", "Aquarius", "Pisces"
+]
+
+NAKSHATRAS = [
+    "Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashira",
+    "Ardra", "Punarvasu", "Pushya", "Ashlesha",
+    "Magha", "Purva Phalguni", "Uttara Phalguni",
+    "Hasta", "Chitra", "Swati", "Vishakha",
+    "Anuradha", "Jyeshtha", "Mula",
+    "Purva Ashadha", "Uttara Ashadha", "Shravana",
+    "Dhanishta", "Shatabhisha",
+    "Purva Bhadrapada", "Uttara Bhadrapada", "Revati"
+]
+
+
+def to_mas(degrees):
+    """Degrees (float or array, any range) -> mas in [0, FULL_CIRCLE), rounded to nearest"""
+    if np.ndim(degrees) == 0:
+        return int(round(float(degrees) * MAS_PER_DEGREE)) % FULL_CIRCLE
+    mas = np.rint(np.asarray(degrees, dtype=float) * MAS_PER_DEGREE).astype(np.int64)
+    return (mas % FULL_CIRCLE).astype(LONGITUDE_DTYPE)
+
+
+def to_degrees(mas):
+    return mas / MAS_PER_DEGREE
+
+
+def _wide(mas):
+    # Sums of two longitudes overflow int32
+    return mas.astype(np.int64) if isinstance(mas, np.ndarray) else mas
+
+
+def rashi_index(mas):
+    """Sign 0..11 (RASHIS)"""
+    return mas // RASHI_SPAN
+
+
+def nakshatra_index(mas):
+    """Nakshatra 0..26 (NAKSHATRAS)"""
+    return mas // NAKSHATRA_SPAN
+
+
+def pada(mas):
+    """Quarter of the nakshatra, 1..4"""
+    return mas // PADA_SPAN % 4 + 1
+
+
+def navamsa_index(mas):
+    """D9 sign 0..11: the navamsas run on from Aries through the zodiac"""
+    return mas // PADA_SPAN % 12
+
+
+def degrees_in_sign(mas):
+    return (mas % RASHI_SPAN) / MAS_PER_DEGREE
+
+
+def house_number(mas, lagna_mas):
+    """House 1..12 counted in whole 30° spans from the ascendant degree"""
+    return (_wide(mas) - lagna_mas) % FULL_CIRCLE // RASHI_SPAN + 1
+
+
+# Trimsamsa (D30): ends of the unequal parts within a sign and the signs
+# they map to (Mars, Saturn, Jupiter, Mercury, Venus in odd signs; reversed in even)
+_TRIMSAMSA_ODD_ENDS = np.array([5, 10, 18, 25]) * MAS_PER_DEGREE
+_TRIMSAMSA_ODD_SIGNS = np.array([0, 10, 8, 2, 6])
+_TRIMSAMSA_EVEN_ENDS = np.array([5, 12, 20, 25]) * MAS_PER_DEGREE
+_TRIMSAMSA_EVEN_SIGNS = np.array([1, 5, 11, 9, 7])
+
+
+def varga_index(mas, division):
+    """
+    Sign 0..11 of a longitude in divisional chart D`division`
+    (Parashari rules for D1, D2, D3, D7, D9, D12 and D30)
+    """
+    sign = mas // RASHI_SPAN
+    offset = mas % RASHI_SPAN
+    if division == 1:
+        return sign
+    if division == 2:
+        # Hora: odd signs Sun (Leo) then Moon (Cancer), even signs reversed
+        first_half = offset < RASHI_SPAN // 2
+        odd = sign % 2 == 0
+        hora = np.where(first_half == odd, 4, 3)
+        return hora if isinstance(mas, np.ndarray) else int(hora)
+    if division == 3:
+        # Drekkana: the sign itself, its 5th, its 9th
+        return (sign + 4 * (offset // (RASHI_SPAN // 3))) % 12
+    if division == 7:
+        # Saptamsa: odd signs count from the sign itself, even signs from its 7th
+        return (sign + 6 * (sign % 2) + offset * 7 // RASHI_SPAN) % 12
+    if division == 9:
+        return navamsa_index(mas)
+    if division == 12:
+        return (sign + offset // (RASHI_SPAN // 12)) % 12
+    if division == 30:
+        odd = sign % 2 == 0
+        trimsamsa = np.where(
+            odd,
+            _TRIMSAMSA_ODD_SIGNS[np.searchsorted(_TRIMSAMSA_ODD_ENDS, offset, side='right')],
+            _TRIMSAMSA_EVEN_SIGNS[np.searchsorted(_TRIMSAMSA_EVEN_ENDS, offset, side='right')]
+        )
+        return trimsamsa if isinstance(mas, np.ndarray) else int(trimsamsa)
+    raise ValueError(f"Unsupported divisional chart D{division}")
+
+
+def tithi_number(moon_mas, sun_mas):
+    """Tithi 1..30 from the Moon-Sun elongation"""
+    return (_wide(moon_mas) - sun_mas) % FULL_CIRCLE // TITHI_SPAN + 1
+
+
+def karana_number(moon_mas, sun_mas):
+    """Half-tithi 0..59 from the Moon-Sun elongation"""
+    return (_wide(moon_mas) - sun_mas) % FULL_CIRCLE // KARANA_SPAN
+
+
+def yoga_index(moon_mas, sun_mas):
+    """Yoga 0..26 from the sum of the Moon and Sun longitudes"""
+    return (_wide(moon_mas) + sun_mas) % FULL_CIRCLE // NAKSHATRA_SPAN
+
+
+def classify(mas):
+    """Rashi, nakshatra, pada and navamsa of one longitude or an array of them"""
+    return {
+        'rashi': rashi_index(mas),
+        'nakshatra': nakshatra_index(mas),
+        'pada': pada(mas),
+        'navamsa': navamsa_index(mas)
+    }
+
+
+if __name__ == "__main__":
+    import time
+
+    for degrees in (0.0, 13.333333, 13 + 1 / 3, 26.666666, 359.9999999, 123.456789):
+        mas = to_mas(degrees)
+        c = classify(mas)
+        print(f"{degrees:>14.7f}° = {mas:>13,} mas  {RASHIS[c['rashi']]:<11} "
+              f"{NAKSHATRAS[c['nakshatra']]:<17} pada {c['pada']}  D9 {RASHIS[c['navamsa']]}")
+
+    rng = np.random.default_rng(0)
+    longitudes = rng.uniform(0, 360, 10_000_000)
+    start = time.perf_counter()
+    mas = to_mas(longitudes)
+    codes = classify(mas)
+    elapsed = time.perf_counter() - start
+    print(f"\n{len(mas):,} longitudes -> int32 ({mas.nbytes / 1e6:.0f} MB vs "
+          f"{longitudes.nbytes / 1e6:.0f} MB float64), classified in {elapsed:.2f} s")
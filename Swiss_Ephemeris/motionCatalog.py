@@ -0,0 +1,280 @@
+"""
+motionCatalog.py
+----------------
+Retrograde stations and combustion intervals of the planets over
+centuries, computed once and served from one binary file.
+
+Build (offline, ~1 minute for 1800-2200):
+    python Swiss_Ephemeris/motionCatalog.py build --start 1800 --years 400 \
+        --output motion_catalog.bin
+
+Serve:
+    catalog = MotionCatalog("motion_catalog.bin")
+    catalog.is_retrograde("Mercury", jd)        # JD (UT) or array of JDs
+    catalog.next_retrograde("Mercury", jd)      # (station retrograde, station direct)
+
+File layout (little-endian):
+    header   24 bytes   magic, version, planets, first JD, last JD
+    index    12 bytes per CATALOG_PLANETS entry: station count, combustion
+             bound count, retrograde at the first JD, 3 bytes padding
+    arrays   float64 JDs, per planet its stations then its combustion bounds
+
+Stations alternate between retrograde and direct, and combustion bounds
+between start and end (combust at the first JD opens at the first JD). Both
+are sorted, so every query is a searchsorted: an instant is inside an
+interval when an odd number of bounds precede it.
+
+Events are found from daily samples of the speed, and of the distance to
+the Sun less the orb (COMBUSTION_ORBS, narrower for retrograde Mercury and
+Venus). They are then refined by bisection to under a second.
+"""
+
+import argparse
+import mmap
+import os
+import struct
+
+import numpy as np
+import swisseph as swe
+
+from Swiss_Ephemeris import COMBUSTION_ORBS, PLANET_IDS, RETROGRADE_COMBUSTION_ORBS, get_tropical_motion, motion_state
+
+MAGIC = b"VAMC"
+VERSION = 1
+HEADER = struct.Struct("<4sHHdd")
+INDEX = struct.Struct("<II?3x")
+
+# Planets with a combustion orb; all but the Moon also station
+CATALOG_PLANETS = list(COMBUSTION_ORBS)
+STATION_PLANETS = [p for p in CATALOG_PLANETS if p != 'Moon']
+
+SAMPLE_STEP = 1.0         # days; shorter than any retrograde or combustion spell
+BISECTION_STEPS = 17      # 1 day / 2**17 ~ 0.7 s
+
+
+def _motion(planet, jds):
+    """(longitude, speed) arrays of a planet at many JDs"""
+    planet_id = PLANET_IDS[planet]
+    rows = np.array([swe.calc_ut(jd, planet_id, swe.FLG_SPEED)[0][:4:3] for jd in jds]).reshape(-1, 2)
+    return rows[:, 0], rows[:, 1]
+
+
+def _speed(planet, jds):
+    return _motion(planet, jds)[1]
+
+
+def _margin(planet, longitude, speed, sun):
+    """Distance from the Sun less the orb: negative while combust"""
+    orb = np.where(speed < 0, RETROGRADE_COMBUSTION_ORBS.get(planet, COMBUSTION_ORBS[planet]),
+                   COMBUSTION_ORBS[planet])
+    return np.abs((longitude - sun + 180) % 360 - 180) - orb
+
+
+def _combustion_margin(planet, jds):
+    return _margin(planet, *_motion(planet, jds), _motion('Sun', jds)[0])
+
+
+def _crossings(fn, jds, values):
+    """Refined instants where values (fn sampled at jds) change sign"""
+    negative = values < 0
+    k = np.flatnonzero(negative[1:] != negative[:-1])
+    lo, hi = jds[k], jds[k + 1]
+    lo_negative = negative[k]
+    for _ in range(BISECTION_STEPS):
+        mid = (lo + hi) / 2
+        same = (fn(mid) < 0) == lo_negative
+        lo = np.where(same, mid, lo)
+        hi = np.where(same, hi, mid)
+    return (lo + hi) / 2
+
+
+def compute_events(start_jd, end_jd):
+    """
+    {planet: (stations, combustion bounds, retrograde at start_jd)} between
+    two JDs (UT), each array sorted
+    """
+    jds = np.arange(start_jd, end_jd + SAMPLE_STEP / 2, SAMPLE_STEP)
+    sun = _motion('Sun', jds)[0]
+    events = {}
+    for planet in CATALOG_PLANETS:
+        longitude, speed = _motion(planet, jds)
+        if planet in STATION_PLANETS:
+            stations = _crossings(lambda t: _speed(planet, t), jds, speed)
+            retrograde = bool(speed[0] < 0)
+        else:
+            stations, retrograde = np.empty(0), False
+
+        margin = _margin(planet, longitude, speed, sun)
+        bounds = _crossings(lambda t: _combustion_margin(planet, t), jds, margin)
+        if margin[0] < 0:
+            bounds = np.concatenate(([start_jd], bounds))
+        events[planet] = (stations, bounds, retrograde)
+    return events
+
+
+def build_catalog(start_year, years, path):
+    """Compute the events from 1 January start_year for `years` years and write the catalog file"""
+    first = swe.julday(start_year, 1, 1, 0.0)
+    last = swe.julday(start_year + years, 1, 1, 0.0)
+    events = compute_events(first, last)
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(CATALOG_PLANETS), first, last))
+        for planet in CATALOG_PLANETS:
+            stations, bounds, retrograde = events[planet]
+            f.write(INDEX.pack(len(stations), len(bounds), retrograde))
+        for planet in CATALOG_PLANETS:
+            stations, bounds, _ = events[planet]
+            f.write(stations.astype('<f8').tobytes())
+            f.write(bounds.astype('<f8').tobytes())
+    os.replace(tmp, path)
+    return path
+
+
+class MotionCatalog:
+    """Read-only, memory-mapped catalog; every query is a binary search"""
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, self.first_jd, self.last_jd = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION or count != len(CATALOG_PLANETS):
+            raise ValueError(f"{path} is not a version {VERSION} motion catalog")
+
+        self.stations, self.bounds, self._retrograde_at_start = {}, {}, {}
+        offset = HEADER.size + INDEX.size * count
+        for i, planet in enumerate(CATALOG_PLANETS):
+            n_stations, n_bounds, retrograde = INDEX.unpack_from(self._mmap, HEADER.size + INDEX.size * i)
+            self.stations[planet] = np.frombuffer(self._mmap, '<f8', n_stations, offset)
+            offset += 8 * n_stations
+            bounds = np.frombuffer(self._mmap, '<f8', n_bounds, offset)
+            offset += 8 * n_bounds
+            # A spell still open at the end closes at last_jd
+            self.bounds[planet] = np.append(bounds, self.last_jd) if n_bounds % 2 else bounds
+            self._retrograde_at_start[planet] = retrograde
+
+    def _check(self, planet, jd):
+        if planet not in self.stations:
+            raise KeyError(f"{planet} is not in the motion catalog")
+        jd = np.asarray(jd, dtype=float)
+        if np.any((jd < self.first_jd) | (jd > self.last_jd)):
+            raise ValueError(f"JD outside the catalog ({self.first_jd} - {self.last_jd})")
+        return jd
+
+    def is_retrograde(self, planet, jd):
+        jd = self._check(planet, jd)
+        passed = np.searchsorted(self.stations[planet], jd, side='right')
+        return (passed % 2 == 1) != self._retrograde_at_start[planet]
+
+    def is_combust(self, planet, jd):
+        jd = self._check(planet, jd)
+        return np.searchsorted(self.bounds[planet], jd, side='right') % 2 == 1
+
+    def flags(self, jd):
+        """{planet: {'retrograde', 'combust'}} at one JD or (bool arrays) at many"""
+        return {
+            planet: {'retrograde': self.is_retrograde(planet, jd), 'combust': self.is_combust(planet, jd)}
+            for planet in CATALOG_PLANETS
+        }
+
+    def next_retrograde(self, planet, jd):
+        """
+        (start, end) JDs of the first retrograde spell starting after jd;
+        NaN past the end of the catalog (end alone if it runs past it)
+        """
+        jd = self._check(planet, jd)
+        stations = np.append(self.stations[planet], [np.nan] * 3)
+        # The next station turns the planet retrograde unless it already is
+        i = np.searchsorted(self.stations[planet], jd, side='right') + self.is_retrograde(planet, jd)
+        return stations[i], stations[i + 1]
+
+    def combustion_intervals(self, planet, start_jd, end_jd):
+        """[(start, end)] of the combustion spells overlapping a JD range"""
+        spells = self.bounds[planet].reshape(-1, 2)
+        first = np.searchsorted(spells[:, 1], start_jd, side='right')
+        last = np.searchsorted(spells[:, 0], end_jd, side='left')
+        return [(float(a), float(b)) for a, b in spells[first:last]]
+
+    def close(self):
+        self.stations = self.bounds = None
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def cross_check(catalog, samples=20_000, seed=0):
+    """Disagreements between catalog lookups and motion_state() at random instants"""
+    rng = np.random.default_rng(seed)
+    jds = rng.uniform(catalog.first_jd, catalog.last_jd, samples)
+    flags = catalog.flags(jds)
+    mismatches = 0
+    for i, jd in enumerate(jds):
+        motion = get_tropical_motion(jd)
+        for planet in CATALOG_PLANETS:
+            state = motion_state(planet, *motion[planet], motion['Sun'][0])
+            mismatches += (state['retrograde'] != flags[planet]['retrograde'][i]
+                           or state['combust'] != flags[planet]['combust'][i])
+    return mismatches
+
+
+def _date(jd):
+    if np.isnan(jd):
+        return "-"
+    year, month, day, hours = swe.revjul(float(jd))
+    return f"{year:04d}-{month:02d}-{day:02d} {int(hours):02d}:{int(hours * 60 % 60):02d} UT"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the retrograde / combustion catalog")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Precompute stations and combustion intervals")
+    build.add_argument("--start", type=int, default=1800, help="First year")
+    build.add_argument("--years", type=int, default=400)
+    build.add_argument("--output", required=True)
+
+    query = sub.add_parser("query", help="Flags and next retrograde spells at one instant")
+    query.add_argument("--catalog", required=True)
+    query.add_argument("--date", required=True, help="YYYY-MM-DD (0h UT)")
+
+    check = sub.add_parser("check", help="Compare lookups with direct computation at random instants")
+    check.add_argument("--catalog", required=True)
+    check.add_argument("--samples", type=int, default=20_000)
+
+    args = parser.parse_args()
+    if args.command == "build":
+        import time
+        start = time.perf_counter()
+        build_catalog(args.start, args.years, args.output)
+        print(f"Wrote {args.output}: {args.start}-{args.start + args.years} "
+              f"({os.path.getsize(args.output):,} bytes) in {time.perf_counter() - start:.1f} s")
+    elif args.command == "check":
+        import time
+        with MotionCatalog(args.catalog) as catalog:
+            jds = np.random.default_rng(1).uniform(catalog.first_jd, catalog.last_jd, 1_000_000)
+            start = time.perf_counter()
+            catalog.flags(jds)
+            elapsed = time.perf_counter() - start
+            print(f"Flags of {len(CATALOG_PLANETS)} planets at {len(jds):,} instants: {elapsed * 1e3:.0f} ms")
+            mismatches = cross_check(catalog, args.samples)
+            print(f"Mismatches against motion_state(): {mismatches} of {args.samples * len(CATALOG_PLANETS):,}")
+    else:
+        year, month, day = (int(p) for p in args.date.split("-"))
+        jd = swe.julday(year, month, day, 0.0)
+        with MotionCatalog(args.catalog) as catalog:
+            for planet, flags in catalog.flags(jd).items():
+                line = f"{planet:<8} retrograde={bool(flags['retrograde'])!s:<5} combust={bool(flags['combust'])!s:<5}"
+                if planet in STATION_PLANETS:
+                    start, end = catalog.next_retrograde(planet, jd)
+                    line += f"  next retrograde {_date(start)} -> {_date(end)}"
+                print(line)
+
+
+if __name__ == "__main__":
+    main()
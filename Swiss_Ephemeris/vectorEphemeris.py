@@ -0,0 +1,110 @@
+"""
+vectorEphemeris.py
+------------------
+NumPy kernels for evaluating a chart at many instants of the same day
+(or many locations at the same instant) without one swisseph call per
+sample.
+
+- Planet longitudes: swisseph is evaluated at a handful of Chebyshev
+  nodes spanning the window and interpolated; over a window of a day the
+  interpolation error is far below an arcsecond.
+- Ascendant / MC: ARMC is linear in time, so the closed-form ascendant
+  formula is vectorized over time and/or latitude/longitude arrays.
+"""
+
+import numpy as np
+import swisseph as swe
+
+from Swiss_Ephemeris import PLANET_IDS, get_tropical_longitudes
+from fixedLongitude import house_number, to_mas
+
+PLANETS = list(PLANET_IDS)
+SIDEREAL_DEG_PER_DAY = 360.98564736629
+
+# Chebyshev nodes per interpolation window
+_NODES = 9
+
+
+def true_obliquity(jd):
+    return swe.calc_ut(jd, swe.ECL_NUT)[0][0]
+
+
+def armc_at(jd, longitudes):
+    """ARMC in degrees for scalar/array jd and geographic longitude(s)"""
+    return (swe.sidtime(jd) * 15 + np.asarray(longitudes, dtype=float)) % 360
+
+
+def armc_series(jds, longitude, jd_ref=None):
+    """ARMC for an array of JDs, from one sidereal-time evaluation"""
+    jds = np.asarray(jds, dtype=float)
+    jd_ref = float(np.median(jds)) if jd_ref is None else jd_ref
+    return (swe.sidtime(jd_ref) * 15 + longitude
+            + SIDEREAL_DEG_PER_DAY * (jds - jd_ref)) % 360
+
+
+def ascendant_from_armc(armc, latitude, eps):
+    """
+    Tropical ascendant (degrees), vectorized over any broadcastable
+    armc / latitude arrays. Same value swe.houses() returns as ascmc[0].
+    """
+    ramc = np.radians(armc)
+    phi = np.radians(latitude)
+    e = np.radians(eps)
+    asc = np.degrees(np.arctan2(
+        np.cos(ramc),
+        -(np.sin(ramc) * np.cos(e) + np.tan(phi) * np.sin(e))
+    ))
+    # Inside the polar circles the formula can yield the descendant;
+    # like swisseph, keep the ascendant on the eastern side of the MC
+    west = ((asc - midheaven_from_armc(armc, eps) + 180) % 360 - 180) < 0
+    return (asc + np.where(west, 180, 0)) % 360
+
+
+def midheaven_from_armc(armc, eps):
+    """Tropical MC (degrees), vectorized"""
+    ramc = np.radians(armc)
+    mc = np.degrees(np.arctan2(np.sin(ramc), np.cos(ramc) * np.cos(np.radians(eps))))
+    return mc % 360
+
+
+def longitude_interpolator(jd_start, jd_end):
+    """
+    Fit every planet over [jd_start, jd_end] (at most about a day) once and
+    return a function jds -> tropical longitudes, shape (9, N) in PLANETS
+    order. Reuse it when the same window is evaluated repeatedly.
+    """
+    lo, hi = float(jd_start), float(jd_end)
+    if hi - lo < 1e-9:
+        exact = np.array([get_tropical_longitudes(lo)[p] for p in PLANETS])
+        return lambda jds: np.repeat(exact[:, None], len(np.atleast_1d(jds)), axis=1)
+
+    mid, half = (lo + hi) / 2, (hi - lo) / 2
+    k = np.arange(_NODES)
+    nodes = mid + half * np.cos(np.pi * (2 * k + 1) / (2 * _NODES))
+    samples = [get_tropical_longitudes(jd) for jd in nodes]
+    samples = np.unwrap(np.array([[s[p] for s in samples] for p in PLANETS]),
+                        period=360, axis=1)
+    coeffs = [
+        np.polynomial.chebyshev.chebfit((nodes - mid) / half, samples[i], _NODES - 1)
+        for i in range(len(PLANETS))
+    ]
+
+    def evaluate(jds):
+        x = (np.atleast_1d(np.asarray(jds, dtype=float)) - mid) / half
+        return np.array([np.polynomial.chebyshev.chebval(x, c) for c in coeffs]) % 360
+
+    return evaluate
+
+
+def planet_longitudes(jds):
+    """
+    Tropical longitudes, shape (9, N) in PLANETS order, for an array of JDs
+    spanning at most about a day.
+    """
+    jds = np.asarray(jds, dtype=float)
+    return longitude_interpolator(jds.min(), jds.max())(jds)
+
+
+def house_numbers(planet_longitudes_deg, ascendant_deg):
+    """Whole-30° houses from the ascendant (as assign_planets_to_houses), 1..12"""
+    return house_number(to_mas(planet_longitudes_deg), to_mas(ascendant_deg)).astype(np.int8)
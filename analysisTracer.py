@@ -0,0 +1,319 @@
+"""
+analysisTracer.py
+-----------------
+Structured tracing spans for the analysis pipeline (compute, DB, LLM).
+Spans are written as OpenTelemetry (OTLP/JSON) lines by a background
+file exporter, so tracing works offline and never blocks a request.
+NO Streamlit code should exist in this file.
+
+Configuration (environment variables):
+    VEDICAI_TRACE_FILE         path of the JSONL export file (tracing is off when unset)
+    VEDICAI_TRACE_SAMPLE_RATE  fraction of analyses to trace, 0.0 - 1.0 (default 1.0)
+"""
+
+import atexit
+import json
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+SERVICE_NAME = "vedicai"
+SCOPE_NAME = "vedicai.analysis"
+
+# OTLP enum values
+SPAN_KIND_INTERNAL = 1
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_current_span = ContextVar("vedicai_current_span", default=None)
+
+
+def new_trace_id():
+    """Random 128-bit trace id as 32 hex chars (OTLP/JSON encoding)"""
+    return f"{random.getrandbits(128):032x}"
+
+
+def _new_span_id():
+    return f"{random.getrandbits(64):016x}"
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes):
+    return [{"key": k, "value": _otlp_value(v)} for k, v in attributes.items()]
+
+
+class Span:
+    """A single timed operation inside a trace"""
+
+    __slots__ = (
+        "trace_id", "span_id", "parent_span_id", "name", "attributes",
+        "events", "status", "status_message", "start_ns", "end_ns"
+    )
+
+    def __init__(self, name, trace_id, parent_span_id=None, attributes=None):
+        self.trace_id = trace_id
+        self.span_id = _new_span_id()
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.attributes = dict(attributes) if attributes else {}
+        self.events = []
+        self.status = STATUS_UNSET
+        self.status_message = ""
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+
+    recording = True
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def add_event(self, name, **attributes):
+        self.events.append((time.time_ns(), name, attributes))
+
+    def record_exception(self, exc):
+        self.status = STATUS_ERROR
+        self.status_message = f"{type(exc).__name__}: {exc}"
+        self.add_event(
+            "exception",
+            **{"exception.type": type(exc).__name__, "exception.message": str(exc)}
+        )
+
+    def to_otlp(self):
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": SPAN_KIND_INTERNAL,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": self.status}
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        if self.events:
+            span["events"] = [
+                {
+                    "timeUnixNano": str(ts),
+                    "name": name,
+                    "attributes": _otlp_attributes(attrs)
+                }
+                for ts, name, attrs in self.events
+            ]
+        return span
+
+
+class _NoopSpan:
+    """Returned when tracing is disabled or the trace was not sampled"""
+
+    __slots__ = ()
+
+    recording = False
+    trace_id = None
+    span_id = None
+
+    def set_attribute(self, key, value):
+        pass
+
+    def add_event(self, name, **attributes):
+        pass
+
+    def record_exception(self, exc):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class FileSpanExporter:
+    """
+    Non-blocking exporter: spans are queued by the request thread and
+    written in batches by a daemon thread. When the queue is full, spans
+    are dropped (and counted) rather than slowing down the request.
+    """
+
+    def __init__(self, path, max_queue=10000, batch_size=256, flush_interval=1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(
+            target=self._run, name="vedicai-trace-exporter", daemon=True
+        )
+        self._thread.start()
+
+    def export(self, span):
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            batch = []
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            if item is None:
+                return
+            batch.append(item)
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._write(batch)
+            if stop:
+                return
+
+    def _write(self, spans):
+        payload = {
+            "resourceSpans": [{
+                "resource": {
+                    "attributes": _otlp_attributes({"service.name": SERVICE_NAME})
+                },
+                "scopeSpans": [{
+                    "scope": {"name": SCOPE_NAME},
+                    "spans": [s.to_otlp() for s in spans]
+                }]
+            }]
+        }
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(payload, separators=(",", ":")) + "\n")
+        except OSError:
+            self.dropped += len(spans)
+
+    def shutdown(self, timeout=2.0):
+        """Flush queued spans and stop the writer thread"""
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+
+class Tracer:
+    """Creates traces and spans and hands finished spans to an exporter"""
+
+    def __init__(self, exporter=None, sample_rate=1.0):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    @property
+    def enabled(self):
+        return self.exporter is not None and self.sample_rate > 0
+
+    def is_sampled(self, trace_id):
+        """
+        Deterministic sampling decision from the trace id, so that every
+        rerun of the same analysis makes the same decision
+        """
+        if not self.enabled:
+            return False
+        if self.sample_rate >= 1.0:
+            return True
+        return int(trace_id[-8:], 16) / 0xFFFFFFFF < self.sample_rate
+
+    @contextmanager
+    def start_trace(self, name, trace_id=None, **attributes):
+        """Open the root span of an analysis (or resume one by trace_id)"""
+        trace_id = trace_id or new_trace_id()
+        if not self.is_sampled(trace_id):
+            token = _current_span.set(NOOP_SPAN)
+            try:
+                yield NOOP_SPAN
+            finally:
+                _current_span.reset(token)
+            return
+        with self._span(name, trace_id, None, attributes) as root:
+            yield root
+
+    @contextmanager
+    def span(self, name, **attributes):
+        """Open a child span of the current span (no-op outside a sampled trace)"""
+        parent = _current_span.get()
+        if parent is None or not parent.recording:
+            yield NOOP_SPAN
+            return
+        with self._span(name, parent.trace_id, parent.span_id, attributes) as child:
+            yield child
+
+    @contextmanager
+    def _span(self, name, trace_id, parent_span_id, attributes):
+        span = Span(name, trace_id, parent_span_id, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.record_exception(exc)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            if span.status == STATUS_UNSET:
+                span.status = STATUS_OK
+            self.exporter.export(span)
+
+
+def current_span():
+    """Span active in this thread/context (the no-op span if none)"""
+    return _current_span.get() or NOOP_SPAN
+
+
+def _tracer_from_env():
+    path = os.getenv("VEDICAI_TRACE_FILE")
+    if not path:
+        return Tracer()
+    try:
+        sample_rate = float(os.getenv("VEDICAI_TRACE_SAMPLE_RATE", "1.0"))
+    except ValueError:
+        sample_rate = 1.0
+    exporter = FileSpanExporter(path)
+    atexit.register(exporter.shutdown)
+    return Tracer(exporter, max(0.0, min(sample_rate, 1.0)))
+
+
+tracer = _tracer_from_env()
+start_trace = tracer.start_trace
+span = tracer.span
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    out_path = os.path.join(tempfile.gettempdir(), "vedicai_traces.jsonl")
+    demo_exporter = FileSpanExporter(out_path)
+    demo = Tracer(demo_exporter, sample_rate=1.0)
+
+    with demo.start_trace("analysis", user="Delhi demo") as root:
+        with demo.span("kundli.compute"):
+            time.sleep(0.01)
+        with demo.span("db.save") as s:
+            s.set_attribute("db.system", "postgresql")
+    demo_exporter.shutdown()
+
+    print(f"Trace {root.trace_id} written to {out_path}")
@@ -22,11 +22,22 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(os.path.join(BASE_DIR, "kundliGenerator"))
 sys.path.append(os.path.join(BASE_DIR, "dosha"))
 sys.path.append(os.path.join(BASE_DIR, "panchang"))
+sys.path.append(os.path.join(BASE_DIR, "gazetteer"))
 
-from GenerateKundli import generate_kundli, generate_kundli_chart
+from GenerateKundli import chart_longitudes, generate_kundli, generate_kundli_chart
+from compactChart import Chart
+from chartCodec import encode_result, encode_stream
 from doshaAnalyzer import detect_doshas
+from yogaDetector import detect_yogas, yogakaraka
+from ruleEngine import ordinal
 from dashaCalculator import calculate_vimshottari_dasha
 from panchangCalculator import calculate_panchang
+from dailyTimings import calculate_daily_timings
+from placeIndex import format_place, load_gazetteer
+from timezoneResolver import resolve_timezone
+from analysisTracer import new_trace_id, start_trace, span
+from kundliSvgRenderer import render_chart_svg
+from reportGenerator import render_report_pdf
 
 
 # =========================
@@ -52,33 +63,58 @@ def get_db_connection():
         return None
 
 
+@st.cache_resource(show_spinner=False)
+def ensure_db_schema(_conn):
+    """
+    Create / migrate vedicai_raw_data once per server process rather than on
+    every save. A failure raises, is not cached, and is retried next save.
+    """
+    cur = _conn.cursor()
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS vedicai_raw_data (
+            id SERIAL PRIMARY KEY,
+            user_name TEXT,
+            birth_details JSONB,
+            kundli_data JSONB,
+            dosha_data JSONB,
+            dasha_data JSONB,
+            panchang_data JSONB,
+            ai_insights JSONB,
+            longitudes_mas INTEGER[],
+            chart_record BYTEA,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+    # Tables created before the fixed-point longitude / binary chart columns
+    cur.execute("ALTER TABLE vedicai_raw_data ADD COLUMN IF NOT EXISTS longitudes_mas INTEGER[];")
+    cur.execute("ALTER TABLE vedicai_raw_data ADD COLUMN IF NOT EXISTS chart_record BYTEA;")
+    _conn.commit()
+    cur.close()
+    return True
+
+
 def save_raw_data_to_db(payload):
+    with span("db.save_raw_data", **{"db.system": "postgresql"}) as db_span:
+        return _save_raw_data_to_db(payload, db_span)
+
+
+def _save_raw_data_to_db(payload, db_span):
     conn = get_db_connection()
     if not conn:
+        db_span.set_attribute("db.connected", False)
         return False
     try:
+        ensure_db_schema(conn)
         cur = conn.cursor()
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS vedicai_raw_data (
-                id SERIAL PRIMARY KEY,
-                user_name TEXT,
-                birth_details JSONB,
-                kundli_data JSONB,
-                dosha_data JSONB,
-                dasha_data JSONB,
-                panchang_data JSONB,
-                ai_insights JSONB,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-        """)
         # Extract user_name from birth_details
         birth_details = payload.get('birth_details', {})
         user_name = birth_details.get('name', 'Unknown User')
         
         cur.execute(
             """INSERT INTO vedicai_raw_data 
-               (user_name, birth_details, kundli_data, dosha_data, dasha_data, panchang_data, ai_insights) 
-               VALUES (%s, %s, %s, %s, %s, %s, %s)""",
+               (user_name, birth_details, kundli_data, dosha_data, dasha_data, panchang_data, ai_insights,
+                longitudes_mas, chart_record) 
+               VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)""",
             (
                 user_name,
                 Json(birth_details),
@@ -86,31 +122,54 @@ def save_raw_data_to_db(payload):
                 Json(payload.get('dosha_data')),
                 Json(payload.get('dasha_data')),
                 Json(payload.get('panchang_data')),
-                Json(payload.get('ai_insights'))
+                Json(payload.get('ai_insights')),
+                chart_longitudes(payload['kundli_data']).tolist() if payload.get('kundli_data') else None,
+                # chartCodec record: kundli, doshas and dasha in ~180 bytes
+                psycopg2.Binary(encode_result(
+                    payload['kundli_data'], payload.get('dosha_data'), payload.get('dasha_data'), user_name
+                )) if payload.get('kundli_data') else None
             )
         )
         conn.commit()
         cur.close()
         conn.close()
-        print("[INFO] Raw data saved to PostgreSQL")
         return True
     except Exception as e:
+        db_span.record_exception(e)
         print("[ERROR] Failed to save raw data:", e)
         return False
 
 
+# =========================
+# Daily Timings (shared across sessions for the same day and place)
+# =========================
+@st.cache_data(max_entries=1024, show_spinner=False)
+def cached_daily_timings(date, latitude, longitude, timezone=None):
+    return calculate_daily_timings(date, {"latitude": latitude, "longitude": longitude}, timezone)
+
+
+# =========================
+# Birth Place Search (offline gazetteer, memory-mapped index)
+# =========================
+def search_places(query, limit=8):
+    return load_gazetteer().search(query, limit)
+
 
 # =========================
 # MASTER GEMINI INSIGHT (single call, multi-section)
 # =========================
 def generate_master_ai_insight(data, kundli):
-    print("[INFO] Starting Gemini AI master insight generation...")
     if "ai_master_insight" in st.session_state:
         return st.session_state["ai_master_insight"]
 
     if not client:
         return None
 
+    with span("llm.master_insight", **{"llm.model": "gemini-3-flash-preview"}) as llm_span:
+        return _generate_master_ai_insight(data, kundli, llm_span)
+
+
+def _generate_master_ai_insight(data, kundli, llm_span):
     prompt = f"""
 You are a calm, experienced Vedic astrologer speaking to a client.
 
@@ -151,15 +210,14 @@ Doshas: {", ".join(d['name'] for d in data['doshas']) or "None"}
 """
 
     try:
-        print("[INFO] Sending prompt to Gemini model...")
         response = client.models.generate_content(
             model="gemini-3-flash-preview",
             contents=prompt
         )
-        print("[INFO] Gemini AI response received, parsing sections...")
 
         # Check if response has content
         if not response or not response.text:
+            llm_span.add_event("empty_response")
             print("[ERROR] Gemini API returned empty response")
             return {}
         
@@ -172,10 +230,12 @@ Doshas: {", ".join(d['name'] for d in data['doshas']) or "None"}
             elif current:
                 sections[current] += line + "\n"
 
+        llm_span.set_attribute("llm.sections", len(sections))
         st.session_state["ai_master_insight"] = sections
         return sections
 
     except Exception as e:
+        llm_span.record_exception(e)
         print("[ERROR] Gemini AI failed:", e)
         return {}
 
@@ -302,48 +362,44 @@ with st.sidebar:
     
     st.subheader("📍 Birth Place")
 
-    st.markdown(
-    """
-    <div style="
-        background-color:#fee2e2;
-        border-left:6px solid #dc2626;
-        padding:10px 12px;
-        border-radius:8px;
-        color:#7f1d1d;
-        font-weight:600;
-        font-size:0.95rem;
-    ">
-        ℹ️ After entering the birth place click on search icon.
-    </div>
-    """,
-    unsafe_allow_html=True
-)
-
-    col1, col2 = st.columns([4, 1])
-    with col1:
-        place_name = st.text_input("Place Name *", placeholder="Enter your birth place", help="Place name is required")
-    with col2:
-        st.write("")  # Spacing
-        search_btn = st.button("🔍", help="Search for place coordinates on Google")
-    
-    if search_btn and place_name:
-        # Open Google search for latitude and longitude
-        search_url = f"https://www.google.com/search?q={place_name.replace(' ', '+')}+latitude+and+longitude"
-        st.markdown(f"[👉 Click here to search on Google]({search_url})")
-        st.info(f"📌 **Instructions:**\n1. Click the link above to search '{place_name} latitude and longitude'\n2. Google will show the coordinates in the results\n3. Copy the latitude and longitude values\n4. Paste them in the fields below")
-
-    latitude = st.number_input("Latitude *", placeholder=27.7081, format="%.4f", help="Latitude is required")
-
-    longitude = st.number_input("Longitude *", placeholder= 77.9367, format="%.4f", help="Longitude is required")
+    place_query = st.text_input("Place Name *", placeholder="Start typing your birth place",
+                                help="Matches come from the offline gazetteer; pick one to fill in the coordinates")
+    place_matches = search_places(place_query) if place_query.strip() else []
+
+    if place_matches:
+        choice = st.selectbox("Matching places", range(len(place_matches)),
+                              format_func=lambda i: format_place(place_matches[i]))
+        selected_place = place_matches[choice]
+        place_name = format_place(selected_place)
+        place_timezone = selected_place['timezone']
+        # Prefill the coordinates once per newly selected place; they stay editable
+        if st.session_state.get('selected_place') != place_name:
+            st.session_state['selected_place'] = place_name
+            st.session_state['latitude'] = selected_place['latitude']
+            st.session_state['longitude'] = selected_place['longitude']
+    else:
+        place_name = place_query
+        place_timezone = None
+        if place_query.strip():
+            st.caption("No match in the offline gazetteer, enter the coordinates below.")
+
+    # Empty until a place is picked or typed; 0 is a valid coordinate
+    latitude = st.number_input("Latitude *", min_value=-90.0, max_value=90.0, value=None,
+                               placeholder="27.7081", format="%.4f", key="latitude",
+                               help="Latitude is required")
+
+    longitude = st.number_input("Longitude *", min_value=-180.0, max_value=180.0, value=None,
+                                placeholder="77.9367", format="%.4f", key="longitude",
+                                help="Longitude is required")
     
     st.markdown("---")
     
     # Validate all required fields
     is_form_valid = (
         name and name.strip() != "" and
-        place_name and place_name.strip() != "Enter your birth place" and
-        latitude != 0 and
-        longitude != 0
+        place_name and place_name.strip() != "" and
+        latitude is not None and
+        longitude is not None
     )
     
     generate_btn = st.button("🔮 Generate Analysis", type="primary", use_container_width=True, disabled=not is_form_valid)
@@ -355,36 +411,51 @@ with st.sidebar:
 if generate_btn or 'analysis_done' in st.session_state:
     
     if generate_btn:
-        with st.spinner("🔄 Calculating planetary positions..."):
+        # One trace id per analysis, reused by later reruns (AI insights tab)
+        st.session_state['trace_id'] = new_trace_id()
+        with st.spinner("🔄 Calculating planetary positions..."), \
+                start_trace("analysis.generate", trace_id=st.session_state['trace_id']):
             # Prepare data
             birth_datetime = {
                 "date": birth_date.strftime("%Y-%m-%d"),
                 "time": birth_time.strftime("%H:%M:%S")
             }
             
+            # Birth time is local to the birth place: the selected place's
+            # zone, else the zone resolved from the coordinates
             birth_location = {
                 "name": place_name,
                 "latitude": latitude,
-                "longitude": longitude
+                "longitude": longitude,
+                "timezone": place_timezone or resolve_timezone(latitude, longitude)
             }
             
             # Generate Kundli
-            kundli = generate_kundli(birth_datetime, birth_location)
-            kundli_chart = generate_kundli_chart(kundli)
+            with span("compute.kundli"):
+                kundli = generate_kundli(birth_datetime, birth_location)
+                kundli_chart = generate_kundli_chart(kundli)
             
             # Dosha Analysis
-            doshas = detect_doshas(kundli)
+            with span("compute.doshas"):
+                doshas = detect_doshas(kundli)
+            
+            # Yogas
+            with span("compute.yogas"):
+                yogas = detect_yogas(kundli)
             
             # Dasha Analysis
-            dasha = calculate_vimshottari_dasha(kundli, datetime.now().strftime("%Y-%m-%d"))
+            with span("compute.dasha"):
+                dasha = calculate_vimshottari_dasha(kundli, datetime.now().strftime("%Y-%m-%d"))
             
             # Panchang
-            panchang = calculate_panchang(birth_date.strftime("%Y-%m-%d"), birth_location)
+            with span("compute.panchang"):
+                panchang = calculate_panchang(birth_date.strftime("%Y-%m-%d"), birth_location)
             
-            # Store in session state
-            st.session_state['kundli'] = kundli
+            # Store in session state (the chart packed; expanded again on each rerun)
+            st.session_state['kundli'] = Chart.from_kundli(kundli)
             st.session_state['kundli_chart'] = kundli_chart
             st.session_state['doshas'] = doshas
+            st.session_state['yogas'] = yogas
             st.session_state['dasha'] = dasha
             st.session_state['panchang'] = panchang
             st.session_state['birth_details'] = {
@@ -393,9 +464,20 @@ if generate_btn or 'analysis_done' in st.session_state:
                 'time': birth_time.strftime("%I:%M %p"),
                 'place': place_name,
                 'latitude': latitude,
-                'longitude': longitude
+                'longitude': longitude,
+                'timezone': birth_location['timezone']
             }
             st.session_state['analysis_done'] = True
+
+            # The PDF is built once here; reruns serve the cached bytes
+            with span("render.report_pdf"):
+                st.session_state['report_pdf'] = render_report_pdf({
+                    "birth_details": st.session_state['birth_details'],
+                    "kundli": kundli,
+                    "doshas": doshas,
+                    "dasha": dasha,
+                    "panchang": panchang
+                })
             
             # Auto-save raw data to database
             payload = {
@@ -410,9 +492,10 @@ if generate_btn or 'analysis_done' in st.session_state:
             st.success(f"✅ Data generated for {name}")
     
     # Retrieve from session state
-    kundli = st.session_state.get('kundli')
+    kundli = st.session_state['kundli'].to_dict()
     kundli_chart = st.session_state.get('kundli_chart')
     doshas = st.session_state.get('doshas')
+    yogas = st.session_state.get('yogas') or []
     dasha = st.session_state.get('dasha')
     panchang = st.session_state.get('panchang')
     birth_details = st.session_state.get('birth_details')
@@ -439,33 +522,16 @@ if generate_btn or 'analysis_done' in st.session_state:
         col1, col2 = st.columns([2, 1])
         
         with col1:
-            # Display North Indian (diamond-style) chart
-            h = kundli_chart["house_chart"]
-            lagna = kundli_chart["lagna"]
-
-            north_indian_chart = f"""
-                ┌───────────────┐
-                │  [12] {h[12]:<12} │
-        ┌───────┼───────────────┼───────┐
-        │ [11] {h[11]:<8} │               │ [1] {h[1]:<8} │
-        │               │   LAGNA        │               │
-        │               │ ({lagna})      │               │
-        ├───────────────┼───────────────┼───────────────┤
-        │ [10] {h[10]:<8} │               │ [2] {h[2]:<8} │
-        │               │               │               │
-        └───────┼───────────────┼───────┘
-                │  [7] {h[7]:<12} │
-        ┌───────┼───────────────┼───────┐
-        │ [8] {h[8]:<8} │               │ [6] {h[6]:<8} │
-        │               │               │               │
-        ├───────────────┼───────────────┼───────────────┤
-        │ [9] {h[9]:<8} │               │ [5] {h[5]:<8} │
-        │               │               │               │
-        └───────┼───────────────┼───────┘
-                │  [4] {h[4]:<12} │
-                └───────────────┘
-            """
-            st.code(north_indian_chart, language="text")
+            chart_style = st.radio(
+                "Chart Style",
+                ["North Indian", "South Indian", "East Indian"],
+                horizontal=True
+            )
+            style_key = chart_style.split()[0].lower()
+            st.markdown(
+                f'<div style="max-width:420px;">{render_chart_svg(kundli, style_key)}</div>',
+                unsafe_allow_html=True
+            )
         
         with col2:
             st.markdown("### 📋 Birth Details")
@@ -477,6 +543,13 @@ if generate_btn or 'analysis_done' in st.session_state:
             st.markdown("### 🌟 Ascendant (Lagna)")
             st.write(f"**Rashi:** {kundli['lagna']['rashi']}")
             st.write(f"**Nakshatra:** {kundli['lagna']['nakshatra']}")
+
+            st.download_button(
+                "📄 Download PDF Report",
+                data=st.session_state['report_pdf'],
+                file_name=f"vedicai_{birth_details['name'].strip().replace(' ', '_')}.pdf",
+                mime="application/pdf"
+            )
         
         # Planetary positions
         st.markdown("---")
@@ -489,7 +562,7 @@ if generate_btn or 'analysis_done' in st.session_state:
         with planets_col1:
             for planet, data in planet_list[:3]:
                 st.metric(
-                    label=planet,
+                    label=planet + (" (R)" if data.get('retrograde') else "") + (" combust" if data.get('combust') else ""),
                     value=data['rashi'],
                     delta=data['nakshatra']
                 )
@@ -497,7 +570,7 @@ if generate_btn or 'analysis_done' in st.session_state:
         with planets_col2:
             for planet, data in planet_list[3:6]:
                 st.metric(
-                    label=planet,
+                    label=planet + (" (R)" if data.get('retrograde') else "") + (" combust" if data.get('combust') else ""),
                     value=data['rashi'],
                     delta=data['nakshatra']
                 )
@@ -505,7 +578,7 @@ if generate_btn or 'analysis_done' in st.session_state:
         with planets_col3:
             for planet, data in planet_list[6:]:
                 st.metric(
-                    label=planet,
+                    label=planet + (" (R)" if data.get('retrograde') else "") + (" combust" if data.get('combust') else ""),
                     value=data['rashi'],
                     delta=data['nakshatra']
                 )
@@ -538,7 +611,7 @@ if generate_btn or 'analysis_done' in st.session_state:
                         st.info(f"**Current Phase:** {dosha['phase']}")
                     
                     if 'house' in dosha:
-                        st.write(f"**House Position:** {dosha['house']}th house")
+                        st.write(f"**House Position:** {ordinal(dosha['house'])} house")
                     
                     # Cancellations
                     if 'cancellations' in dosha and dosha['cancellations']:
@@ -550,6 +623,26 @@ if generate_btn or 'analysis_done' in st.session_state:
                     st.markdown("#### 📿 Suggested Remedies:")
                     for remedy in dosha['remedies']:
                         st.write(f"• {remedy}")
+        
+        st.subheader("🌟 Yogas")
+
+        karaka = yogakaraka(kundli)
+        if karaka:
+            st.caption(f"Yogakaraka for this Lagna: {karaka['description']}")
+        
+        if not yogas:
+            st.info("No classical yogas detected.")
+        
+        for yoga in yogas:
+            marker = '🌟' if yoga['nature'] == 'Auspicious' else '⚠️'
+            with st.expander(f"{marker} {yoga['name']} ({yoga['category']})"):
+                st.write(f"**Description:** {yoga['description']}")
+                for key in ('lords', 'planets'):
+                    if key in yoga:
+                        st.write(f"**{key.title()}:** {', '.join(yoga[key])}")
+                if 'cancellations' in yoga:
+                    st.write(f"**Cancellations:** {', '.join(yoga['cancellations'])}")
+                st.write(f"**Effect:** {yoga['effect']}")
     
     # TAB 3: Dasha Periods
     with tab3:
@@ -618,8 +711,34 @@ if generate_btn or 'analysis_done' in st.session_state:
             st.markdown("### ⏰ Sun Timings")
             st.write(f"**Sunrise:** {panchang['sunrise']}")
             st.write(f"**Sunset:** {panchang['sunset']}")
-            st.write(f"**Rahu Kaal:** Period {panchang['rahu_kaal']['period_index']}")
+            st.write(f"**Rahu Kaal:** {panchang['rahu_kaal']['start']} - {panchang['rahu_kaal']['end']}")
             st.caption(panchang['rahu_kaal']['note'])
+            st.write(f"**Yamaganda:** {panchang['yamaganda']['start']} - {panchang['yamaganda']['end']}")
+            st.write(f"**Gulika:** {panchang['gulika']['start']} - {panchang['gulika']['end']}")
+            st.write(f"**Abhijit Muhurta:** {panchang['abhijit']['start']} - {panchang['abhijit']['end']}")
+
+        timings = cached_daily_timings(
+            kundli['birth_details']['date'],
+            birth_details['latitude'],
+            birth_details['longitude'],
+            birth_details.get('timezone')
+        )
+        with st.expander("🕰️ Choghadiya & Hora"):
+            ch_col, hora_col = st.columns(2)
+            with ch_col:
+                st.markdown("**Choghadiya**")
+                st.table([
+                    {"Period": c['period'].title(), "Time": f"{c['start'][:5]} - {c['end'][:5]}",
+                     "Choghadiya": c['name'], "Nature": c['nature']}
+                    for c in timings['choghadiya']
+                ])
+            with hora_col:
+                st.markdown("**Hora**")
+                st.table([
+                    {"Period": h['period'].title(), "Time": f"{h['start'][:5]} - {h['end'][:5]}",
+                     "Lord": h['lord']}
+                    for h in timings['hora']
+                ])
 
     # TAB 5: Explanation (Gemini)
     # with tab5:
@@ -786,13 +905,12 @@ Other insights automatically fall back to **rule‑based human explanations**
 to keep the app fast, stable, and reliable.
 """)
 
-        with st.spinner("🤖 Generating deep AI insights (this may take a few seconds)..."):
-            print("[UI] Spinner shown: Generating AI insights")
+        with st.spinner("🤖 Generating deep AI insights (this may take a few seconds)..."), \
+                start_trace("analysis.ai_insights", trace_id=st.session_state.get('trace_id')):
             insights = generate_master_ai_insight(
                 {"dasha": dasha, "doshas": doshas},
                 kundli
             )
-            print("[UI] Spinner finished")
 
 
         def show_section(title, key):
@@ -856,6 +974,13 @@ to keep the app fast, stable, and reliable.
             "dasha": dasha,
             "panchang": panchang
         })
+        st.download_button(
+            "⬇️ Download binary chart record",
+            data=encode_stream([encode_result(kundli, doshas, dasha, birth_details['name'])]),
+            file_name=f"{birth_details['name']}_chart.vcst",
+            mime="application/octet-stream",
+            help="Compact chartCodec stream (kundli, doshas, dasha); read with chartCodec.iter_records"
+        )
 
 else:
     # Welcome screen
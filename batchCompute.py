@@ -0,0 +1,354 @@
+"""
+batchCompute.py
+---------------
+Bulk chart computation: streams birth records from CSV/JSONL, runs
+generate_kundli, detect_doshas, calculate_vimshottari_dasha (and optionally
+calculate_panchang) across a process pool and writes results in input order.
+NO Streamlit code should exist in this file.
+
+Output is JSONL (one file), Parquet (a directory of part files, needs
+pyarrow) or a binary chart stream (chartCodec; workers send the encoded
+records, not dicts). Progress is checkpointed after every chunk, so
+re-running the same command after an interruption resumes where it stopped.
+
+Usage:
+    python batchCompute.py --input archive.csv --output charts.jsonl --workers 8
+    python batchCompute.py --input archive.jsonl --output charts_parquet --format parquet --panchang
+    python batchCompute.py --input archive.csv --output charts.vcst --format binary
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BASE_DIR, "kundliGenerator"))
+sys.path.append(os.path.join(BASE_DIR, "dosha"))
+sys.path.append(os.path.join(BASE_DIR, "panchang"))
+
+from GenerateKundli import chart_longitudes, generate_kundli
+from doshaAnalyzer import detect_doshas
+from dashaCalculator import calculate_vimshottari_dasha
+from panchangCalculator import calculate_panchang
+from birthRecords import assign_utc_offsets, iter_birth_records, iter_chunks, to_birth_input
+from chartCodec import ChartStreamWriter, encode_error, encode_result
+
+CHECKPOINT_VERSION = 1
+DEFAULT_CHUNK_SIZE = 500
+
+
+def compute_record(index, record, current_date, with_panchang=False, birth_input=None):
+    """
+    Full computation for one raw record (or its prepared to_birth_input()
+    triple); errors are returned, not raised
+    """
+    try:
+        birth_datetime, birth_location, name = birth_input or to_birth_input(record)
+        kundli = generate_kundli(birth_datetime, birth_location)
+        result = {
+            "index": index,
+            "name": name,
+            "kundli": kundli,
+            # CHART_BODIES order, milli-arcseconds
+            "longitudes_mas": chart_longitudes(kundli).tolist(),
+            "doshas": detect_doshas(kundli),
+            "dasha": calculate_vimshottari_dasha(kundli, current_date)
+        }
+        if with_panchang:
+            result["panchang"] = calculate_panchang(birth_datetime["date"], birth_location)
+        return result
+    except Exception as e:
+        return {"index": index, "error": f"{type(e).__name__}: {e}"}
+
+
+def _prepare_chunk(records):
+    """to_birth_input() per record (None where it fails), with time zones and
+    UTC offsets resolved for the whole chunk at once"""
+    inputs = []
+    for record in records:
+        try:
+            inputs.append(to_birth_input(record))
+        except Exception:
+            inputs.append(None)       # compute_record reports the error
+    try:
+        assign_utc_offsets([i for i in inputs if i is not None])
+    except Exception:
+        pass                          # bad date/zone: records resolve one by one
+    return inputs
+
+
+def _encode(result):
+    if "error" in result:
+        return encode_error(result["error"])
+    return encode_result(result["kundli"], result["doshas"], result["dasha"], result["name"])
+
+
+def _compute_chunk(first_index, records, current_date, with_panchang, binary=False):
+    """Worker: one IPC round trip per chunk instead of per record"""
+    inputs = _prepare_chunk(records)
+    results = [
+        compute_record(first_index + i, record, current_date, with_panchang, birth_input)
+        for i, (record, birth_input) in enumerate(zip(records, inputs))
+    ]
+    return [_encode(r) for r in results] if binary else results
+
+
+# =========================
+# Checkpointing
+# =========================
+def _checkpoint_path(output):
+    return output.rstrip("/\\") + ".ckpt"
+
+
+def load_checkpoint(output):
+    path = _checkpoint_path(output)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_checkpoint(output, state):
+    """Atomic replace, so a crash never leaves a half-written checkpoint"""
+    path = _checkpoint_path(output)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# =========================
+# Writers
+# =========================
+class JsonlWriter:
+    """Single JSONL file; resume truncates to the last checkpointed byte offset"""
+
+    resume_key = "output_bytes"
+
+    def __init__(self, path, resume_offset=0):
+        self.path = path
+        mode = "r+b" if resume_offset and os.path.exists(path) else "wb"
+        self._file = open(path, mode)
+        if mode == "r+b":
+            self._file.seek(resume_offset)
+            self._file.truncate()
+
+    def write_chunk(self, chunk_index, results):
+        self._file.write("".join(
+            json.dumps(r, separators=(",", ":"), default=str) + "\n" for r in results
+        ).encode("utf-8"))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return {"output_bytes": self._file.tell()}
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetWriter:
+    """
+    One Parquet part file per chunk; nested results are JSON-encoded columns,
+    longitudes an int32 list column (milli-arcseconds, CHART_BODIES order).
+    Every part has the same schema. Parts from chunk resume_offset on are
+    deleted first (all of them on a fresh run), so stale parts of an earlier
+    run are never read twice.
+    """
+
+    resume_key = "chunks_done"
+
+    def __init__(self, path, resume_offset=0):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet output needs pyarrow: pip install pyarrow")
+        self._pa, self._pq = pa, pq
+        self.path = path
+        text = pa.string()
+        self._schema = pa.schema([
+            ("index", pa.int64()), ("name", text), ("error", text), ("lagna", text),
+            ("moon_nakshatra", text), ("mahadasha", text),
+            ("longitudes_mas", pa.list_(pa.int32())),
+            ("kundli", text), ("doshas", text), ("dasha", text), ("panchang", text)
+        ])
+        os.makedirs(path, exist_ok=True)
+        for entry in os.listdir(path):
+            stem = entry.split(".")[0]
+            if entry.startswith("part-") and stem[5:].isdigit() and int(stem[5:]) >= resume_offset:
+                os.remove(os.path.join(path, entry))
+
+    @staticmethod
+    def _flatten(result):
+        kundli = result.get("kundli") or {}
+        dasha = result.get("dasha") or {}
+        return {
+            "index": result["index"],
+            "name": result.get("name"),
+            "error": result.get("error"),
+            "lagna": (kundli.get("lagna") or {}).get("rashi"),
+            "moon_nakshatra": kundli.get("planets", {}).get("Moon", {}).get("nakshatra"),
+            "mahadasha": (dasha.get("mahadasha") or {}).get("planet"),
+            "longitudes_mas": result.get("longitudes_mas"),
+            "kundli": json.dumps(kundli, default=str) if kundli else None,
+            "doshas": json.dumps(result.get("doshas"), default=str) if "doshas" in result else None,
+            "dasha": json.dumps(dasha, default=str) if dasha else None,
+            "panchang": json.dumps(result["panchang"], default=str) if "panchang" in result else None
+        }
+
+    def write_chunk(self, chunk_index, results):
+        table = self._pa.Table.from_pylist([self._flatten(r) for r in results], schema=self._schema)
+        part = os.path.join(self.path, f"part-{chunk_index:06d}.parquet")
+        self._pq.write_table(table, part + ".tmp", compression="zstd")
+        os.replace(part + ".tmp", part)
+        return {}
+
+    def close(self):
+        pass
+
+
+class BinaryWriter:
+    """chartCodec stream, one record per input in order; resume truncates like JsonlWriter"""
+
+    encoded = True
+    resume_key = "output_bytes"
+
+    def __init__(self, path, resume_offset=0):
+        self._stream = ChartStreamWriter(path, resume_offset)
+
+    def write_chunk(self, chunk_index, records):
+        for record in records:
+            self._stream.write(record)
+        self._stream.flush()
+        return {"output_bytes": self._stream.tell()}
+
+    def close(self):
+        self._stream.close()
+
+
+WRITERS = {"jsonl": JsonlWriter, "parquet": ParquetWriter, "binary": BinaryWriter}
+
+
+# =========================
+# Driver
+# =========================
+def run_batch(input_path, output, fmt="jsonl", workers=None, chunk_size=None,
+              current_date=None, with_panchang=False, resume=True):
+    """
+    Stream input_path through the pool and write results to output in order.
+    Memory is bounded by (workers * 2) chunks in flight. A resumed run keeps
+    the checkpoint's chunk size and current date (None takes them) and
+    refuses different ones.
+    """
+    workers = workers or os.cpu_count() or 1
+    binary = getattr(WRITERS[fmt], "encoded", False)
+    if binary and with_panchang:
+        raise SystemExit("The binary format stores kundli, doshas and dasha only; drop --panchang")
+
+    state = load_checkpoint(output) if resume else None
+    if state:
+        if state.get("input") != os.path.abspath(input_path) or state.get("format") != fmt:
+            raise SystemExit(f"Checkpoint {_checkpoint_path(output)} belongs to a different run")
+        requested = {"chunk_size": chunk_size, "current_date": current_date, "with_panchang": with_panchang}
+        mismatched = [f"{key}={state[key]!r}" for key, value in requested.items()
+                      if value is not None and value != state[key]]
+        if mismatched:
+            raise SystemExit(f"Checkpoint {_checkpoint_path(output)} was made with {', '.join(mismatched)}; "
+                             "rerun with the same options or pass --restart")
+        chunk_size = state["chunk_size"]
+        current_date = state["current_date"]
+        print(f"Resuming after {state['records_done']} record(s)")
+    else:
+        chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+        current_date = current_date or datetime.now().strftime("%Y-%m-%d")
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "input": os.path.abspath(input_path),
+            "format": fmt,
+            "chunk_size": chunk_size,
+            "current_date": current_date,
+            "with_panchang": with_panchang,
+            "records_done": 0,
+            "chunks_done": 0,
+            "output_bytes": 0
+        }
+
+    writer = WRITERS[fmt](output, state[WRITERS[fmt].resume_key])
+    records = islice(iter_birth_records(input_path), state["records_done"], None)
+    chunks = iter_chunks(records, chunk_size)
+    max_inflight = workers * 2
+    start = time.perf_counter()
+    done_this_run = 0
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            inflight = deque()
+            next_index = state["records_done"]
+
+            def submit_next():
+                nonlocal next_index
+                chunk = next(chunks, None)
+                if chunk is None:
+                    return False
+                inflight.append(pool.submit(
+                    _compute_chunk, next_index, chunk, current_date, with_panchang, binary
+                ))
+                next_index += len(chunk)
+                return True
+
+            while len(inflight) < max_inflight and submit_next():
+                pass
+
+            # Oldest chunk first: output order == input order
+            while inflight:
+                results = inflight.popleft().result()
+                state.update(writer.write_chunk(state["chunks_done"], results))
+                state["records_done"] += len(results)
+                state["chunks_done"] += 1
+                save_checkpoint(output, state)
+                done_this_run += len(results)
+                submit_next()
+
+                elapsed = time.perf_counter() - start
+                print(
+                    f"\r{state['records_done']} records "
+                    f"({done_this_run / elapsed:.0f}/s)",
+                    end="", file=sys.stderr
+                )
+    finally:
+        writer.close()
+
+    print(file=sys.stderr)
+    print(f"Done: {state['records_done']} record(s) -> {output}")
+    return state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute VedicAI charts in bulk")
+    parser.add_argument("--input", required=True, help="CSV or JSONL birth records")
+    parser.add_argument("--output", required=True, help="JSONL file, Parquet directory or binary stream file")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="jsonl")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help=f"Records per task / checkpoint (default {DEFAULT_CHUNK_SIZE}, or the checkpoint's)")
+    parser.add_argument("--current-date", default=None, help="Date for the running dasha (YYYY-MM-DD)")
+    parser.add_argument("--panchang", action="store_true", help="Also compute the birth-date panchang")
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint")
+    args = parser.parse_args(argv)
+
+    run_batch(
+        args.input, args.output, args.format, args.workers, args.chunk_size,
+        args.current_date, args.panchang, resume=not args.restart
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+birthRecords.py
+---------------
+Streaming reader for bulk birth records (CSV or JSONL).
+NO Streamlit code should exist in this file.
+
+Each record needs: date (YYYY-MM-DD), time (HH:MM or HH:MM:SS),
+latitude, longitude. Optional: name, place, timezone (IANA name; resolved
+from the coordinates when missing), utc_offset (hours, overrides timezone).
+"""
+
+import csv
+import json
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BASE_DIR, "gazetteer"))
+
+from timezoneResolver import load_resolver, local_jds, local_to_ut
+
+
+def normalize_time(value):
+    """'9:5' / '09:05' / '09:05:30' -> 'HH:MM:SS'"""
+    parts = [int(p) for p in str(value).strip().split(":")]
+    while len(parts) < 3:
+        parts.append(0)
+    h, m, s = parts[:3]
+    return f"{h:02d}:{m:02d}:{s:02d}"
+
+
+def to_birth_input(record):
+    """
+    Convert a raw record into the (birth_datetime, birth_location, name)
+    triple expected by generate_kundli
+    """
+    place = record.get("place") or record.get("name") or "Unknown"
+    birth_datetime = {
+        "date": str(record["date"]).strip(),
+        "time": normalize_time(record["time"])
+    }
+    birth_location = {
+        "name": place,
+        "latitude": float(record["latitude"]),
+        "longitude": float(record["longitude"])
+    }
+    if record.get("timezone"):
+        birth_location["timezone"] = str(record["timezone"]).strip()
+    if record.get("utc_offset") not in (None, ""):
+        birth_location["utc_offset"] = float(record["utc_offset"])
+    return birth_datetime, birth_location, record.get("name") or place
+
+
+def assign_utc_offsets(birth_inputs):
+    """
+    Pin the UTC offset at the birth instant ('utc_offset', hours) on every
+    birth_location of a batch of to_birth_input() triples, in one pass:
+    missing zones are resolved together from the coordinates and offsets
+    come from the vectorized tz tables, not per-record pytz localization.
+    """
+    pending = [(dt, loc) for dt, loc, _ in birth_inputs if loc.get("utc_offset") is None]
+    if not pending:
+        return birth_inputs
+
+    unresolved = [loc for _, loc in pending if not loc.get("timezone")]
+    if unresolved:
+        zones = load_resolver().resolve_many(
+            [loc["latitude"] for loc in unresolved], [loc["longitude"] for loc in unresolved]
+        )
+        for loc, zone in zip(unresolved, zones):
+            loc["timezone"] = zone
+
+    local = local_jds([dt["date"] for dt, _ in pending], [dt["time"] for dt, _ in pending])
+    _, offsets = local_to_ut(local, [loc["timezone"] for _, loc in pending])
+    for (_, loc), offset in zip(pending, offsets):
+        loc["utc_offset"] = float(offset) / 3600
+    return birth_inputs
+
+
+def _detect_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    if ext in (".csv", ".tsv"):
+        return "csv"
+    raise ValueError(f"Unsupported input format: {path} (expected .csv or .jsonl)")
+
+
+def iter_birth_records(path):
+    """Yield raw record dicts one at a time from a CSV or JSONL file"""
+    fmt = _detect_format(path)
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "jsonl":
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        else:
+            delimiter = "\t" if path.lower().endswith(".tsv") else ","
+            yield from csv.DictReader(f, delimiter=delimiter)
+
+
+def iter_chunks(records, size):
+    """Group a record stream into lists of at most `size` records"""
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,423 @@
+"""
+chartCodec.py
+-------------
+Versioned fixed-layout binary encoding of a computed chart (kundli, doshas,
+dasha) for caches, worker queues and the database, plus a streaming
+container for many of them. A record is about 180 bytes including name
+and place, against 3-4 KB of JSON.
+
+Record (little-endian):
+    header   8 bytes    magic b"VC", version, sections, record length,
+                        2 bytes padding
+    chart   88 bytes    22 x int32: CHART_BODIES longitudes (milli-arcsec),
+                        birth date (ordinal), local time (s), UTC offset (s),
+                        daily motion of each planet (milli-arcsec/day, set
+                        when sections has HAS_MOTION)
+    codes   29 bytes    rashi x 10, nakshatra x 10, house of each planet x 9
+    doshas   7 bytes    flags, Mars house, Mangal severity, cancellations mask,
+                        Moon house, Saturn house, reserved
+    dasha   13 bytes    start / end date (ordinal), years remaining x 100,
+                        mahadasha, antardasha, birth nakshatra lord
+    strings             name, place, timezone (u8 length + UTF-8 each)
+
+Only determinants are stored; the dosha and dasha texts are rebuilt from
+doshaAnalyzer / dashaCalculator on decode. A record whose sections byte is
+ERROR carries just a UTF-8 error message after the header. Version 1
+records (a 13 x int32 chart, no motion) still decode.
+
+decode_chart() is zero-copy: the Chart's arrays are memoryviews into the
+buffer. Stream files start with an 8-byte header (b"VCST", version) and
+hold records back to back.
+
+Usage:
+    python chartCodec.py            # round-trip check and JSON vs binary benchmark
+"""
+
+import os
+import struct
+import sys
+from datetime import date as date_cls
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BASE_DIR, "kundliGenerator"))
+sys.path.append(os.path.join(BASE_DIR, "dosha"))
+
+from compactChart import PLANETS, Chart
+from dashaCalculator import ANTARDASHA_NOTE, DASHA_SEQUENCE, DASHA_YEARS, get_dasha_interpretation
+from doshaAnalyzer import (
+    MANGAL_CANCELLATIONS, NO_CANCELLATIONS, kaal_sarp_entry, mangal_dosha_entry, sade_sati_entry
+)
+
+MAGIC = b"VC"
+VERSION = 2
+STREAM_MAGIC = b"VCST"
+STREAM_HEADER = struct.Struct("<4sH2x")
+
+HEADER = struct.Struct("<2sBBH2x")
+POSITIONS = struct.Struct("<13i")
+CODES_SIZE = 29
+DOSHAS = struct.Struct("<7B")
+DASHA = struct.Struct("<iihBBB")
+CHART_OFFSET = HEADER.size
+
+
+class Layout:
+    """Section offsets of one record version, from the size of its chart block"""
+
+    def __init__(self, chart):
+        self.chart = chart
+        self.codes = CHART_OFFSET + chart.size
+        self.doshas = self.codes + CODES_SIZE
+        self.dasha = self.doshas + DOSHAS.size
+        self.strings = self.dasha + DASHA.size
+
+
+LAYOUTS = {1: Layout(POSITIONS), 2: Layout(struct.Struct(f"<{POSITIONS.size // 4 + len(PLANETS)}i"))}
+LAYOUT = LAYOUTS[VERSION]
+
+# sections byte
+ERROR = 0
+HAS_CHART = 1
+HAS_DOSHAS = 2
+HAS_DASHA = 4
+HAS_MOTION = 8
+
+# doshas flags byte
+MANGAL = 1
+KAAL_SARP = 2
+SADE_SATI = 4
+
+SEVERITIES = ['Low', 'Medium', 'High']
+_DASHA_INDEX = {planet: i for i, planet in enumerate(DASHA_SEQUENCE)}
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+class CodecError(ValueError):
+    pass
+
+
+def _utf8(value, limit):
+    """UTF-8 bytes of value cut to at most limit bytes on a character boundary"""
+    return value.encode("utf-8")[:limit].decode("utf-8", "ignore").encode("utf-8")
+
+
+def _pack_strings(*values):
+    out = bytearray()
+    for value in values:
+        raw = _utf8(value if isinstance(value, str) else "", 255)
+        out.append(len(raw))
+        out += raw
+    return bytes(out)
+
+
+def _unpack_strings(view, offset, count):
+    values = []
+    for _ in range(count):
+        length = view[offset]
+        values.append(str(view[offset + 1:offset + 1 + length], "utf-8") or None)
+        offset += 1 + length
+    return values
+
+
+def _encode_doshas(doshas, chart):
+    flags = mars_house = severity = mask = moon_house = saturn_house = 0
+    for dosha in doshas:
+        if dosha['name'] == 'Mangal Dosha':
+            flags |= MANGAL
+            mars_house = dosha['house']
+            severity = SEVERITIES.index(dosha['severity'])
+            for i, text in enumerate(MANGAL_CANCELLATIONS):
+                if text in dosha['cancellations']:
+                    mask |= 1 << i
+        elif dosha['name'] == 'Kaal Sarp Dosha':
+            flags |= KAAL_SARP
+        elif dosha['name'] == 'Sade Sati':
+            flags |= SADE_SATI
+            moon_house, saturn_house = chart.house('Moon'), chart.house('Saturn')
+        else:
+            raise CodecError(f"No encoding for dosha {dosha['name']!r}")
+    return DOSHAS.pack(flags, mars_house, severity, mask, moon_house, saturn_house, 0)
+
+
+def _decode_doshas(view, layout):
+    flags, mars_house, severity, mask, moon_house, saturn_house, _ = DOSHAS.unpack_from(view, layout.doshas)
+    doshas = []
+    if flags & MANGAL:
+        cancellations = [text for i, text in enumerate(MANGAL_CANCELLATIONS) if mask >> i & 1]
+        doshas.append(mangal_dosha_entry(mars_house, SEVERITIES[severity],
+                                         cancellations or [NO_CANCELLATIONS]))
+    if flags & KAAL_SARP:
+        doshas.append(kaal_sarp_entry())
+    if flags & SADE_SATI:
+        doshas.append(sade_sati_entry(saturn_house, moon_house))
+    return doshas
+
+
+def _encode_dasha(dasha):
+    maha = dasha['mahadasha']
+    return DASHA.pack(
+        date_cls.fromisoformat(maha['start_date']).toordinal(),
+        date_cls.fromisoformat(maha['end_date']).toordinal(),
+        round(maha['years_remaining'] * 100),
+        _DASHA_INDEX[maha['planet']],
+        _DASHA_INDEX[dasha['antardasha']['planet']],
+        _DASHA_INDEX[dasha['birth_nakshatra_lord']]
+    )
+
+
+def _decode_dasha(view, layout, kundli):
+    start, end, remaining, maha, antar, lord = DASHA.unpack_from(view, layout.dasha)
+    planet = DASHA_SEQUENCE[maha]
+    return {
+        'mahadasha': {
+            'planet': planet,
+            'start_date': date_cls.fromordinal(start).isoformat(),
+            'end_date': date_cls.fromordinal(end).isoformat(),
+            'years_remaining': remaining / 100,
+            'total_years': DASHA_YEARS[planet]
+        },
+        'antardasha': {'planet': DASHA_SEQUENCE[antar], 'note': ANTARDASHA_NOTE},
+        'birth_nakshatra_lord': DASHA_SEQUENCE[lord],
+        'interpretation': get_dasha_interpretation(planet, kundli)
+    }
+
+
+def encode_result(kundli, doshas=None, dasha=None, name=None):
+    """One record from a generate_kundli() dict (or Chart) and optional detect_doshas / dasha results"""
+    chart = kundli if isinstance(kundli, Chart) else Chart.from_kundli(kundli)
+    sections = HAS_CHART | (HAS_MOTION if chart.has_motion else 0)
+    body = bytearray(LAYOUT.strings - CHART_OFFSET)
+    data = bytes(chart.data) if _LITTLE_ENDIAN else struct.pack(f"<{len(chart.data)}i", *chart.data)
+    body[:len(data)] = data
+    start = LAYOUT.codes - CHART_OFFSET
+    body[start:start + CODES_SIZE] = bytes(chart.codes) + bytes(chart.houses)
+    if doshas is not None:
+        sections |= HAS_DOSHAS
+        start = LAYOUT.doshas - CHART_OFFSET
+        body[start:start + DOSHAS.size] = _encode_doshas(doshas, chart)
+    if dasha is not None:
+        sections |= HAS_DASHA
+        start = LAYOUT.dasha - CHART_OFFSET
+        body[start:start + DASHA.size] = _encode_dasha(dasha)
+
+    strings = _pack_strings(name, chart.place, chart.timezone)
+    length = HEADER.size + len(body) + len(strings)
+    return HEADER.pack(MAGIC, VERSION, sections, length) + bytes(body) + strings
+
+
+def encode_error(message):
+    raw = _utf8(message, 65535 - HEADER.size)
+    return HEADER.pack(MAGIC, VERSION, ERROR, HEADER.size + len(raw)) + raw
+
+
+def _header(view):
+    """(sections, Layout) of a record"""
+    magic, version, sections, _ = HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise CodecError("Not a chart record")
+    if version not in LAYOUTS:
+        raise CodecError(f"Unsupported chart record version {version}")
+    return sections, LAYOUTS[version]
+
+
+def decode_chart(buffer):
+    """(Chart, name) without copying: the Chart's arrays view the buffer"""
+    view = memoryview(buffer)
+    sections, layout = _header(view)
+    if not sections & HAS_CHART:
+        raise CodecError(str(view[HEADER.size:], "utf-8"))
+    size = layout.chart.size if sections & HAS_MOTION else POSITIONS.size
+    data = view[CHART_OFFSET:CHART_OFFSET + size]
+    data = data.cast("i") if _LITTLE_ENDIAN else struct.unpack(f"<{size // 4}i", data)
+    name, place, timezone = _unpack_strings(view, layout.strings, 3)
+    chart = Chart(data, view[layout.codes:layout.codes + 20],
+                  view[layout.codes + 20:layout.doshas], place, timezone)
+    return chart, name
+
+
+def decode_result(buffer):
+    """
+    The dict batchCompute.compute_record produces ('name', 'kundli' and,
+    when stored, 'doshas' / 'dasha'), or {'error': ...} for an error record
+    """
+    view = memoryview(buffer)
+    sections, layout = _header(view)
+    if sections == ERROR:
+        return {'error': str(view[HEADER.size:], "utf-8")}
+    chart, name = decode_chart(view)
+    kundli = chart.to_dict()
+    result = {'name': name, 'kundli': kundli}
+    if sections & HAS_DOSHAS:
+        result['doshas'] = _decode_doshas(view, layout)
+    if sections & HAS_DASHA:
+        result['dasha'] = _decode_dasha(view, layout, kundli)
+    return result
+
+
+def record_length(buffer, offset=0):
+    return HEADER.unpack_from(buffer, offset)[3]
+
+
+# =========================
+# Streaming container
+# =========================
+class ChartStreamWriter:
+    """Append records to a stream file; opened with resume_offset it truncates there first"""
+
+    def __init__(self, path, resume_offset=0):
+        self.path = path
+        if resume_offset and os.path.exists(path):
+            self._file = open(path, "r+b")
+            self._file.seek(resume_offset)
+            self._file.truncate()
+        else:
+            self._file = open(path, "wb")
+            self._file.write(STREAM_HEADER.pack(STREAM_MAGIC, VERSION))
+
+    def write(self, record):
+        self._file.write(record)
+
+    def tell(self):
+        return self._file.tell()
+
+    def flush(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def encode_stream(records):
+    """A whole stream (header + records) as bytes, for queues and downloads"""
+    return STREAM_HEADER.pack(STREAM_MAGIC, VERSION) + b"".join(records)
+
+
+def iter_records(source):
+    """
+    Records (memoryviews) of a stream: a path, a binary file object, or a
+    bytes-like object / mmap (zero-copy slices)
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            yield from iter_records(f)
+        return
+
+    if hasattr(source, "read"):
+        _stream_header(source.read(STREAM_HEADER.size))
+        while True:
+            header = source.read(HEADER.size)
+            if not header:
+                return
+            if len(header) < HEADER.size:
+                raise CodecError("Truncated chart stream")
+            record = header + source.read(record_length(header) - HEADER.size)
+            if len(record) < record_length(header):
+                raise CodecError("Truncated chart stream")
+            yield memoryview(record)
+        return
+
+    view = memoryview(source)
+    _stream_header(view[:STREAM_HEADER.size])
+    offset = STREAM_HEADER.size
+    while offset < len(view):
+        length = record_length(view, offset)
+        if offset + length > len(view):
+            raise CodecError("Truncated chart stream")
+        yield view[offset:offset + length]
+        offset += length
+
+
+def _stream_header(raw):
+    if len(raw) < STREAM_HEADER.size:
+        raise CodecError("Not a chart stream")
+    magic, version = STREAM_HEADER.unpack(raw)
+    if magic != STREAM_MAGIC:
+        raise CodecError("Not a chart stream")
+    if version not in LAYOUTS:
+        raise CodecError(f"Unsupported chart stream version {version}")
+
+
+if __name__ == "__main__":
+    import json
+    import tempfile
+    import time
+
+    import numpy as np
+
+    from GenerateKundli import generate_kundli
+    from doshaAnalyzer import detect_doshas
+    from dashaCalculator import calculate_vimshottari_dasha
+
+    # Real charts over a spread of birth dates / places
+    rng = np.random.default_rng(45)
+    results = []
+    for i in range(300):
+        birth_datetime = {
+            "date": date_cls.fromordinal(int(rng.integers(711858, 739252))).isoformat(),
+            "time": f"{rng.integers(24):02d}:{rng.integers(60):02d}:00"
+        }
+        birth_location = {"name": f"Place {i}", "latitude": float(rng.uniform(-60, 60)),
+                          "longitude": float(rng.uniform(-180, 180))}
+        kundli = generate_kundli(birth_datetime, birth_location)
+        results.append({
+            "name": f"Person {i}",
+            "kundli": kundli,
+            "doshas": detect_doshas(kundli),
+            "dasha": calculate_vimshottari_dasha(kundli, "2026-01-18")
+        })
+
+    # Round trip: doshas, dasha and motion flags exact, longitudes within half a milli-arcsecond
+    mismatches = 0
+    for r in results:
+        decoded = decode_result(encode_result(r["kundli"], r["doshas"], r["dasha"], r["name"]))
+        lon_error = max(abs(decoded["kundli"]["planets"][p]["longitude"] - r["kundli"]["planets"][p]["longitude"])
+                        for p in PLANETS)
+        flags_kept = all(
+            decoded["kundli"]["planets"][p][flag] == r["kundli"]["planets"][p][flag]
+            for p in PLANETS for flag in ("retrograde", "combust")
+        )
+        same = (decoded["doshas"] == r["doshas"] and decoded["dasha"] == r["dasha"] and flags_kept
+                and decoded["kundli"]["houses"].keys() == r["kundli"]["houses"].keys()
+                and lon_error < 0.5 / 3_600_000 + 1e-12
+                and detect_doshas(decoded["kundli"]) == r["doshas"])
+        mismatches += not same
+    print(f"Round trip: {len(results) - mismatches}/{len(results)} identical")
+
+    def throughput(fn, items, repeat=20):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for item in items:
+                fn(item)
+        return len(items) * repeat / (time.perf_counter() - start)
+
+    encoded = [encode_result(r["kundli"], r["doshas"], r["dasha"], r["name"]) for r in results]
+    as_json = [json.dumps(r, separators=(",", ":")) for r in results]
+    json_size = sum(len(j.encode("utf-8")) for j in as_json) / len(results)
+    binary_size = sum(len(e) for e in encoded) / len(results)
+
+    print(f"\n=== CODEC vs JSON ({len(results)} charts) ===")
+    print(f"Size         : binary {binary_size:6.0f} bytes   JSON {json_size:6.0f} bytes  ({json_size / binary_size:.0f}x)")
+    print(f"Encode       : binary {throughput(lambda r: encode_result(r['kundli'], r['doshas'], r['dasha'], r['name']), results):9,.0f}/s"
+          f"   JSON {throughput(lambda r: json.dumps(r, separators=(',', ':')), results):9,.0f}/s")
+    print(f"Decode Chart : binary {throughput(decode_chart, encoded):9,.0f}/s   (zero-copy)")
+    print(f"Decode full  : binary {throughput(decode_result, encoded):9,.0f}/s"
+          f"   JSON {throughput(json.loads, as_json):9,.0f}/s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "charts.vcst")
+        with ChartStreamWriter(path) as writer:
+            for record in encoded * 100:
+                writer.write(record)
+        start = time.perf_counter()
+        with open(path, "rb") as f:
+            count = sum(1 for record in iter_records(f.read()) if decode_chart(record))
+        elapsed = time.perf_counter() - start
+        print(f"Stream       : {count:,} records, {os.path.getsize(path) / 1e6:.1f} MB, "
+              f"scanned + decoded in {elapsed:.2f} s")
@@ -0,0 +1,237 @@
+"""
+ashtakavarga.py
+---------------
+Bhinnashtakavarga (BAV) of the seven planets and the Sarvashtakavarga (SAV)
+from the signs of the planets and the lagna.
+
+Each contributor gives a planet one bindu in the signs that are certain
+houses away from it (BAV_HOUSES). Those houses are kept as 12-bit patterns
+(BAV_MASKS, bit k = house k + 1). At import they are rotated to every
+contributor sign and spread to 4 bits per sign, giving _BINDUS[contributor,
+contributor sign, planet]. Each entry is one uint64 holding the 12 bindus
+that contributor adds. A sign collects at most 8 bindus, so the 8 words of a
+chart add without carries. One unpack then gives the result, an (8, 12)
+uint8 array: rows are AV_PLANETS and then SAV, columns are RASHIS.
+
+Transit scoring only reads a stored table: transit_bindus() picks the
+bindus of each transiting planet's current sign, for one user or for
+(users, days) at once.
+"""
+
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+import swisseph as swe
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, "Swiss_Ephemeris"))
+sys.path.append(os.path.join(BASE_DIR, "kundliGenerator"))
+
+from Swiss_Ephemeris import get_tropical_longitudes
+from fixedLongitude import RASHIS, rashi_index, to_mas
+from GenerateKundli import CHART_BODIES
+
+AV_PLANETS = ['Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn']
+CONTRIBUTORS = AV_PLANETS + ['Lagna']
+SAV = len(AV_PLANETS)
+
+# CHART_BODIES column of each contributor (for (N, 10) longitude arrays)
+_COLUMNS = [CHART_BODIES.index(c) for c in CONTRIBUTORS]
+
+# Benefic houses counted from each contributor (Parashari tables)
+BAV_HOUSES = {
+    'Sun': {
+        'Sun': [1, 2, 4, 7, 8, 9, 10, 11], 'Moon': [3, 6, 10, 11],
+        'Mars': [1, 2, 4, 7, 8, 9, 10, 11], 'Mercury': [3, 5, 6, 9, 10, 11, 12],
+        'Jupiter': [5, 6, 9, 11], 'Venus': [6, 7, 12],
+        'Saturn': [1, 2, 4, 7, 8, 9, 10, 11], 'Lagna': [3, 4, 6, 10, 11, 12]
+    },
+    'Moon': {
+        'Sun': [3, 6, 7, 8, 10, 11], 'Moon': [1, 3, 6, 7, 10, 11],
+        'Mars': [2, 3, 5, 6, 9, 10, 11], 'Mercury': [1, 3, 4, 5, 7, 8, 10, 11],
+        'Jupiter': [1, 4, 7, 8, 10, 11, 12], 'Venus': [3, 4, 5, 7, 9, 10, 11],
+        'Saturn': [3, 5, 6, 11], 'Lagna': [3, 6, 10, 11]
+    },
+    'Mars': {
+        'Sun': [3, 5, 6, 10, 11], 'Moon': [3, 6, 11],
+        'Mars': [1, 2, 4, 7, 8, 10, 11], 'Mercury': [3, 5, 6, 11],
+        'Jupiter': [6, 10, 11, 12], 'Venus': [6, 8, 11, 12],
+        'Saturn': [1, 4, 7, 8, 9, 10, 11], 'Lagna': [1, 3, 6, 10, 11]
+    },
+    'Mercury': {
+        'Sun': [5, 6, 9, 11, 12], 'Moon': [2, 4, 6, 8, 10, 11],
+        'Mars': [1, 2, 4, 7, 8, 9, 10, 11], 'Mercury': [1, 3, 5, 6, 9, 10, 11, 12],
+        'Jupiter': [6, 8, 11, 12], 'Venus': [1, 2, 3, 4, 5, 8, 9, 11],
+        'Saturn': [1, 2, 4, 7, 8, 9, 10, 11], 'Lagna': [1, 2, 4, 6, 8, 10, 11]
+    },
+    'Jupiter': {
+        'Sun': [1, 2, 3, 4, 7, 8, 9, 10, 11], 'Moon': [2, 5, 7, 9, 11],
+        'Mars': [1, 2, 4, 7, 8, 10, 11], 'Mercury': [1, 2, 4, 5, 6, 9, 10, 11],
+        'Jupiter': [1, 2, 3, 4, 7, 8, 10, 11], 'Venus': [2, 5, 6, 9, 10, 11],
+        'Saturn': [3, 5, 6, 12], 'Lagna': [1, 2, 4, 5, 6, 7, 9, 10, 11]
+    },
+    'Venus': {
+        'Sun': [8, 11, 12], 'Moon': [1, 2, 3, 4, 5, 8, 9, 11, 12],
+        'Mars': [3, 5, 6, 9, 11, 12], 'Mercury': [3, 5, 6, 9, 11],
+        'Jupiter': [5, 8, 9, 10, 11], 'Venus': [1, 2, 3, 4, 5, 8, 9, 10, 11],
+        'Saturn': [3, 4, 5, 8, 9, 10, 11], 'Lagna': [1, 2, 3, 4, 5, 8, 9, 11]
+    },
+    'Saturn': {
+        'Sun': [1, 2, 4, 7, 8, 10, 11], 'Moon': [3, 6, 11],
+        'Mars': [3, 5, 6, 10, 11, 12], 'Mercury': [6, 8, 9, 10, 11, 12],
+        'Jupiter': [5, 6, 11, 12], 'Venus': [6, 11, 12],
+        'Saturn': [3, 5, 6, 11], 'Lagna': [1, 3, 4, 6, 10, 11]
+    }
+}
+
+# Bindus each planet's BAV always totals (any chart); SAV totals 337
+BAV_TOTALS = {'Sun': 48, 'Moon': 49, 'Mars': 39, 'Mercury': 54,
+              'Jupiter': 56, 'Venus': 52, 'Saturn': 39}
+
+# 12-bit patterns, BAV_MASKS[planet, contributor]
+BAV_MASKS = np.array([
+    [sum(1 << (h - 1) for h in BAV_HOUSES[p][c]) for c in CONTRIBUTORS]
+    for p in AV_PLANETS
+], dtype=np.uint16)
+
+# _BINDUS[c, s, p]: the bindus contributor c in sign s gives planet p, 4 bits per sign
+_SHIFTS = np.arange(12)
+_ROTATED = ((BAV_MASKS[None, :, :] << _SHIFTS[:, None, None]) |
+            (BAV_MASKS[None, :, :] >> (12 - _SHIFTS[:, None, None]))) & 0xFFF  # (s, p, c)
+_NIBBLES = (np.uint64(4) * _SHIFTS).astype(np.uint64)
+_BINDUS = np.bitwise_or.reduce(
+    ((_ROTATED.transpose(2, 0, 1)[..., None] >> _SHIFTS) & 1).astype(np.uint64) << _NIBBLES, axis=-1
+)
+_BINDUS_ROWS = _BINDUS.reshape(-1, len(AV_PLANETS))
+_ROW_OFFSETS = 12 * np.arange(len(CONTRIBUTORS))
+_P = np.arange(len(AV_PLANETS))
+
+# A transiting planet with more bindus than this in its own BAV sign is favorable
+NEUTRAL_BINDUS = 4
+
+
+def contributor_signs(kundli):
+    """Signs 0..11 of CONTRIBUTORS in a generate_kundli dict or a Chart"""
+    if hasattr(kundli, 'codes'):
+        return np.array([kundli.codes[i] for i in _COLUMNS])
+    return np.array([RASHIS.index(kundli['planets'][p]['rashi']) for p in AV_PLANETS] +
+                    [RASHIS.index(kundli['lagna']['rashi'])])
+
+
+def ashtakavarga_from_signs(signs):
+    """
+    (..., 8) contributor signs -> (..., 8, 12) uint8: BAV of each AV_PLANETS
+    row, then SAV in row 7
+    """
+    rows = np.asarray(signs, dtype=np.intp) + _ROW_OFFSETS
+    packed = np.take(_BINDUS_ROWS, rows[..., 0], axis=0)                  # (..., 7) uint64
+    for c in range(1, len(CONTRIBUTORS)):
+        packed += np.take(_BINDUS_ROWS, rows[..., c], axis=0)
+    # Little-endian bytes hold two signs each, the even one in the low nibble
+    pairs = packed.astype('<u8').view(np.uint8).reshape(packed.shape + (8,))[..., :6]
+    av = np.empty(packed.shape[:-1] + (len(CONTRIBUTORS), 12), dtype=np.uint8)
+    av[..., :SAV, 0::2] = pairs & 0xF
+    av[..., :SAV, 1::2] = pairs >> 4
+    av[..., SAV, :] = av[..., :SAV, :].sum(axis=-2, dtype=np.uint8)
+    return av
+
+
+def calculate_ashtakavarga(kundli):
+    """(8, 12) uint8 bindu table of one chart"""
+    return ashtakavarga_from_signs(contributor_signs(kundli))
+
+
+def ashtakavarga_batch(longitudes):
+    """(N, 8, 12) uint8 from an (N, 10) CHART_BODIES milli-arcsecond array"""
+    return ashtakavarga_from_signs(rashi_index(np.asarray(longitudes)[:, _COLUMNS]))
+
+
+def ashtakavarga_table(av):
+    """{'Sun': [12 bindus], ..., 'Sarva': [12]} for display / JSON"""
+    return {name: av[i].tolist() for i, name in enumerate(AV_PLANETS + ['Sarva'])}
+
+
+def transit_signs(date, time="12:00:00"):
+    """Signs 0..11 of AV_PLANETS at a UT date (and time), as generate_kundli places them"""
+    day = datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M:%S")
+    jd = swe.julday(day.year, day.month, day.day, day.hour + day.minute / 60 + day.second / 3600)
+    longitudes = get_tropical_longitudes(jd)
+    return np.array([rashi_index(to_mas(longitudes[p])) for p in AV_PLANETS])
+
+
+def transit_bindus(av, signs):
+    """
+    Bindus of each transiting planet in its current sign, from its own BAV.
+    av (..., 8, 12) with signs (7,) -> (..., 7); signs (D, 7) -> (..., D, 7)
+    """
+    return np.asarray(av)[..., _P, np.asarray(signs)]
+
+
+def transit_score(av, signs):
+    """Sum over the seven planets of bindus above NEUTRAL_BINDUS (negative below)"""
+    return transit_bindus(av, signs).astype(np.int16).sum(axis=-1) - NEUTRAL_BINDUS * len(AV_PLANETS)
+
+
+def print_ashtakavarga_report(av):
+    print("\n" + "=" * 60)
+    print("             ASHTAKAVARGA (bindus per sign)")
+    print("=" * 60)
+    print(f"\n{'':<9}" + "".join(f"{r[:3]:>4}" for r in RASHIS) + "  Total")
+    for name, row in ashtakavarga_table(av).items():
+        print(f"{name:<9}" + "".join(f"{b:>4}" for b in row) + f"  {sum(row):>5}")
+    print("\n" + "=" * 60)
+
+
+if __name__ == "__main__":
+    import time
+
+    from GenerateKundli import generate_kundli
+    from fixedLongitude import FULL_CIRCLE
+
+    birth_datetime = {"date": "1995-08-15", "time": "10:30:00"}
+    birth_location = {"name": "Delhi", "latitude": 28.6139, "longitude": 77.2090}
+
+    kundli = generate_kundli(birth_datetime, birth_location)
+    av = calculate_ashtakavarga(kundli)
+    print_ashtakavarga_report(av)
+
+    # Reference: count bindus house by house straight from BAV_HOUSES
+    signs = contributor_signs(kundli)
+    reference = [
+        [sum((sign - signs[c]) % 12 + 1 in BAV_HOUSES[p][name] for c, name in enumerate(CONTRIBUTORS))
+         for sign in range(12)]
+        for p in AV_PLANETS
+    ]
+    totals_ok = all(av[i].sum() == BAV_TOTALS[p] for i, p in enumerate(AV_PLANETS)) and av[SAV].sum() == 337
+    print(f"Matches house-by-house count: {av[:SAV].tolist() == reference}, totals: {totals_ok}")
+
+    today = transit_signs("2026-01-19")
+    print(f"\nTransits 2026-01-19: " + ", ".join(f"{p} {RASHIS[s]}" for p, s in zip(AV_PLANETS, today)))
+    print(f"Transit bindus: {transit_bindus(av, today).tolist()}, score {int(transit_score(av, today)):+d}")
+
+    start = time.perf_counter()
+    for _ in range(10_000):
+        calculate_ashtakavarga(kundli)
+    print(f"\nSingle chart: {(time.perf_counter() - start) / 10_000 * 1e6:.1f} µs")
+
+    n = 1_000_000
+    rng = np.random.default_rng(48)
+    longitudes = rng.integers(0, FULL_CIRCLE, (n, len(CHART_BODIES)), dtype=np.int32)
+    start = time.perf_counter()
+    tables = ashtakavarga_batch(longitudes)
+    elapsed = time.perf_counter() - start
+    print(f"Batch: {tables.shape} {tables.dtype} ({tables.nbytes / 1e6:.0f} MB) in {elapsed:.2f} s "
+          f"({n / elapsed:,.0f} charts/s)")
+
+    # Daily transit scoring: one year of days against every stored table
+    days = np.stack([transit_signs(f"2026-{m:02d}-{d:02d}") for m in range(1, 13) for d in (1, 15)])
+    start = time.perf_counter()
+    scores = transit_score(tables, days[0])
+    elapsed = time.perf_counter() - start
+    print(f"Transit score, {n:,} users x 1 day: {elapsed * 1e3:.0f} ms ({n / elapsed:,.0f} users/s)")
+    start = time.perf_counter()
+    scores = transit_score(tables[:100_000], days)
+    elapsed = time.perf_counter() - start
+    print(f"Transit score, 100,000 users x {len(days)} days: {scores.shape} in {elapsed * 1e3:.0f} ms")
@@ -7,6 +7,19 @@ sys.path.append(BASE_DIR)
 sys.path.append(os.path.join(BASE_DIR, "kundliGenerator"))
 from datetime import datetime, timedelta
 
+# Dasha periods in years
+DASHA_YEARS = {
+    'Ketu': 7, 'Venus': 20, 'Sun': 6, 'Moon': 10,
+    'Mars': 7, 'Rahu': 18, 'Jupiter': 16,
+    'Saturn': 19, 'Mercury': 17
+}
+
+# Dasha order (cycles)
+DASHA_SEQUENCE = ['Ketu', 'Venus', 'Sun', 'Moon', 'Mars',
+                  'Rahu', 'Jupiter', 'Saturn', 'Mercury']
+
+ANTARDASHA_NOTE = 'Simplified calculation - actual Antardasha requires precise timing'
+
 def calculate_vimshottari_dasha(kundli, current_date=None):
     """
     Calculate Vimshottari Dasha system
@@ -34,16 +47,8 @@ def calculate_vimshottari_dasha(kundli, current_date=None):
         'Ashlesha': 'Mercury', 'Jyeshtha': 'Mercury', 'Revati': 'Mercury'
     }
     
-    # Dasha periods in years
-    dasha_years = {
-        'Ketu': 7, 'Venus': 20, 'Sun': 6, 'Moon': 10,
-        'Mars': 7, 'Rahu': 18, 'Jupiter': 16, 
-        'Saturn': 19, 'Mercury': 17
-    }
-    
-    # Dasha order (cycles)
-    dasha_sequence = ['Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 
-                      'Rahu', 'Jupiter', 'Saturn', 'Mercury']
+    dasha_years = DASHA_YEARS
+    dasha_sequence = DASHA_SEQUENCE
     
     # Find starting planet based on Moon's nakshatra
     starting_planet = nakshatra_lord_map.get(moon_nakshatra, 'Ketu')
@@ -99,6 +104,34 @@ def calculate_vimshottari_dasha(kundli, current_date=None):
         'interpretation': get_dasha_interpretation(current_mahadasha, kundli)
     }
 
+def get_mahadasha_timeline(kundli):
+    """
+    Full 120-year Mahadasha sequence from birth
+    (same simplified rule as calculate_vimshottari_dasha: full first period)
+    """
+    dasha = calculate_vimshottari_dasha(kundli, kundli['birth_details']['date'])
+    dasha_years = DASHA_YEARS
+    dasha_sequence = DASHA_SEQUENCE
+
+    start_index = dasha_sequence.index(dasha['birth_nakshatra_lord'])
+    rotated_sequence = dasha_sequence[start_index:] + dasha_sequence[:start_index]
+
+    birth_date = datetime.strptime(kundli['birth_details']['date'], "%Y-%m-%d")
+    timeline = []
+    cumulative_years = 0
+    for planet in rotated_sequence:
+        start = birth_date + timedelta(days=cumulative_years * 365.25)
+        cumulative_years += dasha_years[planet]
+        end = birth_date + timedelta(days=cumulative_years * 365.25)
+        timeline.append({
+            'planet': planet,
+            'start_date': start.strftime("%Y-%m-%d"),
+            'end_date': end.strftime("%Y-%m-%d"),
+            'years': dasha_years[planet]
+        })
+
+    return timeline
+
 def get_current_antardasha(mahadasha_planet, years_into_mahadasha, dasha_years, dasha_sequence):
     """
     Calculate current Antardasha (simplified)
@@ -112,7 +145,7 @@ def get_current_antardasha(mahadasha_planet, years_into_mahadasha, dasha_years,
     
     return {
         'planet': dasha_sequence[antardasha_index],
-        'note': 'Simplified calculation - actual Antardasha requires precise timing'
+        'note': ANTARDASHA_NOTE
     }
 
 def get_dasha_interpretation(planet, kundli):
@@ -14,199 +14,154 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 SWISS_EPHEMERIS_PATH = os.path.join(BASE_DIR, "Swiss_Ephemeris")
 sys.path.append(SWISS_EPHEMERIS_PATH)
 
-def detect_doshas(kundli):
-    """
-    Detect various doshas in the kundli
-    """
-    doshas = []
-    
-    # 1. Mangal Dosha
-    mangal_dosha = check_mangal_dosha(kundli)
-    if mangal_dosha:
-        doshas.append(mangal_dosha)
-    
-    # 2. Kaal Sarp Dosha
-    kaal_sarp = check_kaal_sarp_dosha(kundli)
-    if kaal_sarp:
-        doshas.append(kaal_sarp)
-    
-    # 3. Sade Sati
-    sade_sati = check_sade_sati(kundli)
-    if sade_sati:
-        doshas.append(sade_sati)
-    
-    return doshas
+from ruleEngine import compile_rules
 
-def check_mangal_dosha(kundli):
-    """
-    Mangal Dosha occurs when Mars is in houses 1, 4, 7, 8, or 12
-    """
-    mars_house = None
-    
-    # Find which house Mars is in
-    for house_num, planets in kundli['houses'].items():
-        for planet in planets:
-            if planet['planet'] == 'Mars':
-                mars_house = house_num
-                break
-    
-    if mars_house in [1, 4, 7, 8, 12]:
-        severity = calculate_mangal_severity(kundli, mars_house)
-        
-        return {
-            'name': 'Mangal Dosha',
-            'detected': True,
-            'severity': severity,
-            'house': mars_house,
-            'description': f'Mars is placed in the {mars_house}th house',
+MANGAL_DOSHA_HOUSES = [1, 4, 7, 8, 12]
+
+MANGAL_REMEDIES = [
+    'Recite Hanuman Chalisa daily',
+    'Fast on Tuesdays',
+    'Donate red lentils on Tuesdays',
+    'Visit Hanuman temple',
+    'Wear red coral (after astrological consultation)'
+]
+
+# Every cancellation the Mangal Dosha rule can report, in order (chartCodec
+# stores them as bits)
+MANGAL_CANCELLATIONS = [
+    'Mars in own sign (reduces severity)',
+    'Mars is exalted (reduces severity)'
+]
+NO_CANCELLATIONS = 'No major cancellations detected'
+
+KAAL_SARP_REMEDIES = [
+    'Recite Mahamrityunjaya Mantra',
+    'Visit Kaal Sarp Dosha temples (Trimbakeshwar, Ujjain)',
+    'Perform Kaal Sarp Dosha Puja',
+    'Donate on Nag Panchami',
+    'Wear Gomed (Hessonite) after consultation'
+]
+
+SADE_SATI_REMEDIES = [
+    'Recite Shani Stotra or Hanuman Chalisa',
+    'Donate to the needy on Saturdays',
+    'Feed crows and dogs',
+    'Wear blue sapphire (only after proper consultation)',
+    'Light mustard oil lamp on Saturdays'
+]
+
+# Saturn's house counted from the Moon's (mod 12) -> Sade Sati phase
+SADE_SATI_PHASES = {
+    11: 'Rising Phase (12th from Moon)',
+    0: 'Peak Phase (1st from Moon)',
+    1: 'Setting Phase (2nd from Moon)'
+}
+
+MARS_DIGNIFIED = {'in_sign': ['Mars', ['Aries', 'Scorpio', 'Capricorn']]}
+MARS_SEVERE_HOUSES = {'in_house': ['Mars', [1, 8, 12]]}
+
+DOSHA_RULES = compile_rules([
+    {
+        # Mars in houses 1, 4, 7, 8 or 12; 1, 8, 12 are more severe than 4, 7,
+        # and Mars in own sign (Aries, Scorpio) or exalted (Capricorn) lowers it a step
+        'name': 'Mangal Dosha',
+        'when': {'in_house': ['Mars', MANGAL_DOSHA_HOUSES]},
+        'output': {
+            'severity': {
+                'first': [
+                    ({'all': [MARS_SEVERE_HOUSES, {'not': MARS_DIGNIFIED}]}, 'High'),
+                    ({'any': [MARS_SEVERE_HOUSES, {'not': MARS_DIGNIFIED}]}, 'Medium')
+                ],
+                'default': 'Low'
+            },
+            'house': ('house', 'Mars'),
+            'description': 'Mars is placed in the {nth[Mars]} house',
             'impact': 'May cause delays or challenges in marriage and relationships',
-            'remedies': [
-                'Recite Hanuman Chalisa daily',
-                'Fast on Tuesdays',
-                'Donate red lentils on Tuesdays',
-                'Visit Hanuman temple',
-                'Wear red coral (after astrological consultation)'
-            ],
-            'cancellations': check_mangal_cancellations(kundli)
+            'remedies': MANGAL_REMEDIES,
+            # Jupiter aspecting Mars is also cited; not applied yet
+            'cancellations': {
+                'collect': [
+                    ({'in_sign': ['Mars', ['Aries', 'Scorpio']]}, MANGAL_CANCELLATIONS[0]),
+                    ({'in_sign': ['Mars', ['Capricorn']]}, MANGAL_CANCELLATIONS[1])
+                ],
+                'default': NO_CANCELLATIONS
+            }
         }
-    
-    return None
+    },
+    {
+        # All planets on one side of the Rahu-Ketu axis
+        'name': 'Kaal Sarp Dosha',
+        'when': {'between_nodes': ['Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn']},
+        'output': {
+            'severity': 'Medium to High',
+            'description': 'All planets positioned between Rahu and Ketu axis',
+            'impact': 'May cause obstacles, delays, and challenges in life',
+            'remedies': KAAL_SARP_REMEDIES
+        }
+    },
+    {
+        # Saturn in the 12th, 1st or 2nd house from the Moon (natal positions)
+        'name': 'Sade Sati',
+        'when': {'house_from': ['Saturn', 'Moon', [12, 1, 2]]},
+        'output': {
+            'phase': {
+                'first': [
+                    ({'house_from': ['Saturn', 'Moon', [relative + 1]]}, phase)
+                    for relative, phase in SADE_SATI_PHASES.items()
+                ],
+                'default': 'Unknown'
+            },
+            'severity': 'Medium',
+            'description': 'Saturn in {nth[Saturn]} house, Moon in {nth[Moon]} house',
+            'impact': 'Period of challenges, tests, and karmic lessons',
+            'remedies': SADE_SATI_REMEDIES
+        }
+    }
+])
 
-def calculate_mangal_severity(kundli, mars_house):
+def detect_doshas(kundli):
     """
-    Calculate severity based on house and other factors
+    Detect various doshas in the kundli (a generate_kundli dict or a Chart)
     """
-    # Houses 1, 8, 12 are more severe than 4, 7
-    if mars_house in [1, 8, 12]:
-        base_severity = 'High'
-    else:
-        base_severity = 'Medium'
-    
-    # Check if Mars is in own sign or exalted (reduces severity)
-    mars_data = kundli['planets']['Mars']
-    mars_rashi = mars_data['rashi']
-    
-    # Mars owns Aries and Scorpio, exalted in Capricorn
-    if mars_rashi in ['Aries', 'Scorpio', 'Capricorn']:
-        if base_severity == 'High':
-            return 'Medium'
-        else:
-            return 'Low'
-    
-    return base_severity
+    return DOSHA_RULES.evaluate(kundli)
 
-def check_mangal_cancellations(kundli):
+def detect_doshas_batch(longitudes):
     """
-    Check for conditions that cancel or reduce Mangal Dosha
+    Which DOSHA_RULES hold for each row of an (N, 10) CHART_BODIES
+    milli-arcsecond array: {dosha name: bool array}
     """
-    cancellations = []
-    
-    # 1. If Mars is in own sign
-    mars_rashi = kundli['planets']['Mars']['rashi']
-    if mars_rashi in ['Aries', 'Scorpio']:
-        cancellations.append('Mars in own sign (reduces severity)')
-    
-    # 2. If Mars is exalted
-    if mars_rashi == 'Capricorn':
-        cancellations.append('Mars is exalted (reduces severity)')
-    
-    # 3. If Jupiter aspects Mars (needs aspect calculation - placeholder)
-    # cancellations.append('Jupiter aspects Mars (reduces severity)')
-    
-    return cancellations if cancellations else ['No major cancellations detected']
+    matrix = DOSHA_RULES.evaluate_batch(longitudes)
+    return {rule['name']: matrix[:, i] for i, rule in enumerate(DOSHA_RULES.rules)}
+
+def _detected(kundli, name):
+    return next((dosha for dosha in detect_doshas(kundli) if dosha['name'] == name), None)
+
+def check_mangal_dosha(kundli):
+    """Mangal Dosha result, or None"""
+    return _detected(kundli, 'Mangal Dosha')
 
 def check_kaal_sarp_dosha(kundli):
-    """
-    Kaal Sarp Dosha: All planets on one side of Rahu-Ketu axis
-    """
-    rahu_long = kundli['planets']['Rahu']['longitude']
-    ketu_long = kundli['planets']['Ketu']['longitude']
-    
-    # Check all planets except Rahu and Ketu
-    planets_to_check = ['Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn']
-    
-    all_between_rahu_ketu = True
-    
-    for planet in planets_to_check:
-        planet_long = kundli['planets'][planet]['longitude']
-        
-        # Calculate if planet is between Rahu and Ketu
-        # This is a simplified check
-        angle_from_rahu = (planet_long - rahu_long) % 360
-        
-        # If any planet is NOT between Rahu (0°) and Ketu (180°)
-        if not (0 < angle_from_rahu < 180):
-            all_between_rahu_ketu = False
-            break
-    
-    if all_between_rahu_ketu:
-        return {
-            'name': 'Kaal Sarp Dosha',
-            'detected': True,
-            'severity': 'Medium to High',
-            'description': 'All planets positioned between Rahu and Ketu axis',
-            'impact': 'May cause obstacles, delays, and challenges in life',
-            'remedies': [
-                'Recite Mahamrityunjaya Mantra',
-                'Visit Kaal Sarp Dosha temples (Trimbakeshwar, Ujjain)',
-                'Perform Kaal Sarp Dosha Puja',
-                'Donate on Nag Panchami',
-                'Wear Gomed (Hessonite) after consultation'
-            ]
-        }
-    
-    return None
+    """Kaal Sarp Dosha result, or None"""
+    return _detected(kundli, 'Kaal Sarp Dosha')
 
 def check_sade_sati(kundli):
-    """
-    Sade Sati: Saturn transiting 12th, 1st, or 2nd house from Moon
-    This requires current Saturn position (transit)
-    For birth chart analysis, we check natal positions
-    """
-    # Get Moon's house
-    moon_house = None
-    for house_num, planets in kundli['houses'].items():
-        for planet in planets:
-            if planet['planet'] == 'Moon':
-                moon_house = house_num
-                break
-    
-    # Get Saturn's house
-    saturn_house = None
-    for house_num, planets in kundli['houses'].items():
-        for planet in planets:
-            if planet['planet'] == 'Saturn':
-                saturn_house = house_num
-                break
-    
-    if moon_house and saturn_house:
-        # Check if Saturn is in 12th, 1st, or 2nd from Moon
-        relative_position = (saturn_house - moon_house) % 12
-        
-        if relative_position in [0, 1, 11]:  # 1st, 2nd, or 12th house from Moon
-            phase = {
-                11: 'Rising Phase (12th from Moon)',
-                0: 'Peak Phase (1st from Moon)',
-                1: 'Setting Phase (2nd from Moon)'
-            }
-            
-            return {
-                'name': 'Sade Sati',
-                'detected': True,
-                'phase': phase.get(relative_position, 'Unknown'),
-                'severity': 'Medium',
-                'description': f'Saturn in {saturn_house}th house, Moon in {moon_house}th house',
-                'impact': 'Period of challenges, tests, and karmic lessons',
-                'remedies': [
-                    'Recite Shani Stotra or Hanuman Chalisa',
-                    'Donate to the needy on Saturdays',
-                    'Feed crows and dogs',
-                    'Wear blue sapphire (only after proper consultation)',
-                    'Light mustard oil lamp on Saturdays'
-                ]
-            }
-    
-    return None
+    """Sade Sati result, or None"""
+    return _detected(kundli, 'Sade Sati')
+
+# Results rebuilt from stored values (chartCodec); the text comes from DOSHA_RULES
+
+def mangal_dosha_entry(mars_house, severity, cancellations):
+    """Mangal Dosha result for Mars in mars_house"""
+    return DOSHA_RULES.restore('Mangal Dosha', {'Mars': mars_house}, severity=severity,
+                               house=mars_house, cancellations=cancellations)
+
+def kaal_sarp_entry():
+    return DOSHA_RULES.restore('Kaal Sarp Dosha')
+
+def sade_sati_entry(saturn_house, moon_house):
+    """Sade Sati result for Saturn / Moon in these houses"""
+    phase = SADE_SATI_PHASES.get((saturn_house - moon_house) % 12, 'Unknown')
+    return DOSHA_RULES.restore('Sade Sati', {'Saturn': saturn_house, 'Moon': moon_house}, phase=phase)
 
 def get_planet_house(kundli, planet_name):
     """Helper function to find which house a planet is in"""
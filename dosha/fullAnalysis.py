@@ -8,6 +8,9 @@ sys.path.append(os.path.join(BASE_DIR, "kundliGenerator"))
 sys.path.append(os.path.join(BASE_DIR, "dosha"))
 from GenerateKundli import generate_kundli, print_ascii_north_indian_chart, generate_kundli_chart
 from doshaAnalyzer import detect_doshas, print_dosha_report
+from yogaDetector import detect_yogas, print_yoga_report, yogakaraka
+from ashtakavarga import calculate_ashtakavarga, ashtakavarga_table, print_ashtakavarga_report
+from shadbala import calculate_shadbala, print_shadbala_report
 from dashaCalculator import calculate_vimshottari_dasha, print_dasha_report
 
 def full_astrology_analysis(birth_datetime, birth_location, current_date=None):
@@ -31,6 +34,22 @@ def full_astrology_analysis(birth_datetime, birth_location, current_date=None):
     doshas = detect_doshas(kundli)
     print_dosha_report(doshas)
     
+    # Yoga Analysis
+    print("\n🌟 Detecting Yogas...")
+    yogas = detect_yogas(kundli)
+    karaka = yogakaraka(kundli)
+    print_yoga_report(yogas, karaka)
+    
+    # Ashtakavarga
+    print("\n🔢 Computing Ashtakavarga...")
+    ashtakavarga = calculate_ashtakavarga(kundli)
+    print_ashtakavarga_report(ashtakavarga)
+    
+    # Shadbala
+    print("\n💪 Computing Shadbala...")
+    shadbala = calculate_shadbala(kundli, birth_location)
+    print_shadbala_report(shadbala)
+    
     # Dasha Analysis
     print("\n⏰ Calculating Dasha Periods...")
     dasha = calculate_vimshottari_dasha(kundli, current_date)
@@ -39,6 +58,10 @@ def full_astrology_analysis(birth_datetime, birth_location, current_date=None):
     return {
         'kundli': kundli,
         'doshas': doshas,
+        'yogas': yogas,
+        'yogakaraka': karaka,
+        'ashtakavarga': ashtakavarga_table(ashtakavarga),
+        'shadbala': shadbala,
         'dasha': dasha
     }
 
@@ -0,0 +1,447 @@
+"""
+ruleEngine.py
+-------------
+Declarative chart rules, compiled once into an evaluator that shares
+extracted features across every rule.
+
+A rule is a dict:
+    {
+        'name': 'Mangal Dosha',
+        'when': {'in_house': ['Mars', [1, 4, 7, 8, 12]]},
+        'output': {...},    # optional: result fields, see below
+        'adjust': {...}     # optional: free-form payload for the caller
+    }
+
+Conditions (one key per dict; planets by name, houses 1..12 from Lagna):
+    {'in_house': [planet, houses]}          planet occupies one of the houses
+    {'in_sign': [planet, signs]}            planet (or 'Lagna') in one of the RASHIS
+    {'house_from': [planet, ref, counts]}   planet in the count-th house from ref (1 = same)
+    {'occupied': [house, planets]}          any of planets in house
+    {'occupied_from': [ref, counts, planets]}   any of planets in the count-th houses from ref
+    {'conjunct': [planet, other]}           both in the same house
+    {'aspects': [planet, target]}           graha drishti on a planet or a house number
+    {'lord_in_house': [house, houses]}      lord of house is placed in one of houses
+    {'lords_conjunct': [house, other]}      lords of the two houses are two planets sharing a house
+    {'between_nodes': planets}              all on the Rahu -> Ketu side of the axis
+    {'fact': [name, values]}                a non-chart fact (mahadasha, detected doshas)
+    {'all': [...]}, {'any': [...]}, {'not': condition}
+
+Output fields, built only for rules that fire:
+    'Mars in the {nth[Mars]} house, {sign[Mars]}'
+                                            template over house numbers, house
+                                            ordinals (1st, 2nd, ...) / sign names
+    ('house', planet)                           house number
+    {'first': [(condition, value), ...], 'default': value}
+    {'collect': [(condition, value), ...], 'default': value}
+    anything else                               literal (lists are copied)
+
+compile_rules() turns every distinct condition - across all rules and their
+output fields - into one node of a flat program. Features (house and sign
+bitmasks, house occupancy, lordships, aspects) are computed once per chart,
+and only those some rule uses. Every node works on Python ints and numpy
+arrays alike, so evaluate() on one chart and evaluate_batch() on an (N, 10)
+milli-arcsecond array run the same program. A new rule costs only the
+conditions no earlier rule already has.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, "Swiss_Ephemeris"))
+sys.path.append(os.path.join(BASE_DIR, "kundliGenerator"))
+
+from GenerateKundli import CHART_BODIES, chart_longitudes
+from fixedLongitude import FULL_CIRCLE, RASHIS, house_number, rashi_index
+
+PLANETS = CHART_BODIES[:-1]
+LAGNA = len(PLANETS)
+_INDEX = {name: i for i, name in enumerate(CHART_BODIES)}
+
+ALL_HOUSES = 0xFFF
+
+# Lord of each sign (Aries..Pisces)
+SIGN_LORDS = ['Mars', 'Venus', 'Mercury', 'Moon', 'Sun', 'Mercury',
+              'Venus', 'Mars', 'Jupiter', 'Saturn', 'Saturn', 'Jupiter']
+_SIGN_LORD_INDEX = np.array([_INDEX[p] for p in SIGN_LORDS])
+
+# Full (graha drishti) aspects, in houses counted from the planet; 7th for the rest
+GRAHA_DRISHTI = {'Mars': (4, 7, 8), 'Jupiter': (5, 7, 9), 'Saturn': (3, 7, 10)}
+
+
+def _mask(counts):
+    """Bit (n - 1) for each house / count n"""
+    counts = [counts] if isinstance(counts, int) else counts
+    return sum(1 << (n - 1) % 12 for n in set(counts))
+
+
+_DRISHTI_MASK = [_mask(GRAHA_DRISHTI.get(p, (7,))) for p in PLANETS]
+
+
+def _rotate(mask, shift):
+    """12-bit house mask rotated by shift houses (int or array)"""
+    return ((mask << shift) | (mask >> (12 - shift))) & ALL_HOUSES
+
+
+def _chart_columns(chart):
+    """CHART_BODIES milli-arcsecond longitudes of a kundli dict, Chart, sequence or (N, 10) array"""
+    if isinstance(chart, np.ndarray):
+        return list(chart.T.astype(np.int64)) if chart.ndim == 2 else chart.tolist()
+    if isinstance(chart, dict):
+        return chart_longitudes(chart).tolist()
+    if hasattr(chart, 'data'):
+        return list(chart.data[:LAGNA + 1])
+    return list(chart)
+
+
+# --- shared features, each computed on first use ---
+
+def _longitude(f):
+    return _chart_columns(f['chart'])
+
+
+def _house(f):
+    lagna = f['longitude'][LAGNA]
+    return [house_number(m, lagna) for m in f['longitude'][:LAGNA]]
+
+
+def _sign(f):
+    return [rashi_index(m) for m in f['longitude']]
+
+
+def _house_bit(f):
+    return [1 << (h - 1) for h in f['house']]
+
+
+def _sign_bit(f):
+    return [1 << s for s in f['sign']]
+
+
+def _occupants(f):
+    """Per house: bitmask of the planets (PLANETS index) in it"""
+    return [sum((h == house) * (1 << p) for p, h in enumerate(f['house'])) for house in range(1, 13)]
+
+
+def _aspected(f):
+    """Per planet: bitmask of the houses it aspects"""
+    return [_rotate(_DRISHTI_MASK[p], h - 1) for p, h in enumerate(f['house'])]
+
+
+def _lord(f):
+    """Per house: index of its lord (whole signs from the Lagna sign)"""
+    lagna_sign = f['sign'][LAGNA]
+    return [_SIGN_LORD_INDEX[(lagna_sign + n) % 12] for n in range(12)]
+
+
+def _lord_bit(f):
+    """Per house: house bit of its lord"""
+    if isinstance(f['sign'][LAGNA], np.ndarray):
+        return [np.choose(lord, f['house_bit'][:LAGNA]) for lord in f['lord']]
+    return [f['house_bit'][lord] for lord in f['lord']]
+
+
+def _node_side(f):
+    """Bitmask of the planets strictly inside the Rahu -> Ketu half of the zodiac"""
+    rahu = f['longitude'][_INDEX['Rahu']]
+    side = 0
+    for p, m in enumerate(f['longitude'][:LAGNA]):
+        angle = (m - rahu) % FULL_CIRCLE
+        side = side | ((angle > 0) & (angle < FULL_CIRCLE // 2)) * (1 << p)
+    return side
+
+
+_FEATURES = {
+    'longitude': _longitude,
+    'house': _house,
+    'sign': _sign,
+    'house_bit': _house_bit,
+    'sign_bit': _sign_bit,
+    'occupants': _occupants,
+    'aspected': _aspected,
+    'lord': _lord,
+    'lord_bit': _lord_bit,
+    'node_side': _node_side
+}
+
+
+class ChartFeatures(dict):
+    """Features of one chart (ints) or a batch (arrays), computed lazily and kept"""
+
+    def __init__(self, chart, facts=None):
+        super().__init__(chart=chart, facts=facts or {})
+
+    def __missing__(self, key):
+        value = self[key] = _FEATURES[key](self)
+        return value
+
+
+def _fact(value, values):
+    if isinstance(value, np.ndarray):
+        return np.isin(value, list(values))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return not values.isdisjoint(value)
+    return value in values
+
+
+# --- compilation ---
+
+class RuleSet:
+    """A compiled list of rules; see the module docstring"""
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self._by_name = {rule['name']: rule for rule in self.rules}
+        self._nodes = []
+        self._ids = {}
+        self._when = [self._condition(rule['when']) for rule in self.rules]
+        self._outputs = [
+            [(key, self._field(spec)) for key, spec in rule.get('output', {}).items()]
+            for rule in self.rules
+        ]
+
+    def __len__(self):
+        return len(self.rules)
+
+    @property
+    def nodes(self):
+        """Distinct conditions in the compiled program"""
+        return len(self._nodes)
+
+    def _node(self, key, fn):
+        if key not in self._ids:
+            self._ids[key] = len(self._nodes)
+            self._nodes.append(fn)
+        return self._ids[key]
+
+    def _condition(self, condition):
+        (kind, args), = condition.items()
+
+        if kind in ('all', 'any'):
+            ids = tuple(sorted({self._condition(c) for c in args}))
+            if kind == 'all':
+                def fn(f, v):
+                    out = True
+                    for i in ids:
+                        out = out & v[i]
+                    return out
+            else:
+                def fn(f, v):
+                    out = False
+                    for i in ids:
+                        out = out | v[i]
+                    return out
+            return self._node((kind, ids), fn)
+
+        if kind == 'not':
+            i = self._condition(args)
+            return self._node(('not', i), lambda f, v: v[i] ^ True)
+
+        if kind == 'in_house':
+            p, mask = _INDEX[args[0]], _mask(args[1])
+            return self._node((kind, p, mask), lambda f, v: (f['house_bit'][p] & mask) != 0)
+
+        if kind == 'in_sign':
+            p, mask = _INDEX[args[0]], sum(1 << RASHIS.index(s) for s in set(args[1]))
+            return self._node((kind, p, mask), lambda f, v: (f['sign_bit'][p] & mask) != 0)
+
+        if kind == 'house_from':
+            p, ref, mask = _INDEX[args[0]], _INDEX[args[1]], _mask(args[2])
+            return self._node(
+                (kind, p, ref, mask),
+                lambda f, v: ((1 << (f['house'][p] - f['house'][ref]) % 12) & mask) != 0
+            )
+
+        if kind == 'occupied':
+            house, planets = args[0], args[1] if len(args) > 1 else PLANETS
+            mask = sum(1 << _INDEX[p] for p in set(planets))
+            return self._node((kind, house, mask), lambda f, v: (f['occupants'][house - 1] & mask) != 0)
+
+        if kind == 'occupied_from':
+            ref, counts = _INDEX[args[0]], _mask(args[1])
+            planets = tuple(sorted({_INDEX[p] for p in args[2]}))
+
+            def fn(f, v):
+                occupied = 0
+                for p in planets:
+                    occupied = occupied | f['house_bit'][p]
+                return (occupied & _rotate(counts, f['house'][ref] - 1)) != 0
+            return self._node((kind, ref, counts, planets), fn)
+
+        if kind == 'conjunct':
+            p, q = sorted((_INDEX[args[0]], _INDEX[args[1]]))
+            return self._node((kind, p, q), lambda f, v: f['house'][p] == f['house'][q])
+
+        if kind == 'aspects':
+            p, target = _INDEX[args[0]], args[1]
+            if isinstance(target, int):
+                bit = 1 << (target - 1)
+                return self._node((kind, p, 'house', target), lambda f, v: (f['aspected'][p] & bit) != 0)
+            q = _INDEX[target]
+            return self._node((kind, p, q), lambda f, v: (f['aspected'][p] & f['house_bit'][q]) != 0)
+
+        if kind == 'lord_in_house':
+            house, mask = args[0], _mask(args[1])
+            return self._node((kind, house, mask), lambda f, v: (f['lord_bit'][house - 1] & mask) != 0)
+
+        if kind == 'lords_conjunct':
+            a, b = sorted(args)
+            return self._node(
+                (kind, a, b),
+                lambda f, v: (f['lord_bit'][a - 1] == f['lord_bit'][b - 1]) & (f['lord'][a - 1] != f['lord'][b - 1])
+            )
+
+        if kind == 'between_nodes':
+            mask = sum(1 << _INDEX[p] for p in set(args))
+            return self._node((kind, mask), lambda f, v: (f['node_side'] & mask) == mask)
+
+        if kind == 'fact':
+            name, values = args[0], frozenset(args[1])
+            return self._node((kind, name, values), lambda f, v: _fact(f['facts'].get(name), values))
+
+        raise ValueError(f"Unknown rule condition {kind!r}")
+
+    def _field(self, spec):
+        """Compile an output field to fn(features, values) -> value for one chart"""
+        if isinstance(spec, str):
+            if '{' not in spec:
+                return lambda f, v: spec
+            return lambda f, v: spec.format_map(_template_context(f))
+        if isinstance(spec, tuple) and spec[0] == 'house':
+            p = _INDEX[spec[1]]
+            return lambda f, v: int(f['house'][p])
+        if isinstance(spec, dict) and ('first' in spec or 'collect' in spec):
+            choices = [(self._condition(c), value) for c, value in spec.get('first', spec.get('collect'))]
+            default = spec.get('default')
+            if 'first' in spec:
+                return lambda f, v: next((value for i, value in choices if v[i]), default)
+
+            def collect(f, v):
+                found = [value for i, value in choices if v[i]]
+                return found if found else [default]
+            return collect
+        if isinstance(spec, list):
+            return lambda f, v: list(spec)
+        return lambda f, v: spec
+
+    # --- evaluation ---
+
+    def _run(self, features):
+        values = []
+        for node in self._nodes:
+            values.append(node(features, values))
+        return values
+
+    def fired(self, chart, **facts):
+        """The rule dicts that hold for one chart (kundli dict, Chart or 10 longitudes)"""
+        values = self._run(ChartFeatures(chart, facts))
+        return [rule for rule, i in zip(self.rules, self._when) if values[i]]
+
+    def evaluate(self, chart, **facts):
+        """One result dict - name, detected, output fields - per rule that holds"""
+        features = ChartFeatures(chart, facts)
+        values = self._run(features)
+        results = []
+        for rule, i, fields in zip(self.rules, self._when, self._outputs):
+            if values[i]:
+                result = {'name': rule['name'], 'detected': True}
+                for key, fn in fields:
+                    result[key] = fn(features, values)
+                results.append(result)
+        return results
+
+    def restore(self, name, houses=None, **fields):
+        """
+        A result dict as evaluate() builds it, from stored values instead of
+        a chart: literals come from the rule, templates are filled from
+        houses ({planet: house}), and `fields` give every chart-dependent
+        field (('house', planet), 'first' / 'collect')
+        """
+        rule = self._by_name[name]
+        result = {'name': name, 'detected': True}
+        for key, spec in rule.get('output', {}).items():
+            if key in fields:
+                result[key] = fields[key]
+            elif isinstance(spec, str):
+                result[key] = spec.format_map(_house_context(houses or {}))
+            elif isinstance(spec, (tuple, dict)):
+                raise ValueError(f"{name!r} output field {key!r} depends on the chart; pass it")
+            else:
+                result[key] = list(spec) if isinstance(spec, list) else spec
+        return result
+
+    def evaluate_batch(self, longitudes, **facts):
+        """(N, len(rules)) bool matrix for an (N, 10) array of CHART_BODIES longitudes (mas)"""
+        longitudes = np.asarray(longitudes)
+        values = self._run(ChartFeatures(longitudes, facts))
+        n = len(longitudes)
+        out = np.empty((n, len(self.rules)), dtype=bool)
+        for r, i in enumerate(self._when):
+            out[:, r] = values[i]
+        return out
+
+
+def ordinal(n):
+    """1 -> '1st', 2 -> '2nd', 12 -> '12th' (house numbers)"""
+    return f"{n}{'st' if n == 1 else 'nd' if n == 2 else 'rd' if n == 3 else 'th'}"
+
+
+def _house_context(houses):
+    return {'house': houses, 'nth': {planet: ordinal(h) for planet, h in houses.items()}}
+
+
+def _template_context(f):
+    return {
+        **_house_context({planet: int(h) for planet, h in zip(PLANETS, f['house'])}),
+        'sign': {body: RASHIS[int(s)] for body, s in zip(CHART_BODIES, f['sign'])}
+    }
+
+
+def compile_rules(rules):
+    return RuleSet(rules)
+
+
+if __name__ == "__main__":
+    import time
+
+    from itertools import product
+
+    rng = np.random.default_rng(46)
+    n = 200_000
+    longitudes = rng.integers(0, FULL_CIRCLE, (n, len(CHART_BODIES)), dtype=np.int32)
+    # Rahu and Ketu are opposite
+    longitudes[:, _INDEX['Ketu']] = (longitudes[:, _INDEX['Rahu']] + FULL_CIRCLE // 2) % FULL_CIRCLE
+
+    # Synthetic yoga-like rules drawn from a shared vocabulary of conditions
+    vocabulary = (
+        [{'in_house': [p, [1, 4, 7, 10]]} for p in PLANETS] +
+        [{'in_house': [p, [6, 8, 12]]} for p in PLANETS] +
+        [{'in_sign': [p, RASHIS[s::4]]} for p, s in product(PLANETS, range(4))] +
+        [{'aspects': [p, q]} for p, q in product(PLANETS[:7], PLANETS[:7]) if p != q] +
+        [{'conjunct': [p, q]} for p, q in product(PLANETS[:7], PLANETS[:7]) if p < q] +
+        [{'lord_in_house': [h, [1, 5, 9]]} for h in range(1, 13)] +
+        [{'house_from': [p, 'Moon', [1, 4, 7, 10]]} for p in PLANETS]
+    )
+    rules = [
+        {'name': f'Yoga {k}', 'when': {'all': [vocabulary[i] for i in rng.choice(len(vocabulary), 3)]}}
+        for k in range(300)
+    ]
+
+    print("=== RULE COUNT vs COST ===")
+    single = [tuple(int(x) for x in row) for row in longitudes[:2000]]
+    for count in (3, 30, 300):
+        ruleset = compile_rules(rules[:count])
+        start = time.perf_counter()
+        for chart in single:
+            ruleset.fired(chart)
+        per_chart = (time.perf_counter() - start) / len(single) * 1e6
+        start = time.perf_counter()
+        matrix = ruleset.evaluate_batch(longitudes)
+        batch = time.perf_counter() - start
+        print(f"{count:>4} rules, {ruleset.nodes:>4} nodes: {per_chart:7.1f} µs/chart single, "
+              f"{n / batch:>12,.0f} charts/s batch ({matrix.sum():,} hits)")
+
+    ruleset = compile_rules(rules)
+    singles = np.array([[r in ruleset.fired(chart) for r in ruleset.rules] for chart in single[:200]])
+    print(f"\nSingle-chart and batch evaluation agree: {(singles == ruleset.evaluate_batch(longitudes[:200])).all()}")
@@ -0,0 +1,466 @@
+"""
+shadbala.py
+-----------
+Six-fold strength (Shadbala) of the seven planets, in virupas
+(60 virupas = 1 rupa):
+
+- sthana:     uchcha, saptavargaja (D1 D2 D3 D7 D9 D12 D30), ojhayugma,
+              kendradi, drekkana
+- dig:        distance from the planet's powerless angle
+- kala:       nathonnatha, paksha, tribhaga, abda / masa / vara / hora,
+              ayana, and yuddha for planets in war
+- cheshta:    motion class from the daily speed (Sun: ayana, Moon: paksha)
+- naisargika: fixed natural strength
+- drik:       a quarter of benefic minus malefic aspect received
+
+Everything the components read is gathered once per chart into a context
+of (N, 7) arrays: longitude, latitude, speed and declination, the
+sunrise/sunset of the birth day, houses, the seven varga signs and the
+aspect angles between planets. The components are plain array arithmetic
+on it, so one chart and a batch run the same code. In a batch, charts born
+on the same local date share one sunrise solve (every location at once)
+and one obliquity evaluation.
+
+Longitudes are the tropical ones generate_kundli stores, as everywhere
+else in the app.
+"""
+
+import os
+import sys
+from datetime import date as date_cls
+
+import numpy as np
+import swisseph as swe
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, "Swiss_Ephemeris"))
+sys.path.append(os.path.join(BASE_DIR, "kundliGenerator"))
+sys.path.append(os.path.join(BASE_DIR, "panchang"))
+
+from Swiss_Ephemeris import PLANET_IDS, get_julian_day
+from fixedLongitude import MAS_PER_DEGREE, RASHI_SPAN, house_number, to_mas, varga_index
+from vectorEphemeris import armc_series, midheaven_from_armc, true_obliquity
+from sunriseSolver import sunrise_sunset
+from dailyTimings import HORA_SEQUENCE, WEEKDAY_LORDS
+from ruleEngine import SIGN_LORDS
+
+SHADBALA_PLANETS = ['Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn']
+SUN, MOON, MARS, MERCURY, JUPITER, VENUS, SATURN = range(len(SHADBALA_PLANETS))
+COMPONENTS = ['sthana', 'dig', 'kala', 'cheshta', 'naisargika', 'drik']
+
+_INDEX = {p: i for i, p in enumerate(SHADBALA_PLANETS)}
+_AXIS = np.arange(len(SHADBALA_PLANETS))
+_SIGN_LORD = np.array([_INDEX[p] for p in SIGN_LORDS])
+
+# --- Sthana bala ---
+
+# Deep exaltation point of each planet (degrees)
+EXALTATION = np.array([10, 33, 298, 165, 95, 357, 200], dtype=float)
+
+# Moolatrikona sign and degree span within it
+MOOLATRIKONA = {
+    'Sun': (4, 0, 20), 'Moon': (1, 3, 30), 'Mars': (0, 0, 12), 'Mercury': (5, 15, 20),
+    'Jupiter': (8, 0, 10), 'Venus': (6, 0, 15), 'Saturn': (10, 0, 20)
+}
+_MT_SIGN, _MT_START, _MT_END = (
+    np.array([MOOLATRIKONA[p][k] for p in SHADBALA_PLANETS]) * (MAS_PER_DEGREE if k else 1)
+    for k in range(3)
+)
+
+# Natural relationship of the row planet towards the column planet:
+# 1 friend, 0 neutral, -1 enemy
+NATURAL_RELATIONS = np.array([
+    # Su  Mo  Ma  Me  Ju  Ve  Sa
+    [0,   1,  1,  0,  1, -1, -1],     # Sun
+    [1,   0,  0,  1,  0,  0,  0],     # Moon
+    [1,   1,  0, -1,  1,  0,  0],     # Mars
+    [1,  -1,  0,  0,  0,  1,  0],     # Mercury
+    [1,   1,  1, -1,  0, -1,  0],     # Jupiter
+    [-1, -1,  0,  1,  0,  0,  1],     # Venus
+    [-1, -1, -1,  1,  0,  1,  0]      # Saturn
+])
+# Temporary friend: another planet 2, 3, 4, 10, 11 or 12 signs from it
+_TEMPORARY = np.array([-1, 1, 1, 1, -1, -1, -1, -1, -1, 1, 1, 1])
+
+SAPTAVARGAS = (1, 2, 3, 7, 9, 12, 30)
+# By compound relationship with the varga sign lord, great enemy .. great friend
+RELATION_VIRUPAS = np.array([1.875, 3.75, 7.5, 15, 22.5])
+OWN_SIGN_VIRUPAS = 30
+MOOLATRIKONA_VIRUPAS = 45
+
+# Moon and Venus are strong in even signs, the others in odd ones
+_EVEN_SIGN_STRONG = np.isin(_AXIS, [MOON, VENUS])
+
+# Kendra / panaphara / apoklima
+KENDRADI_VIRUPAS = np.array([60, 30, 15])
+
+# Drekkana strong for the planet's gender: male 1st, neuter 2nd, female 3rd
+_DREKKANA = np.array([0, 2, 0, 1, 0, 2, 1])
+
+# --- Dig bala: the angle where each planet is strongest ---
+DIG_STRENGTH_POINT = ['MC', 'IC', 'MC', 'ASC', 'ASC', 'IC', 'DESC']
+_ANGLES = ['ASC', 'IC', 'DESC', 'MC']
+
+# --- Kala bala ---
+_DAY_STRONG = np.isin(_AXIS, [SUN, JUPITER, VENUS])
+_NIGHT_STRONG = np.isin(_AXIS, [MOON, MARS, SATURN])
+_PAKSHA_BENEFIC = np.isin(_AXIS, [MOON, MERCURY, JUPITER, VENUS])
+# Lords of the thirds of the day and of the night (Jupiter rules all six)
+DAY_THIRD_LORDS = np.array([MERCURY, SUN, SATURN])
+NIGHT_THIRD_LORDS = np.array([MOON, VENUS, MARS])
+ABDA_VIRUPAS, MASA_VIRUPAS, VARA_VIRUPAS, HORA_VIRUPAS = 15, 30, 45, 60
+# Ayana: +1 strong with north declination, -1 with south, 0 either way (Mercury)
+_AYANA_SIGN = np.array([1, -1, 1, 0, 1, 1, -1])
+
+# Monday = 0 as in WEEKDAY_LORDS
+_WEEKDAY_LORD = np.array([_INDEX[p] for p in WEEKDAY_LORDS])
+_HORA_LORD = np.array([_INDEX[p] for p in HORA_SEQUENCE])
+_FIRST_HORA = np.array([HORA_SEQUENCE.index(p) for p in WEEKDAY_LORDS])
+# Kali ahargana: days since 18 Feb 3102 BCE (JD 588465.5), a Friday
+KALI_EPOCH_JD = 588465.5
+_KALI_EPOCH_WEEKDAY = 4
+_ORDINAL_TO_JD = 1721424.5
+
+# Planets that can be at war (within one degree)
+WAR_ORB = 1.0
+_WAR_PAIRS = np.array([(a, b) for a in range(MARS, SATURN + 1) for b in range(a + 1, SATURN + 1)]).T
+
+# --- Cheshta bala ---
+# Mean daily motion (degrees), and virupas by speed relative to it:
+# vakra (retrograde) 60, vikala (stationary) 15, mandatara 15, manda 30,
+# sama 7.5, chara 45, atichara 30
+MEAN_MOTION = np.array([0.9856, 13.1764, 0.5240, 0.9856, 0.0831, 0.9856, 0.0335])
+_SPEED_CLASSES = [(0.5, 15), (0.9, 30), (1.1, 7.5), (1.5, 45)]
+RETROGRADE_VIRUPAS, STATIONARY_VIRUPAS, ATICHARA_VIRUPAS = 60, 15, 30
+
+# --- Naisargika bala: Sun 7/7 of a rupa down to Saturn 1/7 ---
+NAISARGIKA = 60 * np.array([7, 6, 2, 3, 4, 5, 1]) / 7
+
+# --- Drik bala ---
+# Aspect value (virupas) by angle from the aspecting to the aspected planet
+_DRISHTI_ANGLES = [0, 30, 60, 90, 120, 150, 180, 300, 360]
+_DRISHTI_VALUES = [0, 0, 15, 45, 30, 0, 60, 0, 0]
+# Special aspects: (planet, from, to, added virupas)
+SPECIAL_DRISHTI = [
+    (MARS, 90, 120, 15), (MARS, 210, 240, 15),
+    (JUPITER, 120, 150, 30), (JUPITER, 240, 270, 30),
+    (SATURN, 60, 90, 45), (SATURN, 270, 300, 45)
+]
+# +1 benefic, -1 malefic; the Moon is benefic while waxing
+_NATURE = np.array([-1, 1, -1, 1, 1, 1, -1])
+
+# Minimum total strength (rupas)
+REQUIRED_RUPAS = np.array([6.5, 6.0, 5.0, 7.0, 6.5, 5.5, 5.0])
+
+
+def _distance(a, b):
+    """Shortest arc between two longitudes, 0..180"""
+    return np.abs((a - b + 180) % 360 - 180)
+
+
+def shadbala_context(kundlis, birth_locations):
+    """
+    Inputs shared by every component, for N charts (generate_kundli dicts or
+    Charts). Latitude and speed come from one swisseph call per planet. Sunrise, sunset and obliquity are
+    solved once per distinct local birth date.
+    """
+    n = len(kundlis)
+    jd = np.empty(n)
+    longitude = np.empty((n, len(SHADBALA_PLANETS)))
+    latitude = np.empty_like(longitude)
+    speed = np.empty_like(longitude)
+    ascendant = np.empty(n)
+    ordinal = np.empty(n, dtype=np.int64)
+    geo_lat = np.array([float(loc['latitude']) for loc in birth_locations])
+    geo_lon = np.array([float(loc['longitude']) for loc in birth_locations])
+    by_date = {}
+
+    for i, kundli in enumerate(kundlis):
+        if hasattr(kundli, 'codes'):
+            kundli = kundli.to_dict()
+        details = kundli['birth_details']
+        offset = details.get('utc_offset')
+        jd[i] = get_julian_day(details['date'], details['time'],
+                               details.get('timezone') if offset is None else offset)
+        for j, planet in enumerate(SHADBALA_PLANETS):
+            position = swe.calc_ut(jd[i], PLANET_IDS[planet], swe.FLG_SPEED)[0]
+            longitude[i, j] = kundli['planets'][planet]['longitude']
+            latitude[i, j] = position[1]
+            speed[i, j] = position[3]
+        ascendant[i] = kundli['lagna']['longitude']
+        ordinal[i] = date_cls.fromisoformat(details['date']).toordinal()
+        by_date.setdefault(ordinal[i], []).append(i)
+
+    sunrise = np.empty(n)
+    sunset = np.empty(n)
+    eps = np.empty(n)
+    armc = np.empty(n)
+    for day, members in by_date.items():
+        members = np.array(members)
+        jd0 = day + _ORDINAL_TO_JD
+        rises, sets = sunrise_sunset(jd0, geo_lat[members], geo_lon[members])
+        sunrise[members] = rises[0]
+        sunset[members] = sets[0]
+        eps[members] = true_obliquity(jd0)
+        armc[members] = armc_series(jd[members], geo_lon[members], jd_ref=jd0)
+
+    # Polar day or night: fall back to 6h and 18h local mean time
+    local_midnight = ordinal + _ORDINAL_TO_JD - geo_lon / 360
+    sunrise = np.where(np.isnan(sunrise), local_midnight + 0.25, sunrise)
+    sunset = np.where(np.isnan(sunset), local_midnight + 0.75, sunset)
+
+    mas = to_mas(longitude)
+    beta = np.radians(latitude)
+    e = np.radians(eps)[:, None]
+    declination = np.degrees(np.arcsin(
+        np.sin(beta) * np.cos(e) + np.cos(beta) * np.sin(e) * np.sin(np.radians(longitude))
+    ))
+    mc = midheaven_from_armc(armc, eps)
+
+    return {
+        'jd': jd,
+        'ordinal': ordinal,
+        'longitude': longitude,
+        'latitude': latitude,
+        'speed': speed,
+        'declination': declination,
+        'mas': mas,
+        'vargas': np.stack([varga_index(mas, d) for d in SAPTAVARGAS], axis=1),
+        'houses': house_number(mas, to_mas(ascendant)[:, None]),
+        'angles': np.stack([ascendant, mc + 180, ascendant + 180, mc], axis=1) % 360,
+        'sunrise': sunrise,
+        'sunset': sunset,
+        'aspect_angles': (longitude[:, None, :] - longitude[:, :, None]) % 360,
+        'elongation': (longitude[:, MOON] - longitude[:, SUN]) % 360
+    }
+
+
+def saptavargaja_bala(ctx):
+    """
+    Dignity in each of the seven vargas, by the planet's compound
+    relationship (natural + temporary, from the D1 signs) with the lord of
+    its varga sign
+    """
+    vargas = ctx['vargas']
+    rasi = vargas[:, 0]
+    lords = _SIGN_LORD[vargas]
+    lord_rasi = np.take_along_axis(rasi, lords.reshape(len(rasi), -1), axis=1).reshape(lords.shape)
+    compound = NATURAL_RELATIONS[_AXIS, lords] + _TEMPORARY[(lord_rasi - rasi[:, None]) % 12]
+    virupas = np.where(lords == _AXIS, OWN_SIGN_VIRUPAS, RELATION_VIRUPAS[compound + 2])
+
+    offset = ctx['mas'] % RASHI_SPAN
+    moolatrikona = (rasi == _MT_SIGN) & (offset >= _MT_START) & (offset < _MT_END)
+    virupas[:, 0] = np.where(moolatrikona, MOOLATRIKONA_VIRUPAS, virupas[:, 0])
+    return virupas.sum(axis=1)
+
+
+def sthana_bala(ctx):
+    uchcha = _distance(ctx['longitude'], EXALTATION + 180) / 3
+    saptavargaja = saptavargaja_bala(ctx)
+    rasi_navamsa = ctx['vargas'][:, [SAPTAVARGAS.index(1), SAPTAVARGAS.index(9)]]
+    ojhayugma = 15 * ((rasi_navamsa % 2 == 1) == _EVEN_SIGN_STRONG).sum(axis=1)
+    kendradi = KENDRADI_VIRUPAS[(ctx['houses'] - 1) % 3]
+    drekkana = 15 * (ctx['mas'] % RASHI_SPAN // (RASHI_SPAN // 3) == _DREKKANA)
+    return uchcha + saptavargaja + ojhayugma + kendradi + drekkana
+
+
+def dig_bala(ctx):
+    points = ctx['angles'][:, [_ANGLES.index(a) for a in DIG_STRENGTH_POINT]]
+    return (180 - _distance(ctx['longitude'], points)) / 3
+
+
+def paksha_bala(ctx):
+    """Undoubled paksha bala (also the Moon's cheshta bala)"""
+    waxing = (180 - np.abs(ctx['elongation'] - 180)) / 3
+    return np.where(_PAKSHA_BENEFIC, waxing[:, None], 60 - waxing[:, None])
+
+
+def ayana_bala(ctx):
+    """Undoubled ayana bala (also the Sun's cheshta bala)"""
+    dec = ctx['declination']
+    dec = np.where(_AYANA_SIGN == 0, np.abs(dec), _AYANA_SIGN * dec)
+    return np.clip((24 + dec) / 48 * 60, 0, 60)
+
+
+def kala_bala(ctx, paksha, ayana):
+    jd, sunrise, sunset = ctx['jd'], ctx['sunrise'], ctx['sunset']
+    day_length = sunset - sunrise
+    is_day = (jd >= sunrise) & (jd < sunset)
+    before_sunrise = jd < sunrise
+
+    # Nathonnatha, from apparent noon taken midway between sunrise and sunset
+    from_noon = np.abs((jd - (sunrise + sunset) / 2 + 0.5) % 1 - 0.5)[:, None]
+    nathonnatha = np.select([_DAY_STRONG, _NIGHT_STRONG], [60 * (1 - 2 * from_noon), 120 * from_noon], 60)
+
+    # Tribhaga
+    night_start = np.where(before_sunrise, sunset - 1, sunset)
+    day_third = np.clip((jd - sunrise) / day_length * 3, 0, 2).astype(int)
+    night_third = np.clip((jd - night_start) / (1 - day_length) * 3, 0, 2).astype(int)
+    third_lord = np.where(is_day, DAY_THIRD_LORDS[day_third], NIGHT_THIRD_LORDS[night_third])
+    tribhaga = 60 * ((_AXIS == third_lord[:, None]) | (_AXIS == JUPITER))
+
+    # Lords of the Kali year (360 days), month (30 days), weekday and hour;
+    # the weekday runs from sunrise
+    day = ctx['ordinal'] - before_sunrise
+    ahargana = (day + _ORDINAL_TO_JD - KALI_EPOCH_JD).astype(np.int64)
+    abda = _WEEKDAY_LORD[(_KALI_EPOCH_WEEKDAY + ahargana // 360 * 360) % 7]
+    masa = _WEEKDAY_LORD[(_KALI_EPOCH_WEEKDAY + ahargana // 30 * 30) % 7]
+    weekday = (day - 1) % 7
+    hora = ((jd - np.where(before_sunrise, sunrise - 1, sunrise)) * 24).astype(int)
+    hora_lord = _HORA_LORD[(_FIRST_HORA[weekday] + hora) % 7]
+    lords = (
+        ABDA_VIRUPAS * (_AXIS == abda[:, None]) + MASA_VIRUPAS * (_AXIS == masa[:, None])
+        + VARA_VIRUPAS * (_AXIS == _WEEKDAY_LORD[weekday][:, None])
+        + HORA_VIRUPAS * (_AXIS == hora_lord[:, None])
+    )
+
+    # The Moon's paksha and the Sun's ayana bala count double
+    paksha = paksha + np.where(_AXIS == MOON, paksha, 0)
+    ayana = ayana + np.where(_AXIS == SUN, ayana, 0)
+    return nathonnatha + paksha + tribhaga + lords + ayana
+
+
+def yuddha_bala(ctx, strength):
+    """
+    Planets (Mars..Saturn) within WAR_ORB are at war: the one further north
+    in latitude wins the difference of their strengths from the loser
+    """
+    lon, lat = ctx['longitude'], ctx['latitude']
+    first, second = _WAR_PAIRS
+    yuddha = np.zeros_like(strength)
+    charts, pairs = np.nonzero(_distance(lon[:, first], lon[:, second]) < WAR_ORB)
+    for n, a, b in zip(charts, first[pairs], second[pairs]):
+        winner, loser = (a, b) if lat[n, a] >= lat[n, b] else (b, a)
+        spoils = abs(strength[n, a] - strength[n, b])
+        yuddha[n, winner] += spoils
+        yuddha[n, loser] -= spoils
+    return yuddha
+
+
+def cheshta_bala(ctx, paksha, ayana):
+    ratio = ctx['speed'] / MEAN_MOTION
+    cheshta = np.select(
+        [np.abs(ratio) < 0.1, ratio < 0] + [ratio < limit for limit, _ in _SPEED_CLASSES],
+        [STATIONARY_VIRUPAS, RETROGRADE_VIRUPAS] + [virupas for _, virupas in _SPEED_CLASSES],
+        ATICHARA_VIRUPAS
+    )
+    cheshta[:, SUN] = ayana[:, SUN]
+    cheshta[:, MOON] = paksha[:, MOON]
+    return cheshta
+
+
+def drik_bala(ctx):
+    theta = ctx['aspect_angles']
+    drishti = np.interp(theta, _DRISHTI_ANGLES, _DRISHTI_VALUES)
+    for planet, start, end, extra in SPECIAL_DRISHTI:
+        drishti[:, planet] += extra * ((theta[:, planet] >= start) & (theta[:, planet] < end))
+    drishti[:, _AXIS, _AXIS] = 0
+
+    nature = np.tile(_NATURE, (len(theta), 1))
+    nature[:, MOON] = np.where(ctx['elongation'] < 180, 1, -1)
+    return np.einsum('ni,nij->nj', nature, drishti) / 4
+
+
+def shadbala_from_context(ctx):
+    """
+    Every component plus 'total' (virupas), 'rupas', 'required' (rupas),
+    'ratio' and 'strength' (0..100, 50 = exactly the required strength),
+    each an (N, 7) array in SHADBALA_PLANETS order
+    """
+    paksha = paksha_bala(ctx)
+    ayana = ayana_bala(ctx)
+    balas = {
+        'sthana': sthana_bala(ctx),
+        'dig': dig_bala(ctx),
+        'kala': kala_bala(ctx, paksha, ayana),
+        'cheshta': cheshta_bala(ctx, paksha, ayana),
+        'naisargika': np.broadcast_to(NAISARGIKA, paksha.shape),
+        'drik': drik_bala(ctx)
+    }
+    balas['kala'] = balas['kala'] + yuddha_bala(ctx, sum(balas.values()))
+
+    total = sum(balas[c] for c in COMPONENTS)
+    ratio = total / 60 / REQUIRED_RUPAS
+    balas.update(
+        total=total,
+        rupas=total / 60,
+        required=np.broadcast_to(REQUIRED_RUPAS, total.shape),
+        ratio=ratio,
+        strength=np.rint(np.minimum(ratio, 2) * 50).astype(int)
+    )
+    return balas
+
+
+def shadbala_batch(kundlis, birth_locations):
+    """Shadbala of N charts as {key: (N, 7) array}; see shadbala_from_context"""
+    return shadbala_from_context(shadbala_context(kundlis, birth_locations))
+
+
+def calculate_shadbala(kundli, birth_location):
+    """{planet: {component: virupas, 'total', 'rupas', 'required', 'ratio', 'strength'}}"""
+    balas = shadbala_batch([kundli], [birth_location])
+    return {
+        planet: {
+            key: int(values[0, i]) if key == 'strength' else round(float(values[0, i]), 2)
+            for key, values in balas.items()
+        }
+        for i, planet in enumerate(SHADBALA_PLANETS)
+    }
+
+
+def print_shadbala_report(shadbala):
+    print("\n" + "=" * 84)
+    print("                    SHADBALA (virupas)")
+    print("=" * 84)
+    print(f"\n{'Planet':<9}" + "".join(f"{c.capitalize():>11}" for c in COMPONENTS)
+          + f"{'Rupas':>8}{'Need':>6}")
+    for planet, bala in shadbala.items():
+        flag = "" if bala['ratio'] >= 1 else "  weak"
+        print(f"{planet:<9}" + "".join(f"{bala[c]:>11.2f}" for c in COMPONENTS)
+              + f"{bala['rupas']:>8.2f}{bala['required']:>6.1f}{flag}")
+    print("\n" + "=" * 84)
+
+
+if __name__ == "__main__":
+    import time
+
+    from GenerateKundli import generate_kundli
+
+    birth_datetime = {"date": "1995-08-15", "time": "10:30:00"}
+    birth_location = {"name": "Delhi", "latitude": 28.6139, "longitude": 77.2090}
+
+    kundli = generate_kundli(birth_datetime, birth_location)
+    print_shadbala_report(calculate_shadbala(kundli, birth_location))
+
+    # Cost against generating the chart itself
+    runs = 200
+    start = time.perf_counter()
+    for _ in range(runs):
+        generate_kundli(birth_datetime, birth_location)
+    kundli_cost = (time.perf_counter() - start) / runs
+    start = time.perf_counter()
+    for _ in range(runs):
+        calculate_shadbala(kundli, birth_location)
+    single_cost = (time.perf_counter() - start) / runs
+    print(f"\ngenerate_kundli: {kundli_cost * 1e3:.2f} ms, calculate_shadbala: {single_cost * 1e3:.2f} ms "
+          f"({single_cost / kundli_cost:.1f}x)")
+
+    # Batch: 20 dates x 100 places, one sunrise solve per date
+    rng = np.random.default_rng(49)
+    locations = [{"name": f"Place {i}", "latitude": la, "longitude": lo}
+                 for i, (la, lo) in enumerate(zip(rng.uniform(-50, 60, 100), rng.uniform(-120, 150, 100)))]
+    kundlis, places = [], []
+    for d in range(20):
+        for location in locations:
+            moment = {"date": f"1990-{d % 12 + 1:02d}-{d + 1:02d}",
+                      "time": f"{rng.integers(24):02d}:{rng.integers(60):02d}:00"}
+            kundlis.append(generate_kundli(moment, location))
+            places.append(location)
+    start = time.perf_counter()
+    balas = shadbala_batch(kundlis, places)
+    elapsed = time.perf_counter() - start
+    print(f"Batch of {len(kundlis):,} charts: {elapsed / len(kundlis) * 1e3:.3f} ms per chart")
+    single = [calculate_shadbala(k, p) for k, p in zip(kundlis[:50], places[:50])]
+    same = all(np.allclose([s[p]['total'] for p in SHADBALA_PLANETS], balas['total'][i], atol=0.01)
+               for i, s in enumerate(single))
+    print(f"Batch matches single-chart totals: {same}")
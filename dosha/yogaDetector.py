@@ -0,0 +1,360 @@
+"""
+yogaDetector.py
+---------------
+Classical yogas as ruleEngine rules. Every test reads the shared chart
+bitboards (house and sign bits per planet, lords' house bits), so one
+chart costs a few hundred bit operations however many yogas are listed,
+and detect_yogas_batch / yoga_frequencies run the same rules over an
+(N, 10) milli-arcsecond array (batchCompute's longitudes_mas).
+
+Usage:
+    python dosha/yogaDetector.py                          # demo + 1M synthetic charts
+    python dosha/yogaDetector.py --archive charts.jsonl   # frequencies over a batchCompute output
+"""
+
+import argparse
+import json
+import os
+import sys
+from itertools import combinations, product
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+sys.path.append(os.path.join(BASE_DIR, "Swiss_Ephemeris"))
+sys.path.append(os.path.join(BASE_DIR, "kundliGenerator"))
+
+from fixedLongitude import RASHIS
+from ruleEngine import CHART_BODIES, SIGN_LORDS, compile_rules, ordinal
+
+KENDRAS = [1, 4, 7, 10]
+TRIKONAS = [1, 5, 9]
+DUSTHANAS = [6, 8, 12]
+WEALTH_HOUSES = [2, 5, 9, 11]
+
+# Planets beside the luminaries and nodes; Kemadruma looks for these around the Moon
+TARA_GRAHAS = ['Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn']
+
+# Own and exaltation signs of the Pancha Mahapurusha planets
+MAHAPURUSHA = {
+    'Ruchaka': ('Mars', ['Aries', 'Scorpio', 'Capricorn'],
+                'Courage, leadership and physical strength'),
+    'Bhadra': ('Mercury', ['Gemini', 'Virgo'],
+               'Intellect, eloquence and skill in trade'),
+    'Hamsa': ('Jupiter', ['Sagittarius', 'Pisces', 'Cancer'],
+              'Wisdom, righteousness and respect'),
+    'Malavya': ('Venus', ['Taurus', 'Libra', 'Pisces'],
+                'Comfort, beauty, arts and a happy married life'),
+    'Sasa': ('Saturn', ['Capricorn', 'Aquarius', 'Libra'],
+             'Authority, discipline and influence over people')
+}
+
+# Debilitation sign, its lord, and the planet exalted there
+DEBILITATION = {
+    'Sun': ('Libra', 'Venus', 'Saturn'),
+    'Moon': ('Scorpio', 'Mars', None),
+    'Mars': ('Cancer', 'Moon', 'Jupiter'),
+    'Mercury': ('Pisces', 'Jupiter', 'Venus'),
+    'Jupiter': ('Capricorn', 'Saturn', 'Mars'),
+    'Venus': ('Virgo', 'Mercury', 'Mercury'),
+    'Saturn': ('Aries', 'Mars', 'Sun')
+}
+
+
+def _neecha_bhanga(planet):
+    """planet debilitated, with the sign's lord or exaltation planet in a kendra from Lagna or Moon"""
+    sign, lord, exalted = DEBILITATION[planet]
+    cancellers = [c for c in dict.fromkeys((lord, exalted)) if c and c != planet]
+    return {'all': [
+        {'in_sign': [planet, [sign]]},
+        {'any': [{'in_house': [c, KENDRAS]} for c in cancellers] +
+                [{'house_from': [c, 'Moon', KENDRAS]} for c in cancellers]}
+    ]}
+
+
+def _lord_pairs(pairs):
+    return [({'lords_conjunct': [a, b]}, f"{ordinal(a)} and {ordinal(b)} lords") for a, b in pairs]
+
+
+def _yogakarakas():
+    """Lagna sign -> (planet, (kendra, trikona)) where one planet rules a kendra and a trikona"""
+    found = {}
+    for lagna, sign in enumerate(RASHIS):
+        lord = {house: SIGN_LORDS[(lagna + house - 1) % 12] for house in range(1, 13)}
+        for kendra, trikona in product(KENDRAS[1:], TRIKONAS[1:]):
+            if lord[kendra] == lord[trikona]:
+                found[sign] = (lord[kendra], tuple(sorted((kendra, trikona))))
+    return found
+
+
+# Two different planets; one planet ruling both is the yogakaraka (see yogakaraka)
+RAJA_PAIRS = _lord_pairs(product(KENDRAS, TRIKONAS[1:]))
+YOGAKARAKAS = _yogakarakas()
+DHANA_PAIRS = _lord_pairs(combinations(WEALTH_HOUSES, 2))
+NEECHA_BHANGA = [(_neecha_bhanga(planet), planet) for planet in DEBILITATION]
+VIPAREETA = [
+    ({'lord_in_house': [house, DUSTHANAS]}, f"{ordinal(house)} lord ({name})")
+    for house, name in ((6, 'Harsha'), (8, 'Sarala'), (12, 'Vimala'))
+]
+
+YOGA_RULES = compile_rules([
+    {
+        'name': 'Gaja Kesari Yoga',
+        'when': {'house_from': ['Jupiter', 'Moon', KENDRAS]},
+        'output': {
+            'category': 'Chandra',
+            'nature': 'Auspicious',
+            'description': 'Jupiter in a kendra from the Moon (Jupiter in the {nth[Jupiter]}, Moon in the {nth[Moon]} house)',
+            'effect': 'Intelligence, lasting reputation and prosperity'
+        }
+    },
+    *[
+        {
+            'name': f'{name} Yoga',
+            'when': {'all': [{'in_sign': [planet, signs]}, {'in_house': [planet, KENDRAS]}]},
+            'output': {
+                'category': 'Pancha Mahapurusha',
+                'nature': 'Auspicious',
+                'description': f'{planet} in own or exaltation sign ({{sign[{planet}]}}) '
+                               f'in a kendra ({{nth[{planet}]}} house)',
+                'effect': effect
+            }
+        }
+        for name, (planet, signs, effect) in MAHAPURUSHA.items()
+    ],
+    {
+        'name': 'Raja Yoga',
+        'when': {'any': [condition for condition, _ in RAJA_PAIRS]},
+        'output': {
+            'category': 'Raja',
+            'nature': 'Auspicious',
+            'description': 'Lords of a kendra and a trikona are conjunct',
+            'lords': {'collect': RAJA_PAIRS},
+            'effect': 'Status, authority and success in undertakings'
+        }
+    },
+    {
+        'name': 'Dhana Yoga',
+        'when': {'any': [condition for condition, _ in DHANA_PAIRS]},
+        'output': {
+            'category': 'Dhana',
+            'nature': 'Auspicious',
+            'description': 'Lords of wealth houses (2, 5, 9, 11) are conjunct',
+            'lords': {'collect': DHANA_PAIRS},
+            'effect': 'Accumulation of wealth and assets'
+        }
+    },
+    {
+        'name': 'Neecha Bhanga Raja Yoga',
+        'when': {'any': [condition for condition, _ in NEECHA_BHANGA]},
+        'output': {
+            'category': 'Raja',
+            'nature': 'Auspicious',
+            'description': 'Debilitation cancelled by the sign lord or exaltation planet in a kendra',
+            'planets': {'collect': NEECHA_BHANGA},
+            'effect': 'Rise after early setbacks'
+        }
+    },
+    {
+        'name': 'Budha-Aditya Yoga',
+        'when': {'conjunct': ['Sun', 'Mercury']},
+        'output': {
+            'category': 'Surya',
+            'nature': 'Auspicious',
+            'description': 'Sun and Mercury together in the {nth[Sun]} house',
+            'effect': 'Sharp intellect, communication and learning'
+        }
+    },
+    {
+        'name': 'Chandra-Mangala Yoga',
+        'when': {'conjunct': ['Moon', 'Mars']},
+        'output': {
+            'category': 'Chandra',
+            'nature': 'Auspicious',
+            'description': 'Moon and Mars together in the {nth[Moon]} house',
+            'effect': 'Enterprise and earnings through own effort'
+        }
+    },
+    {
+        'name': 'Vipareeta Raja Yoga',
+        'when': {'any': [condition for condition, _ in VIPAREETA]},
+        'output': {
+            'category': 'Raja',
+            'nature': 'Auspicious',
+            'description': 'Lords of dusthanas (6, 8, 12) placed in dusthanas',
+            'lords': {'collect': VIPAREETA},
+            'effect': 'Gains through adversity and the setbacks of rivals'
+        }
+    },
+    {
+        'name': 'Adhi Yoga',
+        'when': {'all': [{'house_from': [p, 'Moon', [6, 7, 8]]} for p in ('Mercury', 'Jupiter', 'Venus')]},
+        'output': {
+            'category': 'Chandra',
+            'nature': 'Auspicious',
+            'description': 'Mercury, Jupiter and Venus in the 6th, 7th and 8th from the Moon',
+            'effect': 'Leadership, comfort and a long, healthy life'
+        }
+    },
+    {
+        'name': 'Kemadruma Yoga',
+        'when': {'not': {'occupied_from': ['Moon', [2, 12], TARA_GRAHAS]}},
+        'output': {
+            'category': 'Chandra',
+            'nature': 'Challenging',
+            'description': 'No planet in the 2nd or 12th house from the Moon',
+            'cancellations': {
+                'collect': [
+                    ({'occupied_from': ['Moon', KENDRAS, TARA_GRAHAS]}, 'A planet in a kendra from the Moon'),
+                    ({'occupied': [1, TARA_GRAHAS + ['Moon']]}, 'The Moon or a planet in the Lagna')
+                ],
+                'default': 'No cancellations detected'
+            },
+            'effect': 'Periods of isolation or financial struggle'
+        }
+    }
+])
+
+
+def detect_yogas(kundli):
+    """Yogas present in a generate_kundli dict or a Chart, in YOGA_RULES order"""
+    return YOGA_RULES.evaluate(kundli)
+
+
+def yogakaraka(kundli):
+    """
+    The Lagna's yogakaraka (a generate_kundli dict or a Chart), or None:
+    {'planet', 'houses': (kendra, trikona), 'lagna', 'description'}.
+    It follows from the Lagna sign alone, so it is chart information
+    rather than a yoga and detect_yogas does not report it.
+    """
+    lagna = kundli.rashi('Lagna') if hasattr(kundli, 'codes') else kundli['lagna']['rashi']
+    if lagna not in YOGAKARAKAS:
+        return None
+    planet, houses = YOGAKARAKAS[lagna]
+    return {
+        'planet': planet,
+        'houses': houses,
+        'lagna': lagna,
+        'description': f"{planet} ({' and '.join(map(ordinal, houses))} lord, {lagna} Lagna)"
+    }
+
+
+def detect_yogas_batch(longitudes):
+    """{yoga name: bool array} for an (N, 10) CHART_BODIES milli-arcsecond array"""
+    matrix = YOGA_RULES.evaluate_batch(longitudes)
+    return {rule['name']: matrix[:, i] for i, rule in enumerate(YOGA_RULES.rules)}
+
+
+def yoga_frequencies(longitudes, chunk_size=250_000):
+    """{yoga name: number of charts with it} over an (N, 10) array, in chunks to bound memory"""
+    counts = dict.fromkeys((rule['name'] for rule in YOGA_RULES.rules), 0)
+    for start in range(0, len(longitudes), chunk_size):
+        matrix = YOGA_RULES.evaluate_batch(longitudes[start:start + chunk_size])
+        for name, count in zip(counts, matrix.sum(axis=0)):
+            counts[name] += int(count)
+    return counts
+
+
+def print_yoga_report(yogas, karaka=None):
+    print("\n" + "=" * 60)
+    print("             YOGA ANALYSIS REPORT")
+    print("=" * 60)
+
+    if karaka:
+        print(f"\nYogakaraka: {karaka['description']}")
+
+    if not yogas:
+        print("\nNo classical yogas detected.")
+    for i, yoga in enumerate(yogas, 1):
+        marker = '🌟' if yoga['nature'] == 'Auspicious' else '⚠️ '
+        print(f"\n{i}. {marker} {yoga['name']} ({yoga['category']})")
+        print(f"   {yoga['description']}")
+        for key in ('lords', 'planets'):
+            if key in yoga:
+                print(f"   {key.title()}: {', '.join(yoga[key])}")
+        if 'cancellations' in yoga:
+            print(f"   Cancellations: {', '.join(yoga['cancellations'])}")
+        print(f"   Effect: {yoga['effect']}")
+
+    print("\n" + "=" * 60)
+
+
+def archive_longitudes(path):
+    """
+    (N, 10) int32 longitudes_mas of a batchCompute output - JSONL file,
+    Parquet directory or binary chart stream - skipping failed records
+    """
+    if os.path.isdir(path):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Reading Parquet needs pyarrow: pip install pyarrow")
+        rows = pq.read_table(path, columns=["longitudes_mas"]).column("longitudes_mas").to_pylist()
+    else:
+        from chartCodec import STREAM_MAGIC, CodecError, decode_chart, iter_records
+        with open(path, "rb") as f:
+            binary = f.read(len(STREAM_MAGIC)) == STREAM_MAGIC
+        rows = []
+        if binary:
+            for record in iter_records(path):
+                try:
+                    chart, _ = decode_chart(record)
+                except CodecError:
+                    continue
+                rows.append(chart.data[:len(CHART_BODIES)].tolist())
+        else:
+            with open(path, encoding="utf-8") as f:
+                rows = [json.loads(line).get("longitudes_mas") for line in f if line.strip()]
+    rows = [r for r in rows if r]
+    return np.array(rows, dtype=np.int32).reshape(-1, len(CHART_BODIES))
+
+
+def _demo():
+    import time
+
+    from GenerateKundli import generate_kundli
+    from fixedLongitude import FULL_CIRCLE
+
+    birth_datetime = {"date": "1995-08-15", "time": "10:30:00"}
+    birth_location = {"name": "Delhi", "latitude": 28.6139, "longitude": 77.2090}
+
+    kundli = generate_kundli(birth_datetime, birth_location)
+    print_yoga_report(detect_yogas(kundli), yogakaraka(kundli))
+
+    start = time.perf_counter()
+    for _ in range(2000):
+        detect_yogas(kundli)
+    print(f"\nSingle chart: {(time.perf_counter() - start) / 2000 * 1e6:.0f} µs "
+          f"({len(YOGA_RULES)} yogas, {YOGA_RULES.nodes} distinct conditions)")
+
+    # Frequencies over 1M synthetic charts (uniform longitudes, Ketu opposite Rahu)
+    n = 1_000_000
+    rng = np.random.default_rng(47)
+    longitudes = rng.integers(0, FULL_CIRCLE, (n, len(CHART_BODIES)), dtype=np.int32)
+    longitudes[:, 8] = (longitudes[:, 7] + FULL_CIRCLE // 2) % FULL_CIRCLE
+    return longitudes
+
+
+def main(argv=None):
+    import time
+
+    parser = argparse.ArgumentParser(description="Classical yoga detection and frequencies")
+    parser.add_argument("--archive", help="batchCompute output (JSONL, Parquet directory or binary stream)")
+    args = parser.parse_args(argv)
+
+    longitudes = archive_longitudes(args.archive) if args.archive else _demo()
+    n = len(longitudes)
+
+    start = time.perf_counter()
+    counts = yoga_frequencies(longitudes)
+    elapsed = time.perf_counter() - start
+    print(f"\n=== YOGA FREQUENCIES, {n:,} CHARTS ({n / max(elapsed, 1e-9):,.0f} charts/s) ===")
+    for name, count in counts.items():
+        print(f"{name:<26} {count:>10,}  {count / max(n, 1):7.2%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
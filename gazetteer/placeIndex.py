@@ -0,0 +1,483 @@
+"""
+placeIndex.py
+-------------
+Offline birth-place lookup: prefix autocomplete, typo-tolerant search and
+reverse (nearest place) lookup, with no network call.
+
+The source is a GeoNames-style dump (gazetteer/places.tsv is bundled; any
+GeoNames citiesN.txt works too) compiled once into a binary index that is
+memory-mapped at load time:
+
+    python gazetteer/placeIndex.py build [--source cities15000.txt]
+    python gazetteer/placeIndex.py search bomb
+    python gazetteer/placeIndex.py nearest 28.61 77.21
+
+    places = load_gazetteer()
+    places.search("benar")          # -> [{'name': 'Varanasi', ...}]
+    places.nearest(28.61, 77.21)
+
+File layout (little-endian): 12-byte header (magic, version, key width,
+section count) followed by a table of (offset, length) pairs, one per
+entry in SECTIONS:
+    places       PLACE structs in source order
+    names        UTF-8 display names, sliced by PLACE name_offset/length
+    key_offsets  uint32, start of each search key in `keys` (+ end)
+    keys         normalized ASCII search keys, sorted
+    key_place    uint32 place id of each key
+    key_prefix   (keys, KEY_WIDTH) uint8, zero padded, for fuzzy matching
+    tree_points  (places, 3) float64 unit vectors in k-d tree order
+    tree_place   uint32 place id of each tree node
+    tree_axis    uint8 split axis of each tree node
+    meta         UTF-8 JSON {timezones, countries, source}
+
+Every name, ASCII name, alternate name and the word-suffixes of multi-word
+names ("new delhi" -> "delhi") become keys, so a prefix query is a binary
+search for one contiguous range of `keys`. The k-d tree is an implicit
+median split over 3-D unit vectors (no date-line or pole special cases).
+"""
+
+import argparse
+import bisect
+import heapq
+import json
+import math
+import mmap
+import os
+import struct
+import tempfile
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SOURCE = os.path.join(BASE_DIR, "places.tsv")
+
+MAGIC = b"VAGZ"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+SECTION = struct.Struct("<II")
+SECTIONS = ("places", "names", "key_offsets", "keys", "key_place", "key_prefix",
+            "tree_points", "tree_place", "tree_axis", "meta")
+
+KEY_WIDTH = 16                  # key characters kept for fuzzy matching
+EARTH_RADIUS_KM = 6371.0088
+
+PLACE = np.dtype([
+    ('latitude', '<f8'),
+    ('longitude', '<f8'),
+    ('population', '<u4'),
+    ('name_offset', '<u4'),
+    ('name_length', '<u2'),
+    ('timezone', '<u2'),        # index into meta timezones
+    ('country', '<u2'),         # index into meta countries
+])
+
+# GeoNames cities dump columns used here
+GEONAMES_COLUMNS = {
+    'name': 1, 'asciiname': 2, 'alternatenames': 3, 'latitude': 4, 'longitude': 5,
+    'feature_class': 6, 'country': 8, 'population': 14, 'timezone': 17
+}
+
+
+def normalize(text):
+    """Lower-case ASCII search form: accents dropped, punctuation to spaces"""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode().lower()
+    text = text.replace("'", "").replace("’", "")
+    return " ".join("".join(c if c.isalnum() else " " for c in text).split())
+
+
+def _search_keys(name, asciiname, alternates):
+    keys = set()
+    for candidate in [name, asciiname, *alternates]:
+        key = normalize(candidate)
+        if not key:
+            continue                    # non-Latin alternate names
+        words = key.split(" ")
+        keys.update(" ".join(words[i:]) for i in range(len(words)))
+    return keys
+
+
+def read_geonames(path):
+    """Populated places (feature class P) from a GeoNames-format TSV"""
+    places = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("#") or not line.strip():
+                continue
+            row = line.rstrip("\n").split("\t")
+            if row[GEONAMES_COLUMNS['feature_class']] != "P":
+                continue
+            alternates = row[GEONAMES_COLUMNS['alternatenames']]
+            places.append({
+                'name': row[GEONAMES_COLUMNS['name']],
+                'asciiname': row[GEONAMES_COLUMNS['asciiname']],
+                'alternates': alternates.split(",") if alternates else [],
+                'latitude': float(row[GEONAMES_COLUMNS['latitude']]),
+                'longitude': float(row[GEONAMES_COLUMNS['longitude']]),
+                'country': row[GEONAMES_COLUMNS['country']],
+                'population': int(row[GEONAMES_COLUMNS['population']] or 0),
+                'timezone': row[GEONAMES_COLUMNS['timezone']]
+            })
+    return places
+
+
+def unit_vectors(latitudes, longitudes):
+    lat = np.radians(latitudes)
+    lon = np.radians(longitudes)
+    return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+def _build_tree(points):
+    """Implicit k-d tree: returns (order, axis); node i splits its span at the median"""
+    order = np.arange(len(points))
+    axis = np.zeros(len(points), dtype=np.uint8)
+    stack = [(0, len(points))]
+    while stack:
+        lo, hi = stack.pop()
+        if hi - lo <= 0:
+            continue
+        span = points[order[lo:hi]]
+        split = int(np.ptp(span, axis=0).argmax())
+        order[lo:hi] = order[lo:hi][np.argsort(span[:, split], kind="stable")]
+        mid = (lo + hi) // 2
+        axis[mid] = split
+        stack.append((lo, mid))
+        stack.append((mid + 1, hi))
+    return order, axis
+
+
+def build_index(source=DEFAULT_SOURCE, path=None):
+    """Compile a GeoNames-format TSV into the binary index; returns the index path"""
+    path = path or index_path(source)
+    places = read_geonames(source)
+
+    timezones = sorted({p['timezone'] for p in places})
+    countries = sorted({p['country'] for p in places})
+    tz_ids = {tz: i for i, tz in enumerate(timezones)}
+    country_ids = {c: i for i, c in enumerate(countries)}
+
+    records = np.zeros(len(places), dtype=PLACE)
+    names = bytearray()
+    keys = []
+    for i, p in enumerate(places):
+        encoded = p['name'].encode("utf-8")
+        records[i] = (p['latitude'], p['longitude'], min(p['population'], 2 ** 32 - 1),
+                      len(names), len(encoded), tz_ids[p['timezone']], country_ids[p['country']])
+        names += encoded
+        keys.extend((key, i) for key in _search_keys(p['name'], p['asciiname'], p['alternates']))
+    keys.sort()
+
+    encoded_keys = [k.encode("ascii") for k, _ in keys]
+    key_offsets = np.zeros(len(keys) + 1, dtype='<u4')
+    key_offsets[1:] = np.cumsum([len(k) for k in encoded_keys])
+    key_place = np.array([i for _, i in keys], dtype='<u4')
+    key_prefix = np.zeros((len(keys), KEY_WIDTH), dtype=np.uint8)
+    for row, k in enumerate(encoded_keys):
+        prefix = k[:KEY_WIDTH]
+        key_prefix[row, :len(prefix)] = np.frombuffer(prefix, dtype=np.uint8)
+
+    points = unit_vectors(records['latitude'], records['longitude'])
+    order, axis = _build_tree(points)
+
+    sections = {
+        'places': records.tobytes(),
+        'names': bytes(names),
+        'key_offsets': key_offsets.tobytes(),
+        'keys': b"".join(encoded_keys),
+        'key_place': key_place.tobytes(),
+        'key_prefix': key_prefix.tobytes(),
+        'tree_points': points[order].astype('<f8').tobytes(),
+        'tree_place': order.astype('<u4').tobytes(),
+        'tree_axis': axis.tobytes(),
+        'meta': json.dumps({'timezones': timezones, 'countries': countries,
+                            'source': os.path.basename(source)}).encode("utf-8")
+    }
+
+    offset = HEADER.size + SECTION.size * len(SECTIONS)
+    table, body = [], bytearray()
+    for name in SECTIONS:
+        pad = -(offset + len(body)) % 8          # keep arrays 8-byte aligned
+        body += b"\0" * pad
+        table.append(SECTION.pack(offset + len(body), len(sections[name])))
+        body += sections[name]
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, KEY_WIDTH, len(SECTIONS)))
+        f.write(b"".join(table))
+        f.write(body)
+    os.replace(tmp, path)
+    return path
+
+
+def index_path(source):
+    return os.path.splitext(source)[0] + ".idx"
+
+
+class _Keys:
+    """Sequence view of the sorted key blob, for bisect"""
+
+    def __init__(self, blob, offsets):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        return bytes(self._blob[self._offsets[i]:self._offsets[i + 1]])
+
+
+class Gazetteer:
+    """Read-only, memory-mapped place index"""
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, key_width, count = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION or key_width != KEY_WIDTH or count != len(SECTIONS):
+            raise ValueError(f"{path} is not a version {VERSION} gazetteer index")
+
+        view = memoryview(self._mmap)
+        section = {}
+        for i, name in enumerate(SECTIONS):
+            offset, length = SECTION.unpack_from(self._mmap, HEADER.size + i * SECTION.size)
+            section[name] = view[offset:offset + length]
+
+        self.places = np.frombuffer(section['places'], dtype=PLACE)
+        self._names = section['names']
+        self._key_offsets = np.frombuffer(section['key_offsets'], dtype='<u4')
+        self._keys = _Keys(section['keys'], self._key_offsets)
+        self._key_place = np.frombuffer(section['key_place'], dtype='<u4')
+        self._key_prefix = np.frombuffer(section['key_prefix'], dtype=np.uint8).reshape(-1, KEY_WIDTH)
+        self._tree_points = np.frombuffer(section['tree_points'], dtype='<f8').reshape(-1, 3)
+        self._tree_place = np.frombuffer(section['tree_place'], dtype='<u4')
+        self._tree_axis = np.frombuffer(section['tree_axis'], dtype=np.uint8)
+        meta = json.loads(bytes(section['meta']).decode("utf-8"))
+        self.timezones = meta['timezones']
+        self.countries = meta['countries']
+        self.source = meta['source']
+
+    def __len__(self):
+        return len(self.places)
+
+    def place(self, place_id):
+        """Place record as a dict"""
+        r = self.places[place_id]
+        start = int(r['name_offset'])
+        return {
+            'id': int(place_id),
+            'name': bytes(self._names[start:start + int(r['name_length'])]).decode("utf-8"),
+            'country': self.countries[r['country']],
+            'latitude': float(r['latitude']),
+            'longitude': float(r['longitude']),
+            'timezone': self.timezones[r['timezone']],
+            'population': int(r['population'])
+        }
+
+    # --- prefix autocomplete -------------------------------------------------
+
+    def _prefix_range(self, prefix):
+        key = prefix.encode("ascii")
+        lo = bisect.bisect_left(self._keys, key)
+        hi = bisect.bisect_left(self._keys, key + b"\xff", lo)
+        return lo, hi
+
+    def _rank(self, place_ids, limit, exact=()):
+        """Unique place ids, exact key matches first, then by population"""
+        population = self.places['population'][place_ids].astype(np.int64)
+        score = population + np.isin(place_ids, list(exact)) * (1 << 40)
+        if len(place_ids) > 4 * limit:
+            top = np.argpartition(-score, 4 * limit)[:4 * limit]
+            place_ids, score = place_ids[top], score[top]
+        ranked = place_ids[np.argsort(-score, kind="stable")]
+        return list(dict.fromkeys(int(i) for i in ranked))[:limit]
+
+    def autocomplete(self, query, limit=10):
+        """Places with a name, alternate name or name word starting with `query`"""
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        lo, hi = self._prefix_range(prefix)
+        if lo == hi:
+            return []
+        exact_hi = bisect.bisect_right(self._keys, prefix.encode("ascii"), lo, hi)
+        exact = self._key_place[lo:exact_hi]
+        return [self.place(i) for i in self._rank(self._key_place[lo:hi], limit, exact)]
+
+    # --- fuzzy ------------------------------------------------------------------
+
+    def _prefix_distances(self, query, lo, hi):
+        """
+        Edit distance from `query` to the closest prefix of each key in
+        [lo, hi), vectorized over keys (Levenshtein DP, one column at a time).
+        """
+        q = np.frombuffer(query.encode("ascii")[:KEY_WIDTH - 1], dtype=np.uint8)
+        width = min(len(q) + 2, KEY_WIDTH)
+        keys = self._key_prefix[lo:hi, :width]
+        lengths = (keys != 0).sum(axis=1)
+
+        previous = np.broadcast_to(np.arange(width + 1, dtype=np.int16), (hi - lo, width + 1))
+        for i, char in enumerate(q, start=1):
+            best = np.minimum(previous[:, :-1] + (keys != char), previous[:, 1:] + 1)
+            current = np.empty_like(previous)
+            current[:, 0] = i
+            for j in range(1, width + 1):
+                current[:, j] = np.minimum(best[:, j - 1], current[:, j - 1] + 1)
+            previous = current
+        columns = np.arange(width + 1)
+        return np.where(columns[None, :] <= lengths[:, None], previous, 99).min(axis=1)
+
+    def fuzzy_search(self, query, limit=10, max_edits=None):
+        """
+        Typo-tolerant prefix search: keys whose beginning is within
+        `max_edits` edits of `query` (default 1, or 2 for 6+ characters).
+        Candidates are keys starting with the query's first or second
+        character, each a contiguous block of the sorted keys.
+        """
+        query = normalize(query)
+        if not query:
+            return []
+        if max_edits is None:
+            max_edits = 1 if len(query) < 6 else 2
+
+        blocks = {self._prefix_range(c) for c in query[:2]}
+        candidates, distances = [], []
+        for lo, hi in blocks:
+            if lo < hi:
+                candidates.append(self._key_place[lo:hi])
+                distances.append(self._prefix_distances(query, lo, hi))
+        if not candidates:
+            return []
+        candidates = np.concatenate(candidates)
+        distances = np.concatenate(distances)
+
+        keep = distances <= max_edits
+        candidates, distances = candidates[keep], distances[keep]
+        population = self.places['population'][candidates].astype(np.int64)
+        ranked = candidates[np.lexsort((-population, distances))]
+        return [self.place(i) for i in list(dict.fromkeys(int(i) for i in ranked))[:limit]]
+
+    def search(self, query, limit=10):
+        """
+        Prefix matches, topped up with fuzzy matches when there are fewer
+        than `limit` (queries of 4+ characters, or when nothing matched)
+        """
+        results = self.autocomplete(query, limit)
+        if not results or (len(results) < limit and len(normalize(query)) >= 4):
+            seen = {p['id'] for p in results}
+            results += [p for p in self.fuzzy_search(query, limit) if p['id'] not in seen]
+        return results[:limit]
+
+    # --- reverse lookup -----------------------------------------------------------
+
+    def nearest(self, latitude, longitude, k=1):
+        """The k places closest to a point, nearest first, with 'distance_km'"""
+        target = unit_vectors(latitude, longitude)
+        points, axes = self._tree_points, self._tree_axis
+        best = []                           # max-heap of (-chord², node)
+
+        def visit(lo, hi):
+            if lo >= hi:
+                return
+            mid = (lo + hi) // 2
+            d = points[mid] - target
+            chord2 = float(d @ d)
+            if len(best) < k:
+                heapq.heappush(best, (-chord2, mid))
+            elif chord2 < -best[0][0]:
+                heapq.heapreplace(best, (-chord2, mid))
+            diff = float(target[axes[mid]] - points[mid, axes[mid]])
+            near, far = ((mid + 1, hi), (lo, mid)) if diff > 0 else ((lo, mid), (mid + 1, hi))
+            visit(*near)
+            if len(best) < k or diff * diff < -best[0][0]:
+                visit(*far)
+
+        visit(0, len(points))
+        results = []
+        for neg_chord2, node in sorted(best, reverse=True):
+            place = self.place(int(self._tree_place[node]))
+            chord = math.sqrt(-neg_chord2)
+            place['distance_km'] = 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+            results.append(place)
+        return results
+
+    def close(self):
+        self.places = self._key_offsets = self._key_place = self._key_prefix = None
+        self._tree_points = self._tree_place = self._tree_axis = None
+        self._names = self._keys = None
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def format_place(place):
+    return f"{place['name']}, {place['country']}"
+
+
+@lru_cache(maxsize=4)
+def load_gazetteer(source=None):
+    """
+    Shared index for a GeoNames-format source (default: $GAZETTEER_SOURCE or
+    the bundled places.tsv), rebuilt when missing or older than the source.
+    Falls back to the temp directory when the source directory is read-only.
+    """
+    source = source or os.getenv("GAZETTEER_SOURCE") or DEFAULT_SOURCE
+    path = index_path(source)
+    if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(source):
+        try:
+            build_index(source, path)
+        except OSError:
+            path = os.path.join(tempfile.gettempdir(), os.path.basename(path))
+            build_index(source, path)
+    return Gazetteer(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the offline gazetteer")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Compile a GeoNames-format TSV into an index")
+    build.add_argument("--source", default=DEFAULT_SOURCE)
+    build.add_argument("--output", help="Index path (default: next to the source)")
+
+    search = sub.add_parser("search", help="Autocomplete / fuzzy search")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=10)
+
+    nearest = sub.add_parser("nearest", help="Closest places to a latitude/longitude")
+    nearest.add_argument("latitude", type=float)
+    nearest.add_argument("longitude", type=float)
+    nearest.add_argument("-k", type=int, default=3)
+
+    args = parser.parse_args()
+    if args.command == "build":
+        path = build_index(args.source, args.output)
+        with Gazetteer(path) as places:
+            print(f"Wrote {path}: {len(places):,} places, {len(places._keys):,} keys "
+                  f"({os.path.getsize(path):,} bytes)")
+        return
+
+    import time
+    places = load_gazetteer()
+    start = time.perf_counter()
+    if args.command == "search":
+        results = places.search(args.query, args.limit)
+    else:
+        results = places.nearest(args.latitude, args.longitude, args.k)
+    elapsed = (time.perf_counter() - start) * 1000
+    for p in results:
+        distance = f"  {p['distance_km']:.1f} km" if 'distance_km' in p else ""
+        print(f"{format_place(p):<32} {p['latitude']:>9.4f} {p['longitude']:>10.4f}  "
+              f"{p['timezone']:<28} {p['population']:>10,}{distance}")
+    print(f"({elapsed:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
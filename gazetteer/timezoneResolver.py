@@ -0,0 +1,300 @@
+"""
+timezoneResolver.py
+-------------------
+Latitude/longitude -> IANA time zone, and local time -> UT with the
+historical offsets of the tz database (LMT, war time, DST, ...), so charts
+for births outside India or before standard time are computed correctly.
+
+Zones come from the timezone-boundary-builder polygons shipped with
+timezonefinder. They are rasterized once at 0.5°: a cell that no zone
+boundary crosses lies wholly in one zone and answers in O(1). Points in the
+other cells (borders, coasts, enclaves) are refined with timezonefinder's
+point-in-polygon test, so border towns get the zone they are actually in.
+
+Offsets come from pytz's transition tables: utc_offset() is a cached
+per-(zone, instant) lookup for single charts, local_to_ut() converts whole
+arrays of local times with searchsorted over the same tables, without
+per-row pytz localization. Ambiguous and skipped wall-clock times resolve
+like pytz localize(is_dst=False).
+
+The raster reads timezonefinder's polygon storage (coords_of, holes,
+INT2COORD_FACTOR) and pytz's transition lists (_utc_transition_times,
+_transition_info), which are not public API; requirements.txt pins the
+versions this was tested with. Re-run test_timezone_resolver.py before
+raising either pin.
+
+A location's time zone is its 'utc_offset' (hours, a fixed offset),
+else its 'timezone' (IANA name), else resolved from its coordinates; see
+location_timezone(). Everything accepting a time zone takes either form.
+"""
+
+import os
+import tempfile
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+import pytz
+from timezonefinder import TimezoneFinder
+from timezonefinder.configs import INT2COORD_FACTOR
+
+GRID_DEGREES = 0.5
+BORDER = -2                     # raster value of cells refined per point
+J1970 = 2440587.5               # JD of 1970-01-01 00:00 UT
+
+RASTER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "timezones.tzgrid.npz")
+
+
+def get_tzinfo(timezone):
+    """pytz tzinfo for an IANA name or a fixed offset in hours"""
+    if isinstance(timezone, (int, float)):
+        return pytz.FixedOffset(round(timezone * 60))
+    return pytz.timezone(timezone)
+
+
+# --- raster ----------------------------------------------------------------------
+
+def _cell_centres(resolution):
+    latitudes = np.arange(-90 + resolution / 2, 90, resolution)
+    longitudes = np.arange(-180 + resolution / 2, 180, resolution)
+    return latitudes, longitudes
+
+
+def _boundary_rings(finder):
+    """(longitudes, latitudes) in degrees of every zone polygon and hole"""
+    rings = [finder.coords_of(b) for b in range(finder.nr_of_polygons)]
+    rings += [finder.holes.coords_of(h) for h in range(finder.nr_of_holes)]
+    for ring in rings:
+        yield ring[0] * INT2COORD_FACTOR, ring[1] * INT2COORD_FACTOR
+
+
+def _mark_crossed_cells(border, longitudes, latitudes, resolution):
+    """
+    Flag every cell a closed ring passes through. Edges are sampled at most
+    a quarter cell apart, and each sample flags the cells of a box a quarter
+    cell wide around it: the boxes cover the whole edge, and each box spans
+    at most 2 x 2 cells, all of which contain one of its corners.
+    """
+    reach = resolution / 4
+    lon = np.r_[longitudes, longitudes[0]]
+    lat = np.r_[latitudes, latitudes[0]]
+    d_lon, d_lat = np.diff(lon), np.diff(lat)
+    steps = np.maximum(np.ceil(np.hypot(d_lon, d_lat) / reach), 1).astype(np.int64)
+    edge = np.repeat(np.arange(len(steps)), steps)
+    t = (np.arange(steps.sum()) - np.repeat(np.cumsum(steps) - steps, steps)) / steps[edge]
+    x = lon[edge] + t * d_lon[edge]
+    y = lat[edge] + t * d_lat[edge]
+
+    nlat, nlon = border.shape
+    for dy in (-reach, reach):
+        i = np.clip(((y + dy + 90) // resolution).astype(np.int64), 0, nlat - 1)
+        for dx in (-reach, reach):
+            j = ((x + dx + 180) // resolution).astype(np.int64) % nlon
+            border[i, j] = True
+
+
+def build_raster(finder, resolution=GRID_DEGREES):
+    """
+    Raster arrays from the zone polygons of a TimezoneFinder:
+    - raster: (nlat, nlon) int16 zone ids, BORDER where a zone boundary
+      crosses the cell (or its centre has no zone)
+    - zones: zone names by id, as the finder numbers them
+    """
+    latitudes, longitudes = _cell_centres(resolution)
+    border = np.zeros((len(latitudes), len(longitudes)), dtype=bool)
+    for ring_longitudes, ring_latitudes in _boundary_rings(finder):
+        _mark_crossed_cells(border, ring_longitudes, ring_latitudes, resolution)
+
+    # Uncrossed cells lie inside one zone: the zone of their centre
+    lat_grid, lon_grid = np.meshgrid(latitudes, longitudes, indexing="ij")
+    interior = ~border.ravel()
+    raster = np.full(border.size, BORDER, dtype=np.int16)
+    raster[interior] = finder.timezone_ids_at(lngs=lon_grid.ravel()[interior],
+                                              lats=lat_grid.ravel()[interior])
+    raster[raster < 0] = BORDER
+    return {
+        'raster': raster.reshape(border.shape),
+        'zones': np.array(finder.timezone_names),
+        'data_version': np.array(str(finder.data_version)),
+        'resolution': np.float64(resolution)
+    }
+
+
+class TimezoneResolver:
+    def __init__(self, finder, arrays):
+        self.finder = finder
+        self.raster = arrays['raster']
+        self.zones = [str(z) for z in arrays['zones']]
+        self.resolution = float(arrays['resolution'])
+
+    def resolve_ids(self, latitudes, longitudes):
+        """Zone ids (into self.zones) for arrays of points"""
+        latitudes = np.atleast_1d(np.asarray(latitudes, dtype=float))
+        longitudes = np.atleast_1d(np.asarray(longitudes, dtype=float))
+        nlat, nlon = self.raster.shape
+        i = np.clip(((latitudes + 90) // self.resolution).astype(np.int64), 0, nlat - 1)
+        j = ((longitudes + 180) % 360 // self.resolution).astype(np.int64) % nlon
+        ids = self.raster[i, j].astype(np.int64)
+
+        border = np.flatnonzero(ids == BORDER)
+        if len(border):
+            # Point-in-polygon against the zones of the border cells
+            ids[border] = self.finder.timezone_ids_at(
+                lngs=(longitudes[border] + 180) % 360 - 180, lats=latitudes[border]
+            )
+            missing = border[ids[border] < 0]
+            if len(missing):
+                k = missing[0]
+                raise ValueError(f"No time zone at ({latitudes[k]}, {longitudes[k]})")
+        return ids
+
+    def resolve(self, latitude, longitude):
+        """IANA zone name for one point"""
+        return self.zones[int(self.resolve_ids(latitude, longitude)[0])]
+
+    def resolve_many(self, latitudes, longitudes):
+        """Zone names for arrays of points (object array)"""
+        return np.array(self.zones, dtype=object)[self.resolve_ids(latitudes, longitudes)]
+
+
+@lru_cache(maxsize=1)
+def load_resolver():
+    """
+    Shared resolver. The raster is cached as RASTER_PATH (or in the temp
+    directory when that is read-only) and rebuilt when timezonefinder's
+    boundary data changes.
+    """
+    finder = TimezoneFinder()
+    targets = (RASTER_PATH, os.path.join(tempfile.gettempdir(), os.path.basename(RASTER_PATH)))
+    for target in targets:
+        if os.path.exists(target):
+            with np.load(target) as cached:
+                if (str(cached['data_version']) == str(finder.data_version)
+                        and float(cached['resolution']) == GRID_DEGREES):
+                    return TimezoneResolver(finder, dict(cached))
+
+    arrays = build_raster(finder)
+    for target in targets:
+        try:
+            with open(target + ".tmp", "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(target + ".tmp", target)
+            break
+        except OSError:
+            continue
+    return TimezoneResolver(finder, arrays)
+
+
+def resolve_timezone(latitude, longitude):
+    return load_resolver().resolve(latitude, longitude)
+
+
+def location_timezone(location):
+    """'utc_offset' (hours) if given, else 'timezone', else resolved from lat/lon"""
+    if location.get('utc_offset') is not None:
+        return float(location['utc_offset'])
+    return location.get('timezone') or resolve_timezone(location['latitude'], location['longitude'])
+
+
+# --- offsets -----------------------------------------------------------------------
+
+@lru_cache(maxsize=512)
+def offset_table(timezone):
+    """
+    (transitions, offsets, dst) for a zone: UT JDs of each change (the first
+    is -inf), UTC offset in seconds and DST flag in force from each one on
+    """
+    tz = get_tzinfo(timezone)
+    if not hasattr(tz, '_utc_transition_times'):
+        offset = tz.utcoffset(datetime(2000, 1, 1)).total_seconds()
+        return np.array([-np.inf]), np.array([offset]), np.array([False])
+
+    transitions = np.array([
+        J1970 + (t - datetime(1970, 1, 1)).total_seconds() / 86400
+        for t in tz._utc_transition_times
+    ])
+    transitions[0] = -np.inf
+    offsets = np.array([info[0].total_seconds() for info in tz._transition_info])
+    dst = np.array([bool(info[1]) for info in tz._transition_info])
+    return transitions, offsets, dst
+
+
+def _offsets_at(table, ut):
+    transitions, offsets, dst = table
+    index = np.searchsorted(transitions, ut, side="right") - 1
+    return offsets[index], dst[index]
+
+
+def _local_to_ut_zone(local, table):
+    # The offsets in force half a day before and after; only one transition
+    # can fall between them, so each local time has at most these two readings
+    before, dst_before = _offsets_at(table, local - 0.75)
+    after, dst_after = _offsets_at(table, local + 0.75)
+    valid_before = _offsets_at(table, local - before / 86400)[0] == before
+    valid_after = _offsets_at(table, local - after / 86400)[0] == after
+
+    # Overlap: standard time, else the later reading; gap: the offset before
+    prefer_after = dst_before | ~dst_after
+    offset = np.where(valid_before & valid_after,
+                      np.where(prefer_after, after, before),
+                      np.where(valid_after & ~valid_before, after, before))
+    return local - offset / 86400, offset
+
+
+def local_to_ut(local_jds, timezones):
+    """
+    Local wall-clock times given as JDs (the JD the local date/time would
+    have if it were UT) -> (UT JDs, UTC offsets in seconds). `timezones` is
+    one zone for all, or an array with one zone (name or hours) per time.
+    """
+    local_jds = np.asarray(local_jds, dtype=float)
+    if np.ndim(timezones) == 0:
+        return _local_to_ut_zone(local_jds, offset_table(timezones))
+
+    timezones = np.asarray(timezones, dtype=object)
+    ut = np.empty_like(local_jds)
+    offsets = np.empty_like(local_jds)
+    keys = np.array([str(z) for z in timezones])
+    unique, inverse = np.unique(keys, return_inverse=True)
+    for k in range(len(unique)):
+        mask = inverse == k
+        zone = timezones[np.argmax(mask)]
+        ut[mask], offsets[mask] = _local_to_ut_zone(local_jds[mask], offset_table(zone))
+    return ut, offsets
+
+
+def local_jds(dates, times):
+    """'YYYY-MM-DD' / 'HH:MM:SS' string arrays -> local wall-clock JDs"""
+    stamps = np.array([f"{d}T{t}" for d, t in zip(dates, times)], dtype="datetime64[s]")
+    return J1970 + stamps.astype(np.int64) / 86400
+
+
+@lru_cache(maxsize=65536)
+def utc_offset(timezone, date, time):
+    """UTC offset in hours of a zone at a local 'YYYY-MM-DD' 'HH:MM:SS'"""
+    local = datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M:%S")
+    return get_tzinfo(timezone).localize(local).utcoffset().total_seconds() / 3600
+
+
+if __name__ == "__main__":
+    import time
+
+    for name, lat, lon in [("Delhi", 28.6139, 77.2090), ("Kathmandu", 27.7172, 85.3240),
+                           ("London", 51.5074, -0.1278), ("New York", 40.7128, -74.0060),
+                           ("Amritsar", 31.6340, 74.8723), ("Lahore", 31.5204, 74.3587)]:
+        zone = resolve_timezone(lat, lon)
+        print(f"{name:<10} {zone:<20} 1995-08-15 10:30 -> UTC{utc_offset(zone, '1995-08-15', '10:30:00'):+.2f}")
+    print(f"Kolkata 1943-06-01 (war time): UTC{utc_offset('Asia/Kolkata', '1943-06-01', '12:00:00'):+.2f}")
+
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    resolver = load_resolver()
+    lats, lons = rng.uniform(8, 35, n), rng.uniform(68, 97, n)
+    start = time.perf_counter()
+    zones = resolver.resolve_many(lats, lons)
+    print(f"\nResolved {n:,} points in India's bounding box: {time.perf_counter() - start:.2f} s")
+
+    local = J1970 + rng.uniform(-60, 60, n) * 365.25
+    start = time.perf_counter()
+    ut, offsets = local_to_ut(local, zones)
+    print(f"Converted {n:,} local times to UT: {time.perf_counter() - start:.2f} s")
@@ -1,36 +1,19 @@
 import sys
 import os
 
-from datetime import datetime
-import pytz
-
-def get_rashi(longitude):
-    rashis = [
-        "Aries", "Taurus", "Gemini", "Cancer",
-        "Leo", "Virgo", "Libra", "Scorpio",
-        "Sagittarius", "Capricorn", "Aquarius", "Pisces"
-    ]
-    return rashis[int(longitude // 30)]
-
-
-def get_nakshatra(longitude):
-    nakshatras = [
-        "Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashira",
-        "Ardra", "Punarvasu", "Pushya", "Ashlesha",
-        "Magha", "Purva Phalguni", "Uttara Phalguni",
-        "Hasta", "Chitra", "Swati", "Vishakha",
-        "Anuradha", "Jyeshtha", "Mula",
-        "Purva Ashadha", "Uttara Ashadha", "Shravana",
-        "Dhanishta", "Shatabhisha",
-        "Purva Bhadrapada", "Uttara Bhadrapada", "Revati"
-    ]
-    return nakshatras[int(longitude / 13.333333)]
-
 # Add Swiss_Ephemeris directory to Python path
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 SWISS_EPHEMERIS_PATH = os.path.join(BASE_DIR, "Swiss_Ephemeris")
 sys.path.append(SWISS_EPHEMERIS_PATH)
-from Swiss_Ephemeris import get_planetary_positions
+sys.path.append(os.path.join(BASE_DIR, "gazetteer"))
+from Swiss_Ephemeris import (
+    PLANET_IDS, get_julian_day, get_nakshatra, get_planetary_positions, get_rashi
+)
+from fixedLongitude import house_number, to_mas
+from timezoneResolver import location_timezone, utc_offset
+
+# Order of chart_longitudes()
+CHART_BODIES = list(PLANET_IDS) + ['Lagna']
 
 # --- Aspects Calculation Stub ---
 def calculate_aspects(positions):
@@ -53,20 +36,24 @@ def generate_kundli(birth_datetime, birth_location):
     """
     Create complete birth chart (Kundli)
     """
-    
+    # The birth time is local to the birth place (see location_timezone)
+    timezone = location_timezone(birth_location)
+
     # Step 1: Get planetary positions
     positions = get_planetary_positions(
         birth_datetime['date'],
         birth_datetime['time'],
         birth_location['latitude'],
-        birth_location['longitude']
+        birth_location['longitude'],
+        timezone
     )
     
     # Step 2: Calculate Lagna (Ascendant)
     # This is the zodiac sign rising on eastern horizon at birth time
     lagna = calculate_ascendant(
         birth_datetime,
-        birth_location
+        birth_location,
+        timezone
     )
     
     # Step 3: Assign planets to houses
@@ -80,7 +67,9 @@ def generate_kundli(birth_datetime, birth_location):
         'birth_details': {
             'date': birth_datetime['date'],
             'time': birth_datetime['time'],
-            'place': birth_location['name']
+            'place': birth_location['name'],
+            'timezone': birth_location.get('timezone') or timezone,
+            'utc_offset': utc_offset(timezone, birth_datetime['date'], birth_datetime['time'])
         },
         'lagna': lagna,
         'planets': positions,
@@ -90,7 +79,7 @@ def generate_kundli(birth_datetime, birth_location):
     
     return kundli
 
-def calculate_ascendant(birth_datetime, location):
+def calculate_ascendant(birth_datetime, location, timezone=None):
     """
     Calculate rising sign (Lagna)
     This requires sidereal time calculation
@@ -98,17 +87,9 @@ def calculate_ascendant(birth_datetime, location):
     import swisseph as swe
     
     # Convert to Julian Day
-    dt = datetime.strptime(
-        f"{birth_datetime['date']} {birth_datetime['time']}", 
-        "%Y-%m-%d %H:%M:%S"
-    )
-    dt = pytz.timezone('Asia/Kolkata').localize(dt)
-    dt_utc = dt.astimezone(pytz.UTC)
-    
-    jd = swe.julday(
-        dt_utc.year, dt_utc.month, dt_utc.day,
-        dt_utc.hour + dt_utc.minute/60.0 + dt_utc.second/3600.0
-    )
+    if timezone is None:
+        timezone = location_timezone(location)
+    jd = get_julian_day(birth_datetime['date'], birth_datetime['time'], timezone)
     
     # Calculate houses using Placidus system
     houses_result = swe.houses(
@@ -139,10 +120,7 @@ def assign_planets_to_houses(positions, lagna):
         
         # Calculate house number
         # Difference from Lagna determines house
-        difference = (planet_longitude - lagna_longitude) % 360
-        house_number = int(difference / 30) + 1
-        
-        houses[house_number].append({
+        houses[house_number(to_mas(planet_longitude), to_mas(lagna_longitude))].append({
             'planet': planet,
             'longitude': planet_longitude,
             'rashi': data['rashi']
@@ -150,6 +128,11 @@ def assign_planets_to_houses(positions, lagna):
     
     return houses
 
+def chart_longitudes(kundli):
+    """Longitudes of CHART_BODIES as an int32 milli-arcsecond array, for bulk storage"""
+    degrees = [kundli['planets'][p]['longitude'] for p in CHART_BODIES[:-1]]
+    return to_mas(degrees + [kundli['lagna']['longitude']])
+
 def generate_kundli_chart(kundli):
     """
     Generate a simple North Indian style text chart for Kundli
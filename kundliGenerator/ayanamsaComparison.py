@@ -0,0 +1,172 @@
+import sys
+import os
+import threading
+
+import swisseph as swe
+
+# Add Swiss_Ephemeris and kundliGenerator directories to Python path
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, "Swiss_Ephemeris"))
+sys.path.append(os.path.join(BASE_DIR, "gazetteer"))
+sys.path.append(os.path.join(BASE_DIR, "kundliGenerator"))
+
+from Swiss_Ephemeris import get_julian_day, get_tropical_longitudes
+from GenerateKundli import get_rashi, get_nakshatra, assign_planets_to_houses
+from timezoneResolver import location_timezone
+
+# Display name -> swisseph sidereal mode
+AYANAMSAS = {
+    'Lahiri': swe.SIDM_LAHIRI,
+    'Raman': swe.SIDM_RAMAN,
+    'KP': swe.SIDM_KRISHNAMURTI,
+    'Yukteshwar': swe.SIDM_YUKTESHWAR,
+    'True Chitra': swe.SIDM_TRUE_CITRA,
+    'Fagan-Bradley': swe.SIDM_FAGAN_BRADLEY
+}
+
+# swisseph's sidereal mode is process-global; serialize the brief switch
+_sid_mode_lock = threading.Lock()
+
+
+def get_ayanamsa_values(jd, systems):
+    """
+    True ayanamsa (degrees, including nutation) of each system at one instant,
+    so tropical - ayanamsa equals a FLG_SIDEREAL calculation.
+    Restores the app-wide Lahiri mode afterwards.
+    """
+    values = {}
+    with _sid_mode_lock:
+        try:
+            for name in systems:
+                swe.set_sid_mode(AYANAMSAS[name], 0, 0)
+                values[name] = swe.get_ayanamsa_ex_ut(jd, swe.FLG_SWIEPH)[1]
+        finally:
+            swe.set_sid_mode(swe.SIDM_LAHIRI, 0, 0)
+    return values
+
+
+def _chart_for_offset(tropical, tropical_ascendant, ayanamsa):
+    """Rashi, nakshatra and house placements after subtracting one ayanamsa"""
+    planets = {}
+    for planet, tropical_longitude in tropical.items():
+        longitude = (tropical_longitude - ayanamsa) % 360
+        planets[planet] = {
+            'longitude': longitude,
+            'rashi': get_rashi(longitude),
+            'nakshatra': get_nakshatra(longitude),
+            'degrees': longitude % 30
+        }
+
+    ascendant = (tropical_ascendant - ayanamsa) % 360
+    lagna = {
+        'longitude': ascendant,
+        'rashi': get_rashi(ascendant),
+        'nakshatra': get_nakshatra(ascendant)
+    }
+    return {
+        'ayanamsa': ayanamsa,
+        'lagna': lagna,
+        'planets': planets,
+        'houses': assign_planets_to_houses(planets, lagna)
+    }
+
+
+def compare_ayanamsas(birth_datetime, birth_location, systems=None):
+    """
+    Sidereal chart under several ayanamsas from ONE tropical computation:
+    planets and ascendant are computed once, then each system only
+    subtracts its ayanamsa value.
+
+    The kundli generate_kundli builds (and the app shows) is tropical, so
+    its signs differ from every row here; it is returned as 'tropical' for
+    reference and left out of 'differences'.
+    """
+    systems = list(systems or AYANAMSAS)
+    for name in systems:
+        if name not in AYANAMSAS:
+            raise ValueError(f"Unknown ayanamsa {name!r}; expected one of {list(AYANAMSAS)}")
+
+    jd = get_julian_day(birth_datetime['date'], birth_datetime['time'],
+                        location_timezone(birth_location))
+    tropical = get_tropical_longitudes(jd)
+    tropical_ascendant = swe.houses(
+        jd,
+        birth_location['latitude'],
+        birth_location['longitude'],
+        b'P'
+    )[1][0]
+
+    charts = {
+        name: _chart_for_offset(tropical, tropical_ascendant, ayanamsa)
+        for name, ayanamsa in get_ayanamsa_values(jd, systems).items()
+    }
+
+    return {
+        'birth_details': {
+            'date': birth_datetime['date'],
+            'time': birth_datetime['time'],
+            'place': birth_location['name']
+        },
+        'tropical': _chart_for_offset(tropical, tropical_ascendant, 0.0),
+        'systems': charts,
+        'differences': summarize_differences(charts)
+    }
+
+
+def summarize_differences(charts):
+    """
+    Which placements change between systems:
+    {'Lagna': {'rashi': {...}}, 'Moon': {'nakshatra': {...}, 'house': {...}}, ...}
+    """
+    def house_of(chart, planet):
+        for house_num, planets in chart['houses'].items():
+            if any(p['planet'] == planet for p in planets):
+                return house_num
+        return None
+
+    differences = {}
+
+    lagna_rashis = {name: chart['lagna']['rashi'] for name, chart in charts.items()}
+    if len(set(lagna_rashis.values())) > 1:
+        differences['Lagna'] = {'rashi': lagna_rashis}
+
+    first = next(iter(charts.values()))
+    for planet in first['planets']:
+        planet_diff = {}
+        for field in ('rashi', 'nakshatra'):
+            values = {name: chart['planets'][planet][field] for name, chart in charts.items()}
+            if len(set(values.values())) > 1:
+                planet_diff[field] = values
+        houses = {name: house_of(chart, planet) for name, chart in charts.items()}
+        if len(set(houses.values())) > 1:
+            planet_diff['house'] = houses
+        if planet_diff:
+            differences[planet] = planet_diff
+
+    return differences
+
+
+if __name__ == "__main__":
+    birth_datetime = {
+        "date": "1995-08-15",
+        "time": "10:30:00"
+    }
+
+    birth_location = {
+        "name": "Delhi",
+        "latitude": 28.6139,
+        "longitude": 77.2090
+    }
+
+    comparison = compare_ayanamsas(birth_datetime, birth_location)
+
+    print("\n=== AYANAMSA COMPARISON ===\n")
+    rows = [("Tropical (app)", comparison['tropical'])] + list(comparison['systems'].items())
+    for name, chart in rows:
+        print(f"{name:<14} ayanamsa {chart['ayanamsa']:.4f}°  Lagna {chart['lagna']['rashi']:<12} "
+              f"Moon {chart['planets']['Moon']['rashi']} / {chart['planets']['Moon']['nakshatra']}")
+    print("\nThe app's kundli is tropical; the other rows are sidereal charts.")
+
+    from pprint import pprint
+    print("\n=== DIFFERENCES ===\n")
+    pprint(comparison['differences'])
@@ -0,0 +1,307 @@
+import sys
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Add Swiss_Ephemeris directory to Python path
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, "Swiss_Ephemeris"))
+sys.path.append(os.path.join(BASE_DIR, "gazetteer"))
+
+from Swiss_Ephemeris import get_julian_day, get_tropical_longitudes
+from fixedLongitude import NAKSHATRAS, NAKSHATRA_SPAN, RASHIS, nakshatra_index, rashi_index, to_mas
+from timezoneResolver import location_timezone
+from vectorEphemeris import (
+    PLANETS, armc_series, ascendant_from_armc, house_numbers,
+    longitude_interpolator, true_obliquity
+)
+
+DASHA_SEQUENCE = ['Ketu', 'Venus', 'Sun', 'Moon', 'Mars',
+                  'Rahu', 'Jupiter', 'Saturn', 'Mercury']
+DASHA_YEARS = np.array([7, 20, 6, 10, 7, 18, 16, 19, 17], dtype=float)
+
+# Houses and natural significators (karakas) for each event type
+EVENT_SIGNIFICATORS = {
+    'marriage': {'houses': (7, 2, 11), 'karakas': ('Venus', 'Jupiter')},
+    'job_change': {'houses': (10, 6, 3), 'karakas': ('Saturn', 'Sun', 'Rahu')},
+    'promotion': {'houses': (10, 11, 9), 'karakas': ('Sun', 'Jupiter')},
+    'childbirth': {'houses': (5, 9, 11), 'karakas': ('Jupiter',)},
+    'relocation': {'houses': (4, 12, 3), 'karakas': ('Moon', 'Rahu')},
+    'education': {'houses': (4, 5, 9), 'karakas': ('Mercury', 'Jupiter')},
+    'property': {'houses': (4, 11, 2), 'karakas': ('Mars', 'Venus')},
+    'health_issue': {'houses': (6, 8, 12), 'karakas': ('Mars', 'Saturn')}
+}
+
+# Score per matching signal
+WEIGHTS = {
+    'mahadasha': 2.0,       # per connection: karaka / occupies / rules an event house
+    'antardasha': 1.5,
+    'transit': 1.0,         # Jupiter or Saturn transiting an event house
+    'transit_aspect': 0.5   # ... or aspecting the primary event house
+}
+
+# Full (graha drishti) aspects of the slow transiting planets, in houses counted from them
+TRANSIT_ASPECTS = {'Jupiter': (5, 7, 9), 'Saturn': (3, 7, 10)}
+
+# Lord of each sign (Aries..Pisces)
+SIGN_LORDS = ['Mars', 'Venus', 'Mercury', 'Moon', 'Sun', 'Mercury',
+              'Venus', 'Mars', 'Jupiter', 'Saturn', 'Saturn', 'Jupiter']
+
+_P = {name: i for i, name in enumerate(PLANETS)}
+_DASHA_PLANET = np.array([_P[name] for name in DASHA_SEQUENCE])
+_SIGN_LORD_PLANET = np.array([_P[name] for name in SIGN_LORDS])
+
+# _MAHA_BOUNDS[l, k]: years from the start of a cycle beginning with lord l
+# to the start of its k-th mahadasha.
+# _ANTAR_BOUNDS[m, k]: years into mahadasha m to the start of its k-th antardasha.
+_ORDER = (np.arange(9)[:, None] + np.arange(9)[None, :]) % 9
+_MAHA_BOUNDS = np.concatenate((np.zeros((9, 1)), np.cumsum(DASHA_YEARS[_ORDER], axis=1)), axis=1)
+_ANTAR_BOUNDS = np.concatenate(
+    (np.zeros((9, 1)), np.cumsum(DASHA_YEARS[:, None] * DASHA_YEARS[_ORDER] / 120, axis=1)),
+    axis=1
+)
+
+
+def vimshottari_lords(moon_longitude, years_since_birth):
+    """
+    Running mahadasha and antardasha (indices into DASHA_SEQUENCE), with the
+    balance of the first dasha taken from the Moon's position inside its
+    nakshatra. Broadcasts over arrays of Moon longitudes and ages.
+    """
+    moon = to_mas(np.asarray(moon_longitude, dtype=float))
+    first = np.asarray(nakshatra_index(moon)) % 9
+    elapsed = (moon % NAKSHATRA_SPAN) / NAKSHATRA_SPAN * DASHA_YEARS[first]
+
+    position = (elapsed + years_since_birth) % 120
+    position, first = np.broadcast_arrays(position, first)
+    k = (position[..., None] >= _MAHA_BOUNDS[first][..., 1:]).sum(axis=-1).clip(max=8)
+    maha = (first + k) % 9
+    into_maha = position - np.take_along_axis(_MAHA_BOUNDS[first], k[..., None], axis=-1)[..., 0]
+
+    a = (into_maha[..., None] >= _ANTAR_BOUNDS[maha][..., 1:]).sum(axis=-1).clip(max=8)
+    antar = (maha + a) % 9
+    return maha, antar
+
+
+def _event_context(event, timezone):
+    """Everything about one event that does not depend on the birth time"""
+    kind = event['type']
+    if kind not in EVENT_SIGNIFICATORS:
+        raise ValueError(f"Unknown event type {kind!r}; expected one of {list(EVENT_SIGNIFICATORS)}")
+    jd = get_julian_day(event['date'], event.get('time', '12:00:00'),
+                        event.get('timezone', timezone))
+    transits = get_tropical_longitudes(jd)
+    spec = EVENT_SIGNIFICATORS[kind]
+    return {
+        'type': kind,
+        'date': event['date'],
+        'jd': jd,
+        'houses': np.array(spec['houses']),
+        'karakas': np.isin(np.arange(len(PLANETS)), [_P[p] for p in spec['karakas']]),
+        'transits': {p: transits[p] for p in TRANSIT_ASPECTS}
+    }
+
+
+def _lord_connection(lord, houses, lagna_sign, ctx):
+    """
+    Per candidate: how many ways a dasha lord (PLANETS index) signifies the
+    event - natural karaka, placed in an event house, ruling an event house
+    """
+    n = np.arange(lord.shape[-1])
+    karaka = ctx['karakas'][lord]
+    occupies = np.isin(houses[lord, n], ctx['houses'])
+    ruled_signs = (lagna_sign[None, :] + ctx['houses'][:, None] - 1) % 12
+    rules = (_SIGN_LORD_PLANET[ruled_signs] == lord[None, :]).any(axis=0)
+    return karaka.astype(int) + occupies + rules
+
+
+def _transit_score(ascendant, ctx):
+    score = np.zeros(ascendant.shape)
+    primary = ctx['houses'][0]
+    for planet, aspects in TRANSIT_ASPECTS.items():
+        house = house_numbers(ctx['transits'][planet], ascendant).astype(int)
+        score += WEIGHTS['transit'] * np.isin(house, ctx['houses'])
+        aspected = [(house + a - 2) % 12 + 1 for a in aspects]
+        score += WEIGHTS['transit_aspect'] * np.any([h == primary for h in aspected], axis=0)
+    return score
+
+
+class _CandidateEvaluator:
+    """Shared ephemeris work for one rectification: the planet fit over the
+    whole window and the per-event transits are computed once"""
+
+    def __init__(self, jd0, latitude, longitude, window_minutes, events, timezone):
+        self.jd0 = jd0
+        self.latitude = latitude
+        self.longitude = longitude
+        self.interpolate = longitude_interpolator(
+            jd0 - window_minutes / 1440, jd0 + window_minutes / 1440
+        )
+        self.eps = true_obliquity(jd0)
+        self.events = [_event_context(e, timezone) for e in events]
+
+    def charts(self, offsets):
+        jds = self.jd0 + offsets / 1440
+        longitudes = self.interpolate(jds)
+        ascendant = ascendant_from_armc(
+            armc_series(jds, self.longitude, jd_ref=self.jd0), self.latitude, self.eps
+        )
+        return jds, longitudes, ascendant
+
+    def score(self, offsets, detail=False):
+        jds, longitudes, ascendant = self.charts(offsets)
+        houses = house_numbers(longitudes, ascendant)
+        lagna_sign = rashi_index(to_mas(ascendant)).astype(int)
+        moon = longitudes[_P['Moon']]
+
+        total = np.zeros(len(offsets))
+        details = []
+        for ctx in self.events:
+            maha, antar = vimshottari_lords(moon, (ctx['jd'] - jds) / 365.25)
+            maha_score = WEIGHTS['mahadasha'] * _lord_connection(
+                _DASHA_PLANET[maha], houses, lagna_sign, ctx)
+            antar_score = WEIGHTS['antardasha'] * _lord_connection(
+                _DASHA_PLANET[antar], houses, lagna_sign, ctx)
+            transit_score = _transit_score(ascendant, ctx)
+            event_score = maha_score + antar_score + transit_score
+            total += event_score
+            if detail:
+                details.append((ctx, maha, antar, maha_score, antar_score, transit_score, event_score))
+
+        if not detail:
+            return total
+        return total, lagna_sign, nakshatra_index(to_mas(moon)).astype(int), details
+
+
+def _grid(start, stop, step):
+    count = int(round((stop - start) / step)) + 1
+    return np.round(start + step * np.arange(count), 6)
+
+
+def _plateaus(offsets, scores, step):
+    """(first, middle, last) indices of runs of adjacent equal-score offsets"""
+    runs = []
+    first = 0
+    for i in range(1, len(offsets) + 1):
+        if (i == len(offsets) or scores[i] != scores[first]
+                or offsets[i] - offsets[i - 1] > step + 1e-6):
+            runs.append((first, (first + i - 1) // 2, i - 1))
+            first = i
+    return runs
+
+
+def rectify_birth_time(birth_datetime, birth_location, events, window_minutes=60,
+                       coarse_step=5, fine_step=1, beam=5, top=5):
+    """
+    Rank candidate birth times within ±window_minutes of the stated time by
+    how well each one's Vimshottari periods and transits match known events.
+
+    events: [{'type': 'marriage', 'date': 'YYYY-MM-DD'}, ...]
+    (types: EVENT_SIGNIFICATORS keys; optional 'time' and 'timezone').
+    Search: every coarse_step minutes, then every fine_step minutes around
+    the `beam` best coarse candidates.
+    """
+    if not events:
+        raise ValueError("At least one life event is required for rectification")
+    if fine_step > coarse_step:
+        raise ValueError("fine_step must not exceed coarse_step")
+
+    # Events without their own 'timezone' are taken in the birth place's zone
+    timezone = location_timezone(birth_location)
+    jd0 = get_julian_day(birth_datetime['date'], birth_datetime['time'], timezone)
+    evaluator = _CandidateEvaluator(
+        jd0, birth_location['latitude'], birth_location['longitude'], window_minutes,
+        events, timezone
+    )
+
+    coarse = _grid(-window_minutes, window_minutes, coarse_step)
+    coarse_scores = evaluator.score(coarse)
+    leaders = coarse[np.argsort(-coarse_scores, kind='stable')[:beam]]
+
+    fine = np.unique(np.concatenate([
+        _grid(max(c - coarse_step, -window_minutes), min(c + coarse_step, window_minutes), fine_step)
+        for c in leaders
+    ] + [coarse]))
+    scores, lagna, nakshatra, details = evaluator.score(fine, detail=True)
+
+    # Neighbouring candidates with the same score are one plateau; report
+    # its middle and extent. Best score first, ties closest to the stated time.
+    plateaus = _plateaus(fine, scores, fine_step)
+    plateaus.sort(key=lambda p: (-scores[p[1]], abs(fine[p[1]])))
+
+    stated = datetime.strptime(f"{birth_datetime['date']} {birth_datetime['time']}", "%Y-%m-%d %H:%M:%S")
+    candidates = []
+    for first, i, last in plateaus[:top]:
+        moment = stated + timedelta(minutes=float(fine[i]))
+        candidates.append({
+            'date': moment.strftime("%Y-%m-%d"),
+            'time': moment.strftime("%H:%M:%S"),
+            'offset_minutes': float(fine[i]),
+            'range': (
+                (stated + timedelta(minutes=float(fine[first]))).strftime("%H:%M:%S"),
+                (stated + timedelta(minutes=float(fine[last]))).strftime("%H:%M:%S")
+            ),
+            'score': round(float(scores[i]), 2),
+            'lagna': RASHIS[lagna[i]],
+            'moon_nakshatra': NAKSHATRAS[nakshatra[i]],
+            'events': [
+                {
+                    'type': ctx['type'],
+                    'date': ctx['date'],
+                    'mahadasha': DASHA_SEQUENCE[maha[i]],
+                    'antardasha': DASHA_SEQUENCE[antar[i]],
+                    'dasha_score': round(float(maha_score[i] + antar_score[i]), 2),
+                    'transit_score': round(float(transit_score[i]), 2),
+                    'score': round(float(event_score[i]), 2)
+                }
+                for ctx, maha, antar, maha_score, antar_score, transit_score, event_score in details
+            ]
+        })
+
+    return {
+        'birth_details': {
+            'date': birth_datetime['date'],
+            'time': birth_datetime['time'],
+            'place': birth_location['name']
+        },
+        'window_minutes': window_minutes,
+        'evaluated': int(len(coarse) + len(np.setdiff1d(fine, coarse))),
+        'candidates': candidates
+    }
+
+
+if __name__ == "__main__":
+    import time
+
+    birth_datetime = {
+        "date": "1995-08-15",
+        "time": "10:30:00"
+    }
+
+    birth_location = {
+        "name": "Delhi",
+        "latitude": 28.6139,
+        "longitude": 77.2090
+    }
+
+    events = [
+        {'type': 'education', 'date': '2013-07-01'},
+        {'type': 'job_change', 'date': '2018-06-15'},
+        {'type': 'marriage', 'date': '2021-11-25'},
+        {'type': 'relocation', 'date': '2023-03-10'}
+    ]
+
+    start = time.perf_counter()
+    result = rectify_birth_time(birth_datetime, birth_location, events, window_minutes=120)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    print(f"\n=== BIRTH TIME RECTIFICATION (±120 min, {result['evaluated']} candidates, "
+          f"{elapsed:.1f} ms) ===\n")
+    for c in result['candidates']:
+        print(f"{c['date']} {c['time']}  ({c['offset_minutes']:+.0f} min, {c['range'][0]}-{c['range'][1]})  "
+              f"score {c['score']:<5} "
+              f"Lagna {c['lagna']:<12} Moon {c['moon_nakshatra']}")
+        for e in c['events']:
+            print(f"    {e['type']:<12} {e['date']}  {e['mahadasha']}/{e['antardasha']}  "
+                  f"dasha {e['dasha_score']}  transit {e['transit_score']}")
@@ -0,0 +1,191 @@
+import sys
+import os
+from collections import Counter
+
+import numpy as np
+
+# Add Swiss_Ephemeris directory to Python path
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, "Swiss_Ephemeris"))
+sys.path.append(os.path.join(BASE_DIR, "gazetteer"))
+
+from Swiss_Ephemeris import get_julian_day
+from fixedLongitude import NAKSHATRAS, RASHIS, nakshatra_index, rashi_index, to_mas
+from timezoneResolver import location_timezone
+from vectorEphemeris import (
+    PLANETS, armc_series, ascendant_from_armc, house_numbers,
+    planet_longitudes, true_obliquity
+)
+
+# Vimshottari lord of nakshatra i is DASHA_SEQUENCE[i % 9]
+DASHA_SEQUENCE = ['Ketu', 'Venus', 'Sun', 'Moon', 'Mars',
+                  'Rahu', 'Jupiter', 'Saturn', 'Mercury']
+
+_P = {name: i for i, name in enumerate(PLANETS)}
+
+# A stated time this close (minutes) to a factor change counts as near a boundary
+NEAR_BOUNDARY_MINUTES = 5
+
+
+def _sample_offsets(minutes, samples, method, seed):
+    """Offsets in minutes; always includes 0 (the stated birth time) first"""
+    if method == 'grid':
+        n = samples or int(minutes * 4) * 2 + 1  # 15-second steps
+        offsets = np.linspace(-minutes, minutes, max(n, 3))
+    elif method == 'random':
+        rng = np.random.default_rng(seed)
+        offsets = rng.uniform(-minutes, minutes, samples or 2000)
+    else:
+        raise ValueError("method must be 'grid' or 'random'")
+    return np.concatenate(([0.0], offsets))
+
+
+def _vectorized_chart(jds, latitude, longitude):
+    """Everything the report needs, as arrays over the sampled instants"""
+    longitudes = planet_longitudes(jds)                          # (9, N)
+    eps = true_obliquity(float(np.median(jds)))
+    ascendant = ascendant_from_armc(armc_series(jds, longitude), latitude, eps)
+    houses = house_numbers(longitudes, ascendant)                # (9, N)
+
+    moon_nakshatra = nakshatra_index(to_mas(longitudes[_P['Moon']])).astype(int)
+
+    # Same rules as doshaAnalyzer
+    mangal = np.isin(houses[_P['Mars']], (1, 4, 7, 8, 12))
+    rahu = longitudes[_P['Rahu']]
+    angles = (longitudes[[_P[p] for p in
+                          ('Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn')]]
+              - rahu) % 360
+    kaal_sarp = np.all((angles > 0) & (angles < 180), axis=0)
+    relative = (houses[_P['Saturn']].astype(int) - houses[_P['Moon']]) % 12
+    sade_sati = np.isin(relative, (0, 1, 11))
+
+    return {
+        'lagna': rashi_index(to_mas(ascendant)).astype(int),
+        'moon_nakshatra': moon_nakshatra,
+        'houses': houses,
+        'dasha_lord': moon_nakshatra % 9,
+        'doshas': {
+            'Mangal Dosha': mangal,
+            'Kaal Sarp Dosha': kaal_sarp,
+            'Sade Sati': sade_sati
+        }
+    }
+
+
+def _distribution(values, labels=None):
+    counts = Counter(values.tolist())
+    total = len(values)
+    return {
+        (labels[k] if labels else k): round(c / total, 4)
+        for k, c in counts.most_common()
+    }
+
+
+def _nearest_change(values, offsets):
+    """Smallest |offset| (minutes) at which a value differs from the nominal one"""
+    changed = values != values[0]
+    if not changed.any():
+        return None
+    return round(float(np.min(np.abs(offsets[changed]))), 2)
+
+
+def sensitivity_analysis(birth_datetime, birth_location, minutes=30,
+                         samples=None, method='grid', seed=None,
+                         boundary_minutes=NEAR_BOUNDARY_MINUTES):
+    """
+    Evaluate the chart over birth times in [time - minutes, time + minutes]
+    and report how likely each key factor is, plus how close the stated
+    time is to a boundary where it changes.
+
+    method: 'grid' (evenly spaced, 15 s steps by default) or 'random'
+    (uniform samples; `samples` of them).
+    near_boundary is set when the nearest change is within boundary_minutes
+    of the stated time, whatever the width of the window.
+    """
+    offsets = _sample_offsets(minutes, samples, method, seed)
+    jd0 = get_julian_day(birth_datetime['date'], birth_datetime['time'],
+                         location_timezone(birth_location))
+    jds = jd0 + offsets / 1440
+
+    chart = _vectorized_chart(jds, birth_location['latitude'], birth_location['longitude'])
+    body = slice(1, None)  # probabilities over the samples, not the nominal point
+
+    factors = {
+        'lagna': (chart['lagna'], RASHIS),
+        'moon_nakshatra': (chart['moon_nakshatra'], NAKSHATRAS),
+        'dasha_lord': (chart['dasha_lord'], DASHA_SEQUENCE),
+    }
+    for i, planet in enumerate(PLANETS):
+        factors[f'{planet}_house'] = (chart['houses'][i], None)
+
+    probabilities = {}
+    nominal = {}
+    boundaries = []
+    for name, (values, labels) in factors.items():
+        probabilities[name] = _distribution(values[body], labels)
+        nominal_value = values[0].item()
+        nominal[name] = labels[nominal_value] if labels else nominal_value
+        change = _nearest_change(values, offsets)
+        if change is not None:
+            boundaries.append({
+                'factor': name,
+                'nominal': nominal[name],
+                'changes_within_minutes': change,
+                'nominal_probability': probabilities[name].get(nominal[name], 0.0)
+            })
+
+    dosha_probabilities = {}
+    for name, flags in chart['doshas'].items():
+        dosha_probabilities[name] = round(float(flags[body].mean()), 4)
+        change = _nearest_change(flags, offsets)
+        if change is not None:
+            boundaries.append({
+                'factor': name,
+                'nominal': bool(flags[0]),
+                'changes_within_minutes': change,
+                'nominal_probability': round(float((flags[body] == flags[0]).mean()), 4)
+            })
+
+    boundaries.sort(key=lambda b: b['changes_within_minutes'])
+    nearest = boundaries[0]['changes_within_minutes'] if boundaries else None
+
+    return {
+        'window_minutes': minutes,
+        'samples': int(len(offsets) - 1),
+        'method': method,
+        'nominal': nominal,
+        'probabilities': probabilities,
+        'dosha_probabilities': dosha_probabilities,
+        'nearest_boundary_minutes': nearest,
+        'near_boundary': nearest is not None and nearest <= boundary_minutes,
+        'boundaries': boundaries
+    }
+
+
+if __name__ == "__main__":
+    import time
+
+    birth_datetime = {
+        "date": "1995-08-15",
+        "time": "10:30:00"
+    }
+
+    birth_location = {
+        "name": "Delhi",
+        "latitude": 28.6139,
+        "longitude": 77.2090
+    }
+
+    start = time.perf_counter()
+    report = sensitivity_analysis(birth_datetime, birth_location, minutes=60, samples=5000)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    from pprint import pprint
+    print(f"\n=== BIRTH TIME SENSITIVITY (±60 min, 5000 samples, {elapsed:.1f} ms) ===\n")
+    pprint(report['probabilities']['lagna'])
+    pprint(report['dosha_probabilities'])
+    print(f"\nNearest boundary: {report['nearest_boundary_minutes']} min "
+          f"(near boundary: {report['near_boundary']})")
+    print("\nNearest boundaries:")
+    for b in report['boundaries'][:5]:
+        pprint(b)
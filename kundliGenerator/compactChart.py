@@ -0,0 +1,241 @@
+"""
+compactChart.py
+---------------
+A birth chart in a few hundred bytes instead of the nested dicts that
+generate_kundli returns (several KB per chart, most of it repeated
+strings and the planets copied again under 'houses').
+
+Chart keeps
+- data:   array('i') of 13 int32 - the CHART_BODIES longitudes in
+          milli-arcseconds, then the local birth date (ordinal), time
+          (seconds after midnight) and UTC offset (seconds); charts
+          computed with speeds add 9 more, the daily motion of each
+          planet in milli-arcseconds per day
+- codes:  20 bytes - rashi index of each body, then nakshatra index
+- houses: 9 bytes - house 1..12 of each planet (PLANET_IDS order)
+- place, timezone: interned strings, shared between charts
+
+to_dict() rebuilds the generate_kundli structure for the analyzers, so
+callers can hold Charts and expand them only where a dict is consumed.
+"""
+
+import os
+import sys
+from array import array
+from datetime import date as date_cls
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, "Swiss_Ephemeris"))
+
+from GenerateKundli import CHART_BODIES, calculate_aspects, chart_longitudes, generate_kundli
+from Swiss_Ephemeris import motion_state
+from fixedLongitude import (
+    MAS_PER_DEGREE, NAKSHATRAS, RASHIS, degrees_in_sign, nakshatra_index, rashi_index
+)
+
+PLANETS = CHART_BODIES[:-1]
+LAGNA = len(PLANETS)
+_BODIES = len(CHART_BODIES)
+_DATE, _TIME, _OFFSET = _BODIES, _BODIES + 1, _BODIES + 2
+_SPEEDS = _OFFSET + 1
+NO_OFFSET = -2 ** 31
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Chart:
+    """Compact, immutable-by-convention birth chart; see the module docstring"""
+
+    __slots__ = ('data', 'codes', 'houses', 'place', 'timezone')
+
+    def __init__(self, data, codes, houses, place=None, timezone=None):
+        self.data = data
+        self.codes = codes
+        self.houses = houses
+        self.place = _intern(place)
+        self.timezone = _intern(timezone)
+
+    @classmethod
+    def from_kundli(cls, kundli):
+        """Pack a generate_kundli() dict"""
+        details = kundli['birth_details']
+        longitudes = chart_longitudes(kundli).tolist()
+
+        hours, minutes, seconds = (int(p) for p in details['time'].split(":"))
+        offset = details.get('utc_offset')
+        speeds = [kundli['planets'][planet].get('speed') for planet in PLANETS]
+        data = array('i', longitudes + [
+            date_cls.fromisoformat(details['date']).toordinal(),
+            hours * 3600 + minutes * 60 + seconds,
+            NO_OFFSET if offset is None else round(offset * 3600)
+        ] + ([] if None in speeds else [round(speed * MAS_PER_DEGREE) for speed in speeds]))
+        codes = bytes([rashi_index(m) for m in longitudes] + [nakshatra_index(m) for m in longitudes])
+
+        house_of = {p['planet']: house for house, planets in kundli['houses'].items() for p in planets}
+        houses = bytes(house_of[planet] for planet in PLANETS)
+        return cls(data, codes, houses, details.get('place'), details.get('timezone'))
+
+    # --- accessors (index = position in CHART_BODIES) ---
+
+    def longitude(self, body):
+        """Longitude in degrees of a planet name, 'Lagna', or its index"""
+        return self.data[self._index(body)] / MAS_PER_DEGREE
+
+    def rashi(self, body):
+        return RASHIS[self.codes[self._index(body)]]
+
+    def nakshatra(self, body):
+        return NAKSHATRAS[self.codes[_BODIES + self._index(body)]]
+
+    def house(self, planet):
+        return self.houses[self._index(planet)]
+
+    @property
+    def has_motion(self):
+        return len(self.data) > _SPEEDS
+
+    def speed(self, planet):
+        """Daily motion in degrees, None for charts stored without speeds"""
+        return self.data[_SPEEDS + self._index(planet)] / MAS_PER_DEGREE if self.has_motion else None
+
+    @staticmethod
+    def _index(body):
+        return body if isinstance(body, int) else CHART_BODIES.index(body)
+
+    @property
+    def date(self):
+        return date_cls.fromordinal(self.data[_DATE]).isoformat()
+
+    @property
+    def time(self):
+        seconds = self.data[_TIME]
+        return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+    @property
+    def utc_offset(self):
+        offset = self.data[_OFFSET]
+        return None if offset == NO_OFFSET else offset / 3600
+
+    def to_dict(self):
+        """The generate_kundli() structure (longitudes to the nearest milli-arcsecond)"""
+        positions = {}
+        for i, planet in enumerate(PLANETS):
+            mas = self.data[i]
+            positions[planet] = {
+                'longitude': mas / MAS_PER_DEGREE,
+                'rashi': RASHIS[self.codes[i]],
+                'nakshatra': NAKSHATRAS[self.codes[_BODIES + i]],
+                'degrees': degrees_in_sign(mas)
+            }
+            if self.has_motion:
+                positions[planet].update(motion_state(
+                    planet, positions[planet]['longitude'], self.speed(i), positions['Sun']['longitude']
+                ))
+
+        houses = {i: [] for i in range(1, 13)}
+        for planet, house in zip(PLANETS, self.houses):
+            houses[house].append({
+                'planet': planet,
+                'longitude': positions[planet]['longitude'],
+                'rashi': positions[planet]['rashi']
+            })
+
+        return {
+            'birth_details': {
+                'date': self.date,
+                'time': self.time,
+                'place': self.place,
+                'timezone': self.timezone,
+                'utc_offset': self.utc_offset
+            },
+            'lagna': {
+                'longitude': self.data[LAGNA] / MAS_PER_DEGREE,
+                'rashi': RASHIS[self.codes[LAGNA]],
+                'nakshatra': NAKSHATRAS[self.codes[_BODIES + LAGNA]]
+            },
+            'planets': positions,
+            'houses': houses,
+            'aspects': calculate_aspects(positions)
+        }
+
+    def __repr__(self):
+        return (f"Chart({self.date} {self.time} {self.place!r}, "
+                f"lagna={self.rashi(LAGNA)}, moon={self.nakshatra('Moon')})")
+
+
+def generate_chart(birth_datetime, birth_location):
+    """generate_kundli() packed into a Chart"""
+    return Chart.from_kundli(generate_kundli(birth_datetime, birth_location))
+
+
+def _deep_size(obj, seen=None):
+    """Bytes reachable from obj (containers, strings, numbers), each object counted once"""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(_deep_size(v, seen) for v in obj)
+    elif isinstance(obj, Chart):
+        size += sum(_deep_size(getattr(obj, s), seen) for s in Chart.__slots__)
+    return size
+
+
+if __name__ == "__main__":
+    import time
+    import tracemalloc
+
+    import numpy as np
+
+    sys.path.append(os.path.join(BASE_DIR, "dosha"))
+    from doshaAnalyzer import detect_doshas
+    from fixedLongitude import house_number
+
+    birth_datetime = {"date": "1995-08-15", "time": "10:30:00"}
+    birth_location = {"name": "Delhi", "latitude": 28.6139, "longitude": 77.2090}
+
+    kundli = generate_kundli(birth_datetime, birth_location)
+    chart = Chart.from_kundli(kundli)
+    print(f"\n{chart}")
+    print(f"Doshas identical via to_dict(): {detect_doshas(chart.to_dict()) == detect_doshas(kundli)}")
+    print(f"One chart: dict {_deep_size(kundli):,} bytes, Chart {_deep_size(chart):,} bytes")
+
+    # 1M synthetic charts (random longitudes, one shared place/zone)
+    n = 1_000_000
+    rng = np.random.default_rng(44)
+    longitudes = rng.integers(0, 360 * MAS_PER_DEGREE, (n, len(CHART_BODIES)), dtype=np.int32)
+    codes = np.hstack((rashi_index(longitudes), nakshatra_index(longitudes))).astype(np.uint8)
+    houses = house_number(longitudes[:, :LAGNA], longitudes[:, LAGNA:]).astype(np.uint8)
+    moments = np.column_stack((
+        rng.integers(date_cls(1940, 1, 1).toordinal(), date_cls(2025, 1, 1).toordinal(), n),
+        rng.integers(0, 86400, n),
+        np.full(n, 19800)
+    )).astype(np.int32)
+    rows = np.hstack((longitudes, moments))
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    charts = [
+        Chart(array('i', rows[i].tobytes()), codes[i].tobytes(), houses[i].tobytes(), "Delhi", "Asia/Kolkata")
+        for i in range(n)
+    ]
+    elapsed = time.perf_counter() - start
+    chart_bytes = tracemalloc.get_traced_memory()[0]
+
+    # Expanded dicts for a sample, extrapolated to n
+    sample = 20_000
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    dicts = [c.to_dict() for c in charts[:sample]]
+    dict_bytes = (tracemalloc.get_traced_memory()[0] - before) * n // sample
+    tracemalloc.stop()
+
+    print(f"\n=== MEMORY, {n:,} CHARTS ===")
+    print(f"Chart objects : {chart_bytes / 1e6:8,.0f} MB  ({chart_bytes / n:,.0f} bytes/chart, built in {elapsed:.1f} s)")
+    print(f"Nested dicts  : {dict_bytes / 1e6:8,.0f} MB  ({dict_bytes / n:,.0f} bytes/chart, from {sample:,} expanded)")
+    print(f"Reduction     : {dict_bytes / chart_bytes:.1f}x")
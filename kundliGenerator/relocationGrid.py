@@ -0,0 +1,120 @@
+import sys
+import os
+
+import numpy as np
+
+# Add Swiss_Ephemeris directory to Python path
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, "Swiss_Ephemeris"))
+sys.path.append(os.path.join(BASE_DIR, "gazetteer"))
+
+from Swiss_Ephemeris import get_julian_day, get_tropical_longitudes
+from fixedLongitude import RASHIS, rashi_index, to_mas
+from timezoneResolver import location_timezone
+from vectorEphemeris import (
+    PLANETS, armc_at, ascendant_from_armc, house_numbers,
+    midheaven_from_armc, true_obliquity
+)
+
+
+def grid_axes(resolution=1.0, lat_limit=89.5):
+    """Cell-centre latitudes (south to north) and longitudes (west to east)"""
+    latitudes = np.arange(-90 + resolution / 2, 90, resolution)
+    latitudes = latitudes[np.abs(latitudes) <= lat_limit]
+    longitudes = np.arange(-180 + resolution / 2, 180, resolution)
+    return latitudes, longitudes
+
+
+def relocation_grid(birth_datetime, birth_location, resolution=1.0, lat_limit=89.5):
+    """
+    Lagna rashi, Midheaven and planet houses for one birth instant over a
+    worldwide latitude/longitude grid.
+
+    Planet longitudes are the same everywhere, so they are computed once;
+    only the ascendant depends on location and is evaluated in closed form
+    over the whole grid. Arrays are indexed [lat, lon] (houses: [planet, lat, lon]):
+    - lagna: int8 rashi index 0..11 (RASHIS)
+    - midheaven: float32 degrees
+    - houses: int8 house number 1..12, planets in PLANETS order
+    The birth time is local to birth_location (see location_timezone).
+    """
+    timezone = location_timezone(birth_location)
+    jd = get_julian_day(birth_datetime['date'], birth_datetime['time'], timezone)
+    tropical = get_tropical_longitudes(jd)
+    planet_longitudes = np.array([tropical[p] for p in PLANETS])
+
+    latitudes, longitudes = grid_axes(resolution, lat_limit)
+    eps = true_obliquity(jd)
+    armc = armc_at(jd, longitudes)                                        # (nlon,)
+    ascendant = ascendant_from_armc(armc[None, :], latitudes[:, None], eps)  # (nlat, nlon)
+    midheaven = np.broadcast_to(midheaven_from_armc(armc, eps), ascendant.shape)
+
+    return {
+        'birth_details': {
+            'date': birth_datetime['date'],
+            'time': birth_datetime['time'],
+            'timezone': timezone
+        },
+        'resolution': resolution,
+        'latitudes': latitudes.astype(np.float32),
+        'longitudes': longitudes.astype(np.float32),
+        'planets': PLANETS,
+        'planet_longitudes': planet_longitudes.astype(np.float32),
+        'lagna': rashi_index(to_mas(ascendant)).astype(np.int8),
+        'midheaven': midheaven.astype(np.float32),
+        'houses': house_numbers(planet_longitudes[:, None, None], ascendant[None, :, :])
+    }
+
+
+def lookup(grid, latitude, longitude):
+    """Values of the nearest grid cell to one location"""
+    i = int(np.abs(grid['latitudes'] - latitude).argmin())
+    j = int(np.abs(grid['longitudes'] - longitude).argmin())
+    return {
+        'lagna': RASHIS[grid['lagna'][i, j]],
+        'midheaven': float(grid['midheaven'][i, j]),
+        'houses': {p: int(grid['houses'][k, i, j]) for k, p in enumerate(grid['planets'])}
+    }
+
+
+def save_relocation_grid(grid, path):
+    """Compressed .npz for map overlays (a 1° world grid is ~100 KB)"""
+    np.savez_compressed(
+        path,
+        latitudes=grid['latitudes'],
+        longitudes=grid['longitudes'],
+        planet_longitudes=grid['planet_longitudes'],
+        lagna=grid['lagna'],
+        midheaven=grid['midheaven'],
+        houses=grid['houses']
+    )
+
+
+if __name__ == "__main__":
+    import time
+
+    birth_datetime = {
+        "date": "1995-08-15",
+        "time": "10:30:00"
+    }
+
+    birth_location = {
+        "name": "Delhi",
+        "latitude": 28.6139,
+        "longitude": 77.2090
+    }
+
+    start = time.perf_counter()
+    grid = relocation_grid(birth_datetime, birth_location, resolution=1.0)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    cells = grid['lagna'].size
+    print(f"\n=== RELOCATION GRID (1°, {cells:,} cells, {elapsed:.1f} ms) ===\n")
+    print("lagna:", grid['lagna'].shape, grid['lagna'].dtype,
+          " midheaven:", grid['midheaven'].shape, grid['midheaven'].dtype,
+          " houses:", grid['houses'].shape, grid['houses'].dtype)
+
+    for name, lat, lon in [("Delhi", 28.6139, 77.2090),
+                           ("London", 51.5074, -0.1278),
+                           ("New York", 40.7128, -74.0060)]:
+        print(f"\n{name}:", lookup(grid, lat, lon))
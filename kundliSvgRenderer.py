@@ -0,0 +1,255 @@
+"""
+kundliSvgRenderer.py
+--------------------
+Dependency-free SVG renderer for North, South and East Indian Kundli charts.
+The static frame of each style (lines, cell anchors, text openers) is built
+once per (style, size) and cached; a chart render only substitutes the
+house contents into the cached template.
+NO Streamlit code should exist in this file.
+"""
+
+import os
+from functools import lru_cache
+
+RASHIS = [
+    "Aries", "Taurus", "Gemini", "Cancer",
+    "Leo", "Virgo", "Libra", "Scorpio",
+    "Sagittarius", "Capricorn", "Aquarius", "Pisces"
+]
+RASHI_INDEX = {name: i for i, name in enumerate(RASHIS)}
+
+PLANET_ABBR = {
+    "Sun": "Su", "Moon": "Mo", "Mars": "Ma", "Mercury": "Me",
+    "Jupiter": "Ju", "Venus": "Ve", "Saturn": "Sa", "Rahu": "Ra", "Ketu": "Ke"
+}
+
+STYLES = ("north", "south", "east")
+
+# Planets per text line inside a cell
+_PER_LINE = 3
+_MAX_LINES = 4
+
+# --- Static geometry (unit square) ---
+
+# North Indian: cells are houses (fixed), signs rotate with lagna.
+# (planet anchor x, y), (sign-number anchor x, y) for houses 1..12
+NORTH_CELLS = [
+    ((0.500, 0.250), (0.500, 0.440)),
+    ((0.250, 0.090), (0.250, 0.200)),
+    ((0.090, 0.250), (0.200, 0.255)),
+    ((0.250, 0.500), (0.440, 0.505)),
+    ((0.090, 0.750), (0.200, 0.755)),
+    ((0.250, 0.910), (0.250, 0.815)),
+    ((0.500, 0.750), (0.500, 0.580)),
+    ((0.750, 0.910), (0.750, 0.815)),
+    ((0.910, 0.750), (0.800, 0.755)),
+    ((0.750, 0.500), (0.560, 0.505)),
+    ((0.910, 0.250), (0.800, 0.255)),
+    ((0.750, 0.090), (0.750, 0.200)),
+]
+NORTH_LINES = [
+    ((0, 0), (1, 1)), ((1, 0), (0, 1)),
+    ((0.5, 0), (1, 0.5)), ((1, 0.5), (0.5, 1)),
+    ((0.5, 1), (0, 0.5)), ((0, 0.5), (0.5, 0)),
+]
+
+# South Indian: cells are signs (fixed), Pisces top-left, running clockwise.
+_SOUTH_GRID = [
+    (1, 0), (2, 0), (3, 0), (3, 1), (3, 2), (3, 3),
+    (2, 3), (1, 3), (0, 3), (0, 2), (0, 1), (0, 0),
+]
+
+# East Indian: cells are signs (fixed), Aries top-centre, running anticlockwise;
+# corner cells are split diagonally into two signs.
+_EAST_CELLS = [
+    (3 / 6, 1 / 6), (2 / 9, 1 / 9), (1 / 9, 2 / 9), (1 / 6, 3 / 6),
+    (1 / 9, 7 / 9), (2 / 9, 8 / 9), (3 / 6, 5 / 6), (7 / 9, 8 / 9),
+    (8 / 9, 7 / 9), (5 / 6, 3 / 6), (8 / 9, 2 / 9), (7 / 9, 1 / 9),
+]
+_EAST_LINES = [
+    ((1 / 3, 0), (1 / 3, 1)), ((2 / 3, 0), (2 / 3, 1)),
+    ((0, 1 / 3), (1, 1 / 3)), ((0, 2 / 3), (1, 2 / 3)),
+    ((0, 0), (1 / 3, 1 / 3)), ((1, 0), (2 / 3, 1 / 3)),
+    ((0, 1), (1 / 3, 2 / 3)), ((1, 1), (2 / 3, 2 / 3)),
+]
+
+
+def _line(p, q, size):
+    return (
+        f'<line x1="{p[0] * size:.1f}" y1="{p[1] * size:.1f}" '
+        f'x2="{q[0] * size:.1f}" y2="{q[1] * size:.1f}"/>'
+    )
+
+
+def _cell_layout(style):
+    """
+    Return (planet anchors, label anchors, frame lines, sign_fixed) for a style.
+    For sign-fixed styles, cell index = sign index (Aries = 0).
+    """
+    if style == "north":
+        anchors = [c[0] for c in NORTH_CELLS]
+        labels = [c[1] for c in NORTH_CELLS]
+        return anchors, labels, NORTH_LINES, False
+
+    if style == "south":
+        anchors, labels, lines = [], [], []
+        for col, row in _SOUTH_GRID:
+            anchors.append(((col + 0.5) / 4, (row + 0.55) / 4))
+            labels.append(((col + 0.5) / 4, (row + 0.2) / 4))
+        for k in (1, 3):
+            lines.append(((k / 4, 0), (k / 4, 1)))
+            lines.append(((0, k / 4), (1, k / 4)))
+        lines += [
+            ((0.5, 0), (0.5, 0.25)), ((0.5, 0.75), (0.5, 1)),
+            ((0, 0.5), (0.25, 0.5)), ((0.75, 0.5), (1, 0.5)),
+        ]
+        return anchors, labels, lines, True
+
+    if style == "east":
+        anchors = list(_EAST_CELLS)
+        labels = [(x, y - 0.06) for x, y in _EAST_CELLS]
+        return anchors, labels, _EAST_LINES, True
+
+    raise ValueError(f"Unknown chart style {style!r}; expected one of {STYLES}")
+
+
+@lru_cache(maxsize=None)
+def _frame(style, size):
+    """
+    Precompute the static parts of a chart: the SVG header + frame lines,
+    and for every cell the text-element openers for 1.._MAX_LINES lines.
+    """
+    anchors, labels, lines, sign_fixed = _cell_layout(style)
+    font = max(8, round(size / 32))
+    line_height = font * 1.15
+
+    header = (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+        f'viewBox="0 0 {size} {size}" font-family="sans-serif" font-size="{font}" '
+        f'text-anchor="middle">'
+        f'<rect x="0.5" y="0.5" width="{size - 1}" height="{size - 1}" '
+        f'fill="#fffbeb" stroke="#7c2d12"/>'
+        f'<g stroke="#7c2d12" stroke-width="1">'
+        + "".join(_line(p, q, size) for p, q in lines)
+        + "</g>"
+    )
+
+    openers = []
+    for x, y in anchors:
+        per_count = []
+        for n in range(1, _MAX_LINES + 1):
+            y0 = y * size - (n - 1) * line_height / 2
+            per_count.append(tuple(
+                f'<text x="{x * size:.1f}" y="{y0 + i * line_height:.1f}" '
+                f'dominant-baseline="middle">'
+                for i in range(n)
+            ))
+        openers.append(per_count)
+
+    label_openers = tuple(
+        f'<text x="{x * size:.1f}" y="{y * size:.1f}" font-size="{font * 0.8:.1f}" '
+        f'fill="#9a3412" dominant-baseline="middle">'
+        for x, y in labels
+    )
+
+    center = (
+        f'<text x="{size / 2:.1f}" y="{size / 2:.1f}" font-size="{font * 0.9:.1f}" '
+        f'fill="#6b7280" dominant-baseline="middle">'
+    )
+
+    return header, openers, label_openers, center, sign_fixed
+
+
+def _lines_of(planets):
+    abbrs = [PLANET_ABBR.get(p, p[:2]) for p in planets]
+    lines = [
+        " ".join(abbrs[i:i + _PER_LINE])
+        for i in range(0, len(abbrs), _PER_LINE)
+    ]
+    return lines[:_MAX_LINES]
+
+
+def _house_planets(kundli):
+    """Planet names per house (1..12) from a generate_kundli() result"""
+    houses = kundli["houses"]
+    return [
+        [p["planet"] for p in houses.get(h, houses.get(str(h), []))]
+        for h in range(1, 13)
+    ]
+
+
+def render_chart_svg(kundli, style="north", size=400):
+    """
+    Render a Kundli (output of generate_kundli) as an SVG string.
+    style: 'north' (houses fixed), 'south' or 'east' (signs fixed)
+    """
+    header, openers, label_openers, center, sign_fixed = _frame(style, size)
+    lagna_index = RASHI_INDEX[kundli["lagna"]["rashi"]]
+    house_planets = _house_planets(kundli)
+
+    parts = [header]
+    for cell in range(12):
+        if sign_fixed:
+            # cell is a sign; find which house it is from the lagna
+            house = (cell - lagna_index) % 12
+            label = RASHIS[cell][:3] + (" (Asc)" if house == 0 else "")
+        else:
+            house = cell
+            label = str((lagna_index + cell) % 12 + 1)
+
+        parts.append(label_openers[cell])
+        parts.append(label)
+        parts.append("</text>")
+
+        lines = _lines_of(house_planets[house])
+        if lines:
+            for opener, text in zip(openers[cell][len(lines) - 1], lines):
+                parts.append(opener)
+                parts.append(text)
+                parts.append("</text>")
+
+    parts.append(center)
+    parts.append(f'Lagna: {kundli["lagna"]["rashi"]}' if sign_fixed else "")
+    parts.append("</text></svg>")
+    return "".join(parts)
+
+
+def render_charts_svg(kundlis, style="north", size=400):
+    """Batch mode: lazily render many charts with one cached frame"""
+    for kundli in kundlis:
+        yield render_chart_svg(kundli, style, size)
+
+
+def write_charts_svg(kundlis, out_dir, style="north", size=400, prefix="kundli"):
+    """Render many charts straight to <out_dir>/<prefix>_<n>.svg; returns count"""
+    os.makedirs(out_dir, exist_ok=True)
+    count = 0
+    for count, svg in enumerate(render_charts_svg(kundlis, style, size), 1):
+        with open(os.path.join(out_dir, f"{prefix}_{count:06d}.svg"), "w", encoding="utf-8") as f:
+            f.write(svg)
+    return count
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+    sys.path.append(os.path.join(BASE_DIR, "kundliGenerator"))
+    from GenerateKundli import generate_kundli
+
+    kundli = generate_kundli(
+        {"date": "1995-08-15", "time": "10:30:00"},
+        {"name": "Delhi", "latitude": 28.6139, "longitude": 77.2090}
+    )
+
+    for chart_style in STYLES:
+        render_chart_svg(kundli, chart_style)  # warm the frame cache
+        n = 20000
+        start = time.perf_counter()
+        for _ in render_charts_svg([kundli] * n, chart_style):
+            pass
+        per_chart = (time.perf_counter() - start) / n * 1e6
+        print(f"{chart_style:>5}: {per_chart:.1f} µs per chart")
+
+    print(render_chart_svg(kundli, "north"))
@@ -3,64 +3,57 @@ kundliVisualizer.py
 -------------------
 Pure visualization utilities for Kundli charts.
 NO Streamlit code should exist in this file.
+
+The fixed part of the circular chart (one Barpolar trace for all 12
+sectors, house labels, polar layout) is built once and cached; each chart
+copies the base figure and fills in only the title and planet annotations.
 """
 
-import plotly.graph_objects as go
+import json
 import math
+from functools import lru_cache
 
+import plotly.graph_objects as go
 
-def create_circular_kundli(kundli):
-    """
-    Create an interactive circular Kundli chart using Plotly.
-    Returns a Plotly Figure object.
-    """
+_ANNOTATIONS_SLOT = "__VEDICAI_ANNOTATIONS__"
+_TITLE_SLOT = "__VEDICAI_TITLE__"
 
-    fig = go.Figure()
-
-    # Draw 12 house sectors
-    for i in range(12):
-        start_angle = i * 30
-        end_angle = start_angle + 30
-
-        fig.add_trace(go.Barpolar(
-            r=[1],
-            theta=[start_angle + 15],
-            width=[30],
-            marker_color="rgba(200,200,200,0.2)",
-            marker_line_color="black",
-            marker_line_width=1,
-            hoverinfo="skip",
-            showlegend=False
-        ))
 
-    # House labels
-    for house in range(1, 13):
-        angle = (house - 1) * 30 + 15
-        fig.add_annotation(
-            x=0.5 + 0.35 * math.cos(math.radians(angle)),
-            y=0.5 + 0.35 * math.sin(math.radians(angle)),
-            text=f"H{house}",
-            showarrow=False
-        )
-
-    # Planet placements
-    for house, planets in kundli["houses"].items():
-        if not planets:
-            continue
+def _polar_point(angle, radius):
+    return (
+        0.5 + radius * math.cos(math.radians(angle)),
+        0.5 + radius * math.sin(math.radians(angle))
+    )
 
-        angle = (house - 1) * 30 + 15
-        planet_text = "<br>".join(p["planet"] for p in planets)
 
-        fig.add_annotation(
-            x=0.5 + 0.25 * math.cos(math.radians(angle)),
-            y=0.5 + 0.25 * math.sin(math.radians(angle)),
-            text=planet_text,
-            showarrow=False,
-            font=dict(size=10)
-        )
+# Fixed planet-text anchors for houses 1..12
+_PLANET_ANCHORS = [_polar_point((house - 1) * 30 + 15, 0.25) for house in range(1, 13)]
 
+
+@lru_cache(maxsize=1)
+def _house_label_annotations():
+    annotations = []
+    for house in range(1, 13):
+        x, y = _polar_point((house - 1) * 30 + 15, 0.35)
+        annotations.append(dict(x=x, y=y, text=f"H{house}", showarrow=False))
+    return tuple(annotations)
+
+
+@lru_cache(maxsize=1)
+def _base_figure():
+    """Static figure: all 12 house sectors in a single Barpolar trace"""
+    fig = go.Figure(go.Barpolar(
+        r=[1] * 12,
+        theta=[i * 30 + 15 for i in range(12)],
+        width=[30] * 12,
+        marker_color="rgba(200,200,200,0.2)",
+        marker_line_color="black",
+        marker_line_width=1,
+        hoverinfo="skip",
+        showlegend=False
+    ))
     fig.update_layout(
-        title=f"Circular Kundli (Lagna: {kundli['lagna']['rashi']})",
+        annotations=list(_house_label_annotations()),
         polar=dict(
             radialaxis=dict(visible=False),
             angularaxis=dict(
@@ -71,5 +64,108 @@ def create_circular_kundli(kundli):
         ),
         showlegend=False
     )
+    return fig
+
+
+def _planet_annotations(kundli):
+    annotations = []
+    for house, planets in kundli["houses"].items():
+        if not planets:
+            continue
+        x, y = _PLANET_ANCHORS[int(house) - 1]
+        annotations.append(dict(
+            x=x,
+            y=y,
+            text="<br>".join(p["planet"] for p in planets),
+            showarrow=False,
+            font=dict(size=10)
+        ))
+    return annotations
+
+
+def _title(kundli):
+    return f"Circular Kundli (Lagna: {kundli['lagna']['rashi']})"
+
+
+def create_circular_kundli(kundli):
+    """
+    Create an interactive circular Kundli chart using Plotly.
+    Returns a Plotly Figure object.
+    """
+    fig = go.Figure(_base_figure())
+    fig.update_layout(
+        title=_title(kundli),
+        annotations=list(_house_label_annotations()) + _planet_annotations(kundli)
+    )
+    return fig
+
+
+@lru_cache(maxsize=1)
+def _json_template():
+    """
+    Base figure serialized once, split around the per-chart slots:
+    (prefix, middle, suffix) with title and annotations in between.
+    """
+    base = _base_figure().to_plotly_json()
+    layout = {k: v for k, v in base["layout"].items() if k not in ("title", "annotations")}
+    layout["title"] = {"text": _TITLE_SLOT}
+    layout["annotations"] = _ANNOTATIONS_SLOT
+    text = json.dumps(
+        {"data": base["data"], "layout": layout},
+        separators=(",", ":"),
+        default=_to_builtin
+    )
+    prefix, rest = text.split(json.dumps(_TITLE_SLOT), 1)
+    middle, suffix = rest.split(json.dumps(_ANNOTATIONS_SLOT), 1)
+    return prefix, middle, suffix
+
+
+def _to_builtin(value):
+    # Plotly may hand back numpy arrays / tuples for data arrays
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def create_circular_kundli_json(kundli):
+    """
+    Pre-serialized figure JSON (same content as create_circular_kundli(...).to_json())
+    without building a Figure: the cached base JSON is spliced with this
+    chart's title and annotations.
+    """
+    prefix, middle, suffix = _json_template()
+    annotations = list(_house_label_annotations()) + _planet_annotations(kundli)
+    return "".join((
+        prefix,
+        json.dumps(_title(kundli)),
+        middle,
+        json.dumps(annotations, separators=(",", ":")),
+        suffix
+    ))
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    import time
+
+    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+    sys.path.append(os.path.join(BASE_DIR, "kundliGenerator"))
+    from GenerateKundli import generate_kundli
+
+    kundli = generate_kundli(
+        {"date": "1995-08-15", "time": "10:30:00"},
+        {"name": "Delhi", "latitude": 28.6139, "longitude": 77.2090}
+    )
 
-    return fig
\ No newline at end of file
+    create_circular_kundli_json(kundli)  # warm caches
+    for label, fn in (
+        ("figure", create_circular_kundli),
+        ("figure + to_json", lambda k: create_circular_kundli(k).to_json()),
+        ("pre-serialized json", create_circular_kundli_json),
+    ):
+        n = 200
+        start = time.perf_counter()
+        for _ in range(n):
+            fn(kundli)
+        print(f"{label:>20}: {(time.perf_counter() - start) / n * 1e3:.2f} ms per chart")
@@ -0,0 +1,209 @@
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytz
+import swisseph as swe
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, "gazetteer"))
+
+from timezoneResolver import get_tzinfo, location_timezone
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Which eighth of the daytime (1-based), indexed by datetime.weekday() (Monday = 0)
+RAHU_KAAL_SEGMENT = [2, 7, 5, 6, 4, 3, 8]
+YAMAGANDA_SEGMENT = [4, 3, 2, 1, 7, 6, 5]
+GULIKA_SEGMENT = [6, 5, 4, 3, 2, 1, 7]
+
+# Abhijit is the 8th of the 15 daytime muhurtas
+ABHIJIT_MUHURTA = 8
+
+CHOGHADIYA_DAY_CYCLE = ['Udveg', 'Char', 'Labh', 'Amrit', 'Kaal', 'Shubh', 'Rog']
+CHOGHADIYA_NIGHT_CYCLE = ['Shubh', 'Amrit', 'Char', 'Rog', 'Kaal', 'Labh', 'Udveg']
+# First choghadiya of the day / night, indexed by weekday (Monday = 0)
+CHOGHADIYA_DAY_START = ['Amrit', 'Rog', 'Labh', 'Shubh', 'Char', 'Kaal', 'Udveg']
+CHOGHADIYA_NIGHT_START = ['Char', 'Kaal', 'Udveg', 'Amrit', 'Rog', 'Labh', 'Shubh']
+CHOGHADIYA_NATURE = {
+    'Amrit': 'Good', 'Shubh': 'Good', 'Labh': 'Good',
+    'Char': 'Neutral',
+    'Udveg': 'Bad', 'Kaal': 'Bad', 'Rog': 'Bad'
+}
+
+# Chaldean order; the first hora after sunrise belongs to the weekday lord
+HORA_SEQUENCE = ['Sun', 'Venus', 'Mercury', 'Moon', 'Saturn', 'Jupiter', 'Mars']
+WEEKDAY_LORDS = ['Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn', 'Sun']
+
+
+def local_midnight_jd(date, timezone):
+    tz = get_tzinfo(timezone)
+    start = tz.localize(datetime.strptime(date, "%Y-%m-%d")).astimezone(pytz.UTC)
+    return swe.julday(
+        start.year, start.month, start.day,
+        start.hour + start.minute / 60.0 + start.second / 3600.0
+    )
+
+
+def _next_event(jd, location, event):
+    """First sunrise/sunset (swe.CALC_RISE / CALC_SET) after jd"""
+    flag, times = swe.rise_trans(
+        jd,
+        swe.SUN,
+        geopos=(location['longitude'], location['latitude'], 0),
+        rsmi=event
+    )
+    if flag != 0:
+        raise ValueError("The Sun does not rise or set on this date at this latitude")
+    return times[0]
+
+
+def format_local(jd, timezone):
+    y, m, d, hours = swe.revjul(jd)
+    utc = datetime(y, m, d, tzinfo=pytz.UTC) + timedelta(seconds=round(hours * 3600))
+    return utc.astimezone(get_tzinfo(timezone)).strftime("%H:%M:%S")
+
+
+def sun_events(date, location, days=1, timezone=None):
+    """
+    Sunrises and sunsets for `days` consecutive local days:
+    ([rise_0 .. rise_days], [set_0 .. set_days-1]) as JDs (UT).
+    Each day's next sunrise is the following day's sunrise, so a range
+    costs 2 * days + 1 rise_trans calls.
+    """
+    if timezone is None:
+        timezone = location_timezone(location)
+    rises, sets = [], []
+    jd = local_midnight_jd(date, timezone)
+    rises.append(_next_event(jd, location, swe.CALC_RISE))
+    for _ in range(days):
+        sets.append(_next_event(rises[-1], location, swe.CALC_SET))
+        rises.append(_next_event(sets[-1], location, swe.CALC_RISE))
+    return rises, sets
+
+
+def _segment(start, end, timezone, **extra):
+    return {
+        'start': format_local(start, timezone),
+        'end': format_local(end, timezone),
+        'start_jd': start,
+        'end_jd': end,
+        **extra
+    }
+
+
+def _split(start, end, parts):
+    step = (end - start) / parts
+    return [(start + i * step, start + (i + 1) * step) for i in range(parts)]
+
+
+def _cycle(sequence, first, count):
+    offset = sequence.index(first)
+    return [sequence[(offset + i) % len(sequence)] for i in range(count)]
+
+
+def key_periods(sunrise, sunset, weekday):
+    """(start, end) JDs of Rahu Kaal, Yamaganda, Gulika and Abhijit; works on arrays too"""
+    eighth = (sunset - sunrise) / 8
+    muhurta = (sunset - sunrise) / 15
+    periods = {}
+    for key, segments in (('rahu_kaal', RAHU_KAAL_SEGMENT),
+                          ('yamaganda', YAMAGANDA_SEGMENT),
+                          ('gulika', GULIKA_SEGMENT)):
+        index = segments[weekday]
+        periods[key] = (sunrise + (index - 1) * eighth, sunrise + index * eighth)
+    periods['abhijit'] = (sunrise + (ABHIJIT_MUHURTA - 1) * muhurta,
+                          sunrise + ABHIJIT_MUHURTA * muhurta)
+    return periods
+
+
+def timings_for_day(sunrise, sunset, next_sunrise, weekday, timezone):
+    """
+    All muhurta tables for one day from its sunrise / sunset / next sunrise
+    (JDs) and weekday (datetime.weekday(), Monday = 0), in local time of
+    timezone (IANA name or UTC offset in hours)
+    """
+    day_eighths = _split(sunrise, sunset, 8)
+    periods = key_periods(sunrise, sunset, weekday)
+
+    choghadiya = []
+    for (start, end), name in zip(day_eighths, _cycle(CHOGHADIYA_DAY_CYCLE, CHOGHADIYA_DAY_START[weekday], 8)):
+        choghadiya.append(_segment(start, end, timezone, name=name, period='day',
+                                   nature=CHOGHADIYA_NATURE[name]))
+    night_eighths = _split(sunset, next_sunrise, 8)
+    for (start, end), name in zip(night_eighths, _cycle(CHOGHADIYA_NIGHT_CYCLE, CHOGHADIYA_NIGHT_START[weekday], 8)):
+        choghadiya.append(_segment(start, end, timezone, name=name, period='night',
+                                   nature=CHOGHADIYA_NATURE[name]))
+
+    hora_spans = _split(sunrise, sunset, 12) + _split(sunset, next_sunrise, 12)
+    hora_lords = _cycle(HORA_SEQUENCE, WEEKDAY_LORDS[weekday], 24)
+    hora = [
+        _segment(start, end, timezone, lord=lord, period='day' if i < 12 else 'night')
+        for i, ((start, end), lord) in enumerate(zip(hora_spans, hora_lords))
+    ]
+
+    return {
+        'vara': WEEKDAYS[weekday],
+        'sunrise': format_local(sunrise, timezone),
+        'sunset': format_local(sunset, timezone),
+        'next_sunrise': format_local(next_sunrise, timezone),
+        'rahu_kaal': _segment(*periods['rahu_kaal'], timezone,
+                              period_index=RAHU_KAAL_SEGMENT[weekday]),
+        'yamaganda': _segment(*periods['yamaganda'], timezone,
+                              period_index=YAMAGANDA_SEGMENT[weekday]),
+        'gulika': _segment(*periods['gulika'], timezone,
+                           period_index=GULIKA_SEGMENT[weekday]),
+        'abhijit': _segment(*periods['abhijit'], timezone),
+        'choghadiya': choghadiya,
+        'hora': hora
+    }
+
+
+def calculate_daily_timings(date, location, timezone=None):
+    """
+    Rahu Kaal, Yamaganda, Gulika, Abhijit, Choghadiya and Hora for one local
+    day; timezone defaults to the location's (see location_timezone)
+    """
+    return calculate_timings_range(date, 1, location, timezone)[0]
+
+
+def calculate_timings_range(start_date, days, location, timezone=None):
+    """Daily timings for consecutive days; sunrise/sunset results are shared between days"""
+    if timezone is None:
+        timezone = location_timezone(location)
+    rises, sets = sun_events(start_date, location, days, timezone)
+    first = datetime.strptime(start_date, "%Y-%m-%d")
+
+    timings = []
+    for i in range(days):
+        day = first + timedelta(days=i)
+        entry = timings_for_day(rises[i], sets[i], rises[i + 1], day.weekday(), timezone)
+        entry['date'] = day.strftime("%Y-%m-%d")
+        timings.append(entry)
+    return timings
+
+
+if __name__ == "__main__":
+    location = {
+        "name": "Delhi",
+        "latitude": 28.6139,
+        "longitude": 77.2090
+    }
+
+    t = calculate_daily_timings("2026-01-18", location)
+    print(f"\n=== DAILY TIMINGS (Delhi, 2026-01-18, {t['vara']}) ===\n")
+    print(f"Sunrise {t['sunrise']}  Sunset {t['sunset']}  Next sunrise {t['next_sunrise']}")
+    for key in ('rahu_kaal', 'yamaganda', 'gulika', 'abhijit'):
+        print(f"{key:<10} {t[key]['start']} - {t[key]['end']}")
+
+    print("\nChoghadiya:")
+    for c in t['choghadiya']:
+        print(f"  {c['period']:<5} {c['start']} - {c['end']}  {c['name']:<6} ({c['nature']})")
+
+    print("\nHora:")
+    for h in t['hora']:
+        print(f"  {h['period']:<5} {h['start']} - {h['end']}  {h['lord']}")
+
+    print("\nRahu Kaal, next 7 days:")
+    for day in calculate_timings_range("2026-01-18", 7, location):
+        print(f"  {day['date']} {day['vara']:<9} {day['rahu_kaal']['start']} - {day['rahu_kaal']['end']}")
@@ -0,0 +1,162 @@
+import math
+import os
+import sys
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+import pytz
+import swisseph as swe
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, "Swiss_Ephemeris"))
+sys.path.append(os.path.join(BASE_DIR, "gazetteer"))
+
+from fixedLongitude import RASHIS, rashi_index, to_mas
+from vectorEphemeris import ascendant_from_armc
+from timezoneResolver import get_tzinfo, location_timezone
+
+# Tables are cached per grid cell: locations are snapped to the cell centre.
+# 0.1° of longitude shifts a lagna change by ~0.4 minutes.
+GRID_CELL_DEGREES = 0.1
+
+SAMPLE_MINUTES = 4          # coarse scan step (well below the fastest-rising sign)
+PRECISION_SECONDS = 1       # bisection stops at this resolution
+
+
+def _snap(value, cell=GRID_CELL_DEGREES):
+    """Centre of the grid cell containing value"""
+    return round((math.floor(value / cell) + 0.5) * cell, 6)
+
+
+def _ascendant(jd, latitude, longitude, eps):
+    """
+    Tropical ascendant (same value as calculate_ascendant). Computed from
+    the ARMC directly: house cusps, and with them houses_armc, fail inside
+    the polar circles, where the ascendant is still defined.
+    """
+    armc = (swe.sidtime(jd) * 15 + longitude) % 360
+    return float(ascendant_from_armc(armc, latitude, eps))
+
+
+def _sign(jd, latitude, longitude, eps):
+    return rashi_index(to_mas(_ascendant(jd, latitude, longitude, eps)))
+
+
+def _find_change(jd_a, jd_b, sign_a, latitude, longitude, eps):
+    """Bisection for the instant the lagna leaves sign_a inside [jd_a, jd_b]"""
+    tolerance = PRECISION_SECONDS / 86400
+    while jd_b - jd_a > tolerance:
+        mid = (jd_a + jd_b) / 2
+        if _sign(mid, latitude, longitude, eps) == sign_a:
+            jd_a = mid
+        else:
+            jd_b = mid
+    return jd_b
+
+
+def _local_jd(local, timezone):
+    """Julian Day (UT) of a naive local datetime in a zone"""
+    utc = get_tzinfo(timezone).localize(local).astimezone(pytz.UTC)
+    return swe.julday(utc.year, utc.month, utc.day,
+                      utc.hour + utc.minute / 60.0 + utc.second / 3600.0)
+
+
+def _local_day_bounds(date, timezone):
+    """JDs of this local midnight and the next: 23 or 25 hours apart on DST changes"""
+    midnight = datetime.strptime(date, "%Y-%m-%d")
+    return _local_jd(midnight, timezone), _local_jd(midnight + timedelta(days=1), timezone)
+
+
+def _format_local(jd, timezone):
+    y, m, d, hours = swe.revjul(jd)
+    utc = datetime(y, m, d, tzinfo=pytz.UTC) + timedelta(seconds=round(hours * 3600))
+    return utc.astimezone(get_tzinfo(timezone)).strftime("%H:%M:%S")
+
+
+@lru_cache(maxsize=4096)
+def _lagna_table(date, latitude, longitude, timezone):
+    jd_start, jd_end = _local_day_bounds(date, timezone)
+    eps = swe.calc_ut(jd_start + 0.5, swe.ECL_NUT)[0][0]  # true obliquity
+
+    step = SAMPLE_MINUTES / 1440
+    changes = []
+    jd_a = jd_start
+    sign_a = _sign(jd_a, latitude, longitude, eps)
+    first_sign = sign_a
+    while jd_a < jd_end:
+        jd_b = min(jd_a + step, jd_end)
+        sign_b = _sign(jd_b, latitude, longitude, eps)
+        # Loop in case more than one boundary falls inside one step
+        while sign_b != sign_a:
+            change = _find_change(jd_a, jd_b, sign_a, latitude, longitude, eps)
+            sign_a = _sign(change, latitude, longitude, eps)
+            changes.append((change, sign_a))
+            jd_a = change
+        jd_a = jd_b
+
+    windows = []
+    start, sign = jd_start, first_sign
+    for change, next_sign in changes + [(jd_end, None)]:
+        windows.append((start, change, sign))
+        start, sign = change, next_sign
+    return tuple(windows)
+
+
+def calculate_lagna_table(date, location, timezone=None):
+    """
+    Lagna (ascendant sign) windows covering one local day at a location.
+    Change instants are found by bisection on the ascendant from the
+    ARMC; tables are cached per (grid cell, date, time zone).
+    The first and last windows are cut at local midnight; timezone
+    defaults to the location's (see location_timezone).
+    """
+    if timezone is None:
+        timezone = location_timezone(location)
+    latitude = _snap(location['latitude'])
+    longitude = _snap(location['longitude'])
+    table = _lagna_table(date, latitude, longitude, timezone)
+
+    return [
+        {
+            'rashi': RASHIS[sign],
+            'start': _format_local(start, timezone),
+            'end': _format_local(end, timezone),
+            'start_jd': start,
+            'end_jd': end,
+            'duration_minutes': round((end - start) * 1440, 1)
+        }
+        for start, end, sign in table
+    ]
+
+
+def get_rising_lagna(date, time, location, timezone=None):
+    """Which lagna is rising at a local date/time, and until when"""
+    if timezone is None:
+        timezone = location_timezone(location)
+    table = _lagna_table(
+        date, _snap(location['latitude']), _snap(location['longitude']), timezone
+    )
+    jd = _local_jd(datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M:%S"), timezone)
+    index = max(0, bisect_right([w[0] for w in table], jd) - 1)
+    start, end, sign = table[index]
+    return {
+        'rashi': RASHIS[sign],
+        'until': _format_local(end, timezone),
+        'minutes_left': round((end - jd) * 1440, 1)
+    }
+
+
+if __name__ == "__main__":
+    location = {
+        "name": "Delhi",
+        "latitude": 28.6139,
+        "longitude": 77.2090
+    }
+
+    print("\n=== LAGNA TABLE (Delhi, 2026-01-18) ===\n")
+    for window in calculate_lagna_table("2026-01-18", location):
+        print(f"{window['rashi']:<12} {window['start']} - {window['end']}  "
+              f"({window['duration_minutes']} min)")
+
+    print("\nRising at 10:30:00 ->", get_rising_lagna("2026-01-18", "10:30:00", location))
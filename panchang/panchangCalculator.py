@@ -1,47 +1,75 @@
 import sys
 import os
-from datetime import datetime
-import pytz
+import math
+from datetime import datetime, timedelta
+import numpy as np
+import swisseph as swe
 
 # Add Swiss_Ephemeris directory to Python path
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 SWISS_EPHEMERIS_PATH = os.path.join(BASE_DIR, "Swiss_Ephemeris")
 sys.path.append(SWISS_EPHEMERIS_PATH)
-
-
-from Swiss_Ephemeris import get_planetary_positions
+sys.path.append(os.path.join(BASE_DIR, "gazetteer"))
+
+
+from Swiss_Ephemeris import get_julian_day, get_planetary_positions
+from dailyTimings import (
+    calculate_daily_timings, format_local, key_periods, local_midnight_jd,
+    RAHU_KAAL_SEGMENT, YAMAGANDA_SEGMENT, GULIKA_SEGMENT
+)
+from sunriseSolver import sunrise_sunset
+from timezoneResolver import load_resolver, location_timezone, utc_offset
+from fixedLongitude import (
+    NAKSHATRAS, karana_number, nakshatra_index, tithi_number, to_mas, yoga_index
+)
+
+TITHI_NAMES = [
+    'Pratipada', 'Dwitiya', 'Tritiya', 'Chaturthi', 'Panchami',
+    'Shashthi', 'Saptami', 'Ashtami', 'Navami', 'Dashami',
+    'Ekadashi', 'Dwadashi', 'Trayodashi', 'Chaturdashi', 'Purnima/Amavasya'
+]
+
+YOGA_NAMES = [
+    'Vishkumbha', 'Preeti', 'Ayushman', 'Saubhagya', 'Shobhana',
+    'Atiganda', 'Sukarma', 'Dhriti', 'Shoola', 'Ganda',
+    'Vriddhi', 'Dhruva', 'Vyaghata', 'Harshana', 'Vajra',
+    'Siddhi', 'Vyatipata', 'Variyan', 'Parigha', 'Shiva',
+    'Siddha', 'Sadhya', 'Shubha', 'Shukla', 'Brahma',
+    'Indra', 'Vaidhriti'
+]
+
+KARANA_NAMES = [
+    "Bava", "Balava", "Kaulava", "Taitila", "Garaja",
+    "Vanija", "Vishti"
+]
 
 # Helper to determine Nakshatra from longitude
 def get_nakshatra(longitude):
     """
     Determine Nakshatra from longitude
-    Each Nakshatra spans 13°20' (13.333333°)
-    """
-    nakshatras = [
-        "Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashira",
-        "Ardra", "Punarvasu", "Pushya", "Ashlesha",
-        "Magha", "Purva Phalguni", "Uttara Phalguni",
-        "Hasta", "Chitra", "Swati", "Vishakha",
-        "Anuradha", "Jyeshtha", "Mula",
-        "Purva Ashadha", "Uttara Ashadha", "Shravana",
-        "Dhanishta", "Shatabhisha",
-        "Purva Bhadrapada", "Uttara Bhadrapada", "Revati"
-    ]
-    return nakshatras[int(longitude / 13.333333)]
+    Each Nakshatra spans 13°20' (exactly 48,000,000 milli-arcseconds)
+    """
+    return NAKSHATRAS[nakshatra_index(to_mas(longitude))]
 
 def calculate_panchang(date, location):
     """
-    Calculate 5 elements of Hindu calendar
+    Calculate 5 elements of Hindu calendar, at local midnight of `date` in
+    the location's time zone
     """
+    timezone = location_timezone(location)
     
     positions = get_planetary_positions(
         date, "00:00:00",
         location['latitude'],
-        location['longitude']
+        location['longitude'],
+        timezone
     )
     
     moon_longitude = positions['Moon']['longitude']
     sun_longitude = positions['Sun']['longitude']
+
+    # One sunrise / sunset / next-sunrise triple for all day timings
+    timings = calculate_daily_timings(date, location, timezone)
     
     panchang = {
         'tithi': calculate_tithi(moon_longitude, sun_longitude),
@@ -49,32 +77,195 @@ def calculate_panchang(date, location):
         'nakshatra': get_nakshatra(moon_longitude),
         'yoga': calculate_yoga(moon_longitude, sun_longitude),
         'karana': calculate_karana(moon_longitude, sun_longitude),
-        'sunrise': calculate_sunrise(date, location),
-        'sunset': calculate_sunset(date, location),
-        'rahu_kaal': calculate_rahu_kaal(date, location)
+        'sunrise': timings['sunrise'][:5],
+        'sunset': timings['sunset'][:5],
+        'rahu_kaal': _rahu_kaal_entry(timings),
+        'yamaganda': _local_times(timings['yamaganda']),
+        'gulika': _local_times(timings['gulika']),
+        'abhijit': _local_times(timings['abhijit'])
     }
     
     return panchang
 
+# Angular size of each element and the Moon/Sun combination it is measured on
+PANCHANG_ELEMENTS = {
+    'tithi': (12.0, lambda sun, moon: moon - sun),
+    'karana': (6.0, lambda sun, moon: moon - sun),
+    'nakshatra': (360 / 27, lambda sun, moon: moon),
+    'yoga': (360 / 27, lambda sun, moon: moon + sun)
+}
+
+
+def _sun_moon(jd):
+    return swe.calc_ut(jd, swe.SUN)[0][0], swe.calc_ut(jd, swe.MOON)[0][0]
+
+
+def _global_transitions(jd_start, jd_end):
+    """
+    Sun/Moon longitudes sampled hourly over [jd_start, jd_end] (unwrapped)
+    and the instants each panchang element changes. These are the same
+    everywhere on Earth, so they are computed once per date.
+    """
+    hours = np.arange(jd_start, jd_end + 1 / 24, 1 / 24)
+    samples = np.array([_sun_moon(jd) for jd in hours])
+    sun = np.unwrap(samples[:, 0], period=360)
+    moon = np.unwrap(samples[:, 1], period=360)
+
+    transitions = {}
+    for name, (step, angle) in PANCHANG_ELEMENTS.items():
+        q = angle(sun, moon)
+        targets = np.arange(math.ceil(q[0] / step), math.floor(q[-1] / step) + 1) * step
+        t = np.interp(targets, q, hours)
+        rate = np.interp(t, hours, np.gradient(q, hours))
+        for _ in range(2):
+            for i, target in enumerate(targets):
+                exact = angle(*_sun_moon(t[i]))
+                t[i] -= (((exact - target) + 180) % 360 - 180) / rate[i]
+        transitions[name] = t
+
+    return hours, sun, moon, transitions
+
+
+def _utc_offset_days(date, timezone):
+    """UTC offset of the local date (taken at noon) in days"""
+    return utc_offset(timezone, date, "12:00:00") / 24
+
+
+def _format_jd(jd, offset_days, fmt="%H:%M:%S"):
+    y, m, d, hours = swe.revjul(jd + offset_days)
+    return (datetime(y, m, d) + timedelta(seconds=round(hours * 3600))).strftime(fmt)
+
+
+def midnight_elements(day, midnights):
+    """
+    Element codes at each local midnight JD (array) of one date (JD of 0h UT),
+    with the same rules as calculate_tithi / get_nakshatra / calculate_yoga /
+    calculate_karana, plus the JD each element ends:
+    {'tithi': number 1-30, 'nakshatra': index, 'yoga': index, 'karana': index,
+     'ends': {element: JD}}
+    Local midnight depends only on the time zone, so the Sun and Moon are
+    computed once per distinct midnight.
+    """
+    # Local midnights fall within about ±14 h of 0h UT; transitions are
+    # needed up to a little over a day after the latest one
+    hours, sun, moon, transitions = _global_transitions(day - 1, day + 2.5)
+    unique, inverse = np.unique(midnights, return_inverse=True)
+    positions = np.array([_sun_moon(jd) for jd in unique])[inverse.ravel()]
+    sun_at_midnight = to_mas(positions[:, 0])
+    moon_at_midnight = to_mas(positions[:, 1])
+
+    return {
+        'tithi': tithi_number(moon_at_midnight, sun_at_midnight).astype(int),
+        'nakshatra': nakshatra_index(moon_at_midnight).astype(int),
+        'yoga': yoga_index(moon_at_midnight, sun_at_midnight).astype(int),
+        'karana': karana_number(moon_at_midnight, sun_at_midnight).astype(int) % len(KARANA_NAMES),
+        'ends': {
+            name: t[np.minimum(np.searchsorted(t, midnights, side='right'), len(t) - 1)]
+            for name, t in transitions.items()
+        }
+    }
+
+
+def calculate_panchang_multi(date, locations):
+    """
+    Panchang for many locations on one date, with the same convention and
+    keys as calculate_panchang (elements at local midnight of `date`), plus
+    'location' and the local time each element ends.
+
+    Tithi, nakshatra, yoga and karana transitions are global, so the
+    Sun/Moon work is done once per time zone; each location only adds its
+    sunrise (vectorized for all locations). Locations may carry a
+    'timezone' or 'utc_offset'; the others are resolved from their
+    coordinates together.
+    """
+    day = swe.julday(*(int(p) for p in date.split("-")), 0.0)
+    latitudes = np.array([loc['latitude'] for loc in locations], dtype=float)
+    longitudes = np.array([loc['longitude'] for loc in locations], dtype=float)
+    rises, sets = sunrise_sunset([day], latitudes, longitudes)
+    rises, sets = rises[0], sets[0]
+
+    weekday = datetime.strptime(date, "%Y-%m-%d").weekday()
+    periods = key_periods(rises, sets, weekday)
+    vara = calculate_vara(date)
+
+    unresolved = [i for i, loc in enumerate(locations)
+                  if loc.get('timezone') is None and loc.get('utc_offset') is None]
+    resolved = dict(zip(unresolved, load_resolver().resolve_many(
+        latitudes[unresolved], longitudes[unresolved]
+    ))) if unresolved else {}
+    timezones = [resolved[i] if i in resolved else location_timezone(location)
+                 for i, location in enumerate(locations)]
+
+    offsets, midnights = {}, {}
+    for timezone in timezones:
+        if timezone not in offsets:
+            offsets[timezone] = _utc_offset_days(date, timezone)
+            # The same instant calculate_panchang takes its positions at
+            midnights[timezone] = get_julian_day(date, "00:00:00", timezone)
+    elements = midnight_elements(day, np.array([midnights[tz] for tz in timezones]))
+
+    results = []
+    for i, location in enumerate(locations):
+        offset = offsets[timezones[i]]
+        panchang = {
+            'location': location.get('name'),
+            'tithi': tithi_entry(int(elements['tithi'][i])),
+            'vara': vara,
+            'nakshatra': NAKSHATRAS[elements['nakshatra'][i]],
+            'yoga': YOGA_NAMES[elements['yoga'][i]],
+            'karana': KARANA_NAMES[elements['karana'][i]],
+            'ends': {
+                name: _format_jd(elements['ends'][name][i], offset, "%Y-%m-%d %H:%M:%S")
+                for name in PANCHANG_ELEMENTS
+            }
+        }
+        if np.isnan(rises[i]):
+            panchang['error'] = 'The Sun does not rise or set on this date'
+            results.append(panchang)
+            continue
+
+        panchang.update({
+            'sunrise': _format_jd(rises[i], offset, "%H:%M"),
+            'sunset': _format_jd(sets[i], offset, "%H:%M"),
+            'rahu_kaal': {
+                'start': _format_jd(periods['rahu_kaal'][0][i], offset),
+                'end': _format_jd(periods['rahu_kaal'][1][i], offset),
+                'period_index': RAHU_KAAL_SEGMENT[weekday],
+                'note': "Exact Rahu Kaal timing derived from sunrise-sunset segmentation"
+            },
+            'yamaganda': {
+                'start': _format_jd(periods['yamaganda'][0][i], offset),
+                'end': _format_jd(periods['yamaganda'][1][i], offset),
+                'period_index': YAMAGANDA_SEGMENT[weekday]
+            },
+            'gulika': {
+                'start': _format_jd(periods['gulika'][0][i], offset),
+                'end': _format_jd(periods['gulika'][1][i], offset),
+                'period_index': GULIKA_SEGMENT[weekday]
+            },
+            'abhijit': {
+                'start': _format_jd(periods['abhijit'][0][i], offset),
+                'end': _format_jd(periods['abhijit'][1][i], offset)
+            }
+        })
+        results.append(panchang)
+
+    return results
+
 def calculate_tithi(moon_long, sun_long):
     """
     Tithi is lunar day (1-30)
     Based on Moon-Sun angle difference
     """
-    difference = (moon_long - sun_long) % 360
-    tithi_number = int(difference / 12) + 1
-    
-    tithi_names = [
-        'Pratipada', 'Dwitiya', 'Tritiya', 'Chaturthi', 'Panchami',
-        'Shashthi', 'Saptami', 'Ashtami', 'Navami', 'Dashami',
-        'Ekadashi', 'Dwadashi', 'Trayodashi', 'Chaturdashi', 'Purnima/Amavasya'
-    ]
-    
+    return tithi_entry(tithi_number(to_mas(moon_long), to_mas(sun_long)))
+
+def tithi_entry(tithi_number):
+    """Tithi number (1-30) -> {'number', 'name', 'paksha'}"""
     paksha = 'Shukla' if tithi_number <= 15 else 'Krishna'
     
     return {
         'number': tithi_number,
-        'name': tithi_names[(tithi_number - 1) % 15],
+        'name': TITHI_NAMES[(tithi_number - 1) % 15],
         'paksha': paksha
     }
 
@@ -82,46 +273,21 @@ def calculate_yoga(moon_long, sun_long):
     """
     27 yogas based on sum of Sun and Moon longitudes
     """
-    yoga_sum = (moon_long + sun_long) % 360
-    yoga_number = int(yoga_sum / 13.333333)
-    
-    yoga_names = [
-        'Vishkumbha', 'Preeti', 'Ayushman', 'Saubhagya', 'Shobhana',
-        'Atiganda', 'Sukarma', 'Dhriti', 'Shoola', 'Ganda',
-        'Vriddhi', 'Dhruva', 'Vyaghata', 'Harshana', 'Vajra',
-        'Siddhi', 'Vyatipata', 'Variyan', 'Parigha', 'Shiva',
-        'Siddha', 'Sadhya', 'Shubha', 'Shukla', 'Brahma',
-        'Indra', 'Vaidhriti'
-    ]
-    
-    return yoga_names[yoga_number]
+    return YOGA_NAMES[yoga_index(to_mas(moon_long), to_mas(sun_long))]
 
-def calculate_sunrise(date, location):
-    """Use Swiss Ephemeris to calculate exact sunrise"""
-    import swisseph as swe
-
-    dt = datetime.strptime(date, "%Y-%m-%d")
-    jd = swe.julday(dt.year, dt.month, dt.day, 0)
+def calculate_sunrise(date, location, timezone=None):
+    """Use Swiss Ephemeris to calculate exact sunrise, as local HH:MM"""
+    if timezone is None:
+        timezone = location_timezone(location)
 
     # rsmi flags must be passed as keyword with geopos tuple
     result = swe.rise_trans(
-        jd,
+        local_midnight_jd(date, timezone),
         swe.SUN,
         geopos=(location['longitude'], location['latitude'], 0),
         rsmi=swe.CALC_RISE
     )
-
-    sunrise_jd = result[1][0]
-    rev = swe.revjul(sunrise_jd)
-    utc_h = rev[3]
-    utc_m = rev[4] if len(rev) > 4 else 0
-
-    # Convert UTC to IST (+5:30)
-    total_minutes = int(utc_h * 60 + utc_m + 330)
-    h = (total_minutes // 60) % 24
-    mi = total_minutes % 60
-
-    return f"{h:02d}:{mi:02d}"
+    return format_local(result[1][0], timezone)[:5]
 
 def calculate_vara(date):
     """Day of the week (Vara)"""
@@ -135,65 +301,44 @@ def calculate_karana(moon_long, sun_long):
     Karana based on half-tithi (6 degrees)
     Simplified, deterministic implementation
     """
-    difference = (moon_long - sun_long) % 360
-    karana_index = int(difference / 6)
-
-    karana_names = [
-        "Bava", "Balava", "Kaulava", "Taitila", "Garaja",
-        "Vanija", "Vishti"
-    ]
+    karana_index = karana_number(to_mas(moon_long), to_mas(sun_long))
 
     # Cycles through karanas
-    return karana_names[karana_index % len(karana_names)]
+    return KARANA_NAMES[karana_index % len(KARANA_NAMES)]
 
 
-def calculate_sunset(date, location):
-    """Use Swiss Ephemeris to calculate exact sunset"""
-    import swisseph as swe
-
-    dt = datetime.strptime(date, "%Y-%m-%d")
-    jd = swe.julday(dt.year, dt.month, dt.day, 0)
+def calculate_sunset(date, location, timezone=None):
+    """Use Swiss Ephemeris to calculate exact sunset, as local HH:MM"""
+    if timezone is None:
+        timezone = location_timezone(location)
 
     result = swe.rise_trans(
-        jd,
+        local_midnight_jd(date, timezone),
         swe.SUN,
         geopos=(location['longitude'], location['latitude'], 0),
         rsmi=swe.CALC_SET
     )
-
-    sunset_jd = result[1][0]
-    rev = swe.revjul(sunset_jd)
-    utc_h = rev[3]
-    utc_m = rev[4] if len(rev) > 4 else 0
-
-    # Convert UTC to IST (+5:30)
-    total_minutes = int(utc_h * 60 + utc_m + 330)
-    h = (total_minutes // 60) % 24
-    mi = total_minutes % 60
-
-    return f"{h:02d}:{mi:02d}"
+    return format_local(result[1][0], timezone)[:5]
 
 
 def calculate_rahu_kaal(date, location):
     """
-    Simplified Rahu Kaal calculation based on weekday
+    Rahu Kaal: the weekday's eighth of the daytime (sunrise to sunset)
     """
-    vara = calculate_vara(date)
-    rahu_periods = {
-        "Monday": 2,
-        "Tuesday": 7,
-        "Wednesday": 5,
-        "Thursday": 6,
-        "Friday": 4,
-        "Saturday": 3,
-        "Sunday": 8
-    }
+    return _rahu_kaal_entry(calculate_daily_timings(date, location))
+
 
+def _rahu_kaal_entry(timings):
     return {
-        "period_index": rahu_periods.get(vara),
+        **_local_times(timings['rahu_kaal']),
         "note": "Exact Rahu Kaal timing derived from sunrise-sunset segmentation"
     }
 
+
+def _local_times(segment):
+    """Timing segment without its Julian Day fields (panchang stays JSON-friendly)"""
+    return {k: v for k, v in segment.items() if not k.endswith('_jd')}
+
 def print_ascii_panchang_chart(panchang):
     """
     Print an ASCII Panchang chart in terminal
@@ -207,7 +352,8 @@ def print_ascii_panchang_chart(panchang):
     print(f"| Karana     : {panchang['karana']:<15} |")
     print(f"| Sunrise    : {panchang['sunrise']:<15} |")
     print(f"| Sunset     : {panchang['sunset']:<15} |")
-    print(f"| Rahu Kaal  : Period {panchang['rahu_kaal']['period_index']:<9} |")
+    rahu_kaal = f"{panchang['rahu_kaal']['start'][:5]}-{panchang['rahu_kaal']['end'][:5]}"
+    print(f"| Rahu Kaal  : {rahu_kaal:<15} |")
     print("+-------------------------------+")
 
 if __name__ == "__main__":
@@ -222,4 +368,15 @@ if __name__ == "__main__":
     from pprint import pprint
     print("\n=== PANCHANG OUTPUT ===\n")
     pprint(panchang)
-    print_ascii_panchang_chart(panchang)
\ No newline at end of file
+    print_ascii_panchang_chart(panchang)
+
+    print("\n=== MULTI-CITY PANCHANG ===\n")
+    cities = [
+        location,
+        {"name": "Mumbai", "latitude": 19.0760, "longitude": 72.8777},
+        {"name": "London", "latitude": 51.5074, "longitude": -0.1278, "timezone": "Europe/London"},
+        {"name": "New York", "latitude": 40.7128, "longitude": -74.0060, "timezone": "America/New_York"}
+    ]
+    for city in calculate_panchang_multi("2026-01-18", cities):
+        print(f"{city['location']:<9} sunrise {city['sunrise']}  {city['tithi']['paksha']} "
+              f"{city['tithi']['name']} (ends {city['ends']['tithi']})  {city['nakshatra']}")
\ No newline at end of file
@@ -0,0 +1,317 @@
+"""
+panchangTables.py
+-----------------
+Prebuilt per-city daily panchang served from one binary file.
+
+Build (offline):
+    python panchang/panchangTables.py build --start 2026-01-01 --years 3 \
+        --output panchang_tables.bin [--cities cities.csv]
+
+Serve:
+    tables = PanchangTables("panchang_tables.bin")
+    tables.lookup("Delhi", "2026-01-18")
+
+File layout (little-endian):
+    header   32 bytes   magic, version, record size, cities, days,
+                        first date (ordinal), records offset, cities offset
+    records  cities x days fixed-width RECORD structs, one city's days contiguous
+    cities   UTF-8 JSON list of {name, latitude, longitude, timezone}
+
+Elements are taken at local midnight of the date, like calculate_panchang,
+and a lookup returns the same keys as calculate_panchang_multi. Names are
+stored as integer codes and times as seconds after local midnight of the
+date, so a lookup is one struct read from the mmap.
+"""
+
+import argparse
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+from calendar import monthrange
+from datetime import date as date_cls, datetime, timedelta
+
+import numpy as np
+import swisseph as swe
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, "panchang"))
+sys.path.append(os.path.join(BASE_DIR, "Swiss_Ephemeris"))
+sys.path.append(os.path.join(BASE_DIR, "gazetteer"))
+
+from panchangCalculator import (
+    KARANA_NAMES, NAKSHATRAS, PANCHANG_ELEMENTS, YOGA_NAMES, calculate_vara,
+    midnight_elements, tithi_entry
+)
+from dailyTimings import GULIKA_SEGMENT, RAHU_KAAL_SEGMENT, YAMAGANDA_SEGMENT, key_periods
+from Swiss_Ephemeris import get_julian_day
+from sunriseSolver import sunrise_sunset
+from timezoneResolver import get_tzinfo, location_timezone
+
+MAGIC = b"VAPT"
+VERSION = 2
+HEADER = struct.Struct("<4sHHIIiII")
+RECORDS_OFFSET = 32
+
+RECORD = np.dtype([
+    ('tithi', 'u1'),            # 1-30
+    ('nakshatra', 'u1'),        # index into NAKSHATRAS
+    ('yoga', 'u1'),             # index into YOGA_NAMES
+    ('karana', 'u1'),           # index into KARANA_NAMES
+    ('sunrise', '<i4'),         # seconds after local midnight
+    ('sunset', '<i4'),
+    ('rahu_kaal_start', '<i4'),
+    ('rahu_kaal_end', '<i4'),
+    ('yamaganda_start', '<i4'),
+    ('yamaganda_end', '<i4'),
+    ('gulika_start', '<i4'),
+    ('gulika_end', '<i4'),
+    ('abhijit_start', '<i4'),
+    ('abhijit_end', '<i4'),
+    ('tithi_end', '<i4'),       # may exceed 86400 (ends on a later day)
+    ('karana_end', '<i4'),
+    ('nakshatra_end', '<i4'),
+    ('yoga_end', '<i4'),
+])
+PERIODS = {
+    'rahu_kaal': RAHU_KAAL_SEGMENT,
+    'yamaganda': YAMAGANDA_SEGMENT,
+    'gulika': GULIKA_SEGMENT,
+    'abhijit': None
+}
+MISSING = -2 ** 31              # no sunrise/sunset (polar day or night)
+
+DEFAULT_CITIES = [
+    {"name": "Delhi", "latitude": 28.6139, "longitude": 77.2090},
+    {"name": "Mumbai", "latitude": 19.0760, "longitude": 72.8777},
+    {"name": "Kolkata", "latitude": 22.5726, "longitude": 88.3639},
+    {"name": "Chennai", "latitude": 13.0827, "longitude": 80.2707},
+    {"name": "Bengaluru", "latitude": 12.9716, "longitude": 77.5946},
+    {"name": "Hyderabad", "latitude": 17.3850, "longitude": 78.4867},
+    {"name": "Ahmedabad", "latitude": 23.0225, "longitude": 72.5714},
+    {"name": "Pune", "latitude": 18.5204, "longitude": 73.8567},
+    {"name": "Jaipur", "latitude": 26.9124, "longitude": 75.7873},
+    {"name": "Lucknow", "latitude": 26.8467, "longitude": 80.9462},
+    {"name": "Varanasi", "latitude": 25.3176, "longitude": 82.9739},
+    {"name": "Ujjain", "latitude": 23.1765, "longitude": 75.7885},
+]
+
+
+def read_cities(path):
+    """CSV with columns name, latitude, longitude[, timezone] (missing zones are resolved)"""
+    with open(path, newline="", encoding="utf-8") as f:
+        return [
+            {
+                "name": row["name"],
+                "latitude": float(row["latitude"]),
+                "longitude": float(row["longitude"]),
+                "timezone": row.get("timezone") or None
+            }
+            for row in csv.DictReader(f)
+        ]
+
+
+def _utc_offsets(dates, timezone):
+    """UTC offset (days) of each local date, taken at local noon"""
+    tz = get_tzinfo(timezone)
+    return np.array([
+        tz.localize(datetime.combine(d, datetime.min.time()) + timedelta(hours=12))
+        .utcoffset().total_seconds() / 86400
+        for d in dates
+    ])
+
+
+def _seconds(jds, local_midnight):
+    out = np.round((jds - local_midnight) * 86400)
+    return np.where(np.isnan(out), MISSING, out).astype('<i4')
+
+
+def build_tables(cities, start_date, days, path):
+    """Compute days x cities panchang records and write the table file"""
+    cities = [dict(c, timezone=location_timezone(c)) for c in cities]
+    first = datetime.strptime(start_date, "%Y-%m-%d").date()
+    dates = [first + timedelta(days=i) for i in range(days)]
+    day_jds = np.array([swe.julday(d.year, d.month, d.day, 0.0) for d in dates])
+
+    latitudes = np.array([c["latitude"] for c in cities])
+    longitudes = np.array([c["longitude"] for c in cities])
+    rises, sets = sunrise_sunset(day_jds, latitudes, longitudes)          # (days, cities)
+
+    offsets = {tz: _utc_offsets(dates, tz) for tz in {c["timezone"] for c in cities}}
+    offset = np.stack([offsets[c["timezone"]] for c in cities], axis=1)  # (days, cities)
+    # Clock times use the offset at local noon; elements are taken at the
+    # exact local midnight, the instant calculate_panchang uses
+    local_midnight = day_jds[:, None] - offset
+    midnights = {
+        tz: np.array([get_julian_day(d.strftime("%Y-%m-%d"), "00:00:00", tz) for d in dates])
+        for tz in offsets
+    }
+    midnight = np.stack([midnights[c["timezone"]] for c in cities], axis=1)
+
+    records = np.zeros((len(cities), days), dtype=RECORD)
+    for d, day in enumerate(dates):
+        elements = midnight_elements(day_jds[d], midnight[d])
+        periods = key_periods(rises[d], sets[d], day.weekday())
+        row = records[:, d]
+        for key in ('tithi', 'nakshatra', 'yoga', 'karana'):
+            row[key] = elements[key]
+        row['sunrise'] = _seconds(rises[d], local_midnight[d])
+        row['sunset'] = _seconds(sets[d], local_midnight[d])
+        for key, (start, end) in periods.items():
+            row[f'{key}_start'] = _seconds(start, local_midnight[d])
+            row[f'{key}_end'] = _seconds(end, local_midnight[d])
+        for key in PANCHANG_ELEMENTS:
+            row[f'{key}_end'] = _seconds(elements['ends'][key], local_midnight[d])
+
+    cities_json = json.dumps(cities, ensure_ascii=False).encode("utf-8")
+    cities_offset = RECORDS_OFFSET + records.nbytes
+    header = HEADER.pack(MAGIC, VERSION, RECORD.itemsize, len(cities), days,
+                         first.toordinal(), RECORDS_OFFSET, cities_offset)
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(header.ljust(RECORDS_OFFSET, b"\0"))
+        f.write(records.tobytes())
+        f.write(cities_json)
+    os.replace(tmp, path)
+    return path
+
+
+def _clock(seconds, fmt="%H:%M:%S"):
+    return (datetime(2000, 1, 1) + timedelta(seconds=int(seconds))).strftime(fmt)
+
+
+class PanchangTables:
+    """Read-only, memory-mapped view of a table file; lookups do no astronomy"""
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, record_size, n_cities, n_days,
+         first_ordinal, records_offset, cities_offset) = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.itemsize:
+            raise ValueError(f"{path} is not a version {VERSION} panchang table file")
+
+        self.first_date = date_cls.fromordinal(first_ordinal)
+        self.days = n_days
+        self.records = np.ndarray((n_cities, n_days), dtype=RECORD,
+                                  buffer=self._mmap, offset=records_offset)
+        self.cities = json.loads(self._mmap[cities_offset:].decode("utf-8"))
+        self._ids = {c["name"].lower(): i for i, c in enumerate(self.cities)}
+
+    def city_id(self, city):
+        if isinstance(city, (int, np.integer)):
+            if not 0 <= city < len(self.cities):
+                raise KeyError(f"City id {city} is outside the table (0-{len(self.cities) - 1})")
+            return int(city)
+        try:
+            return self._ids[city.lower()]
+        except KeyError:
+            raise KeyError(f"City {city!r} is not in this table") from None
+
+    def lookup(self, city, date):
+        """
+        Panchang for (city name or id, 'YYYY-MM-DD' or date), with the keys
+        of calculate_panchang_multi
+        """
+        city_id = self.city_id(city)
+        day = datetime.strptime(date, "%Y-%m-%d").date() if isinstance(date, str) else date
+        index = (day - self.first_date).days
+        if not 0 <= index < self.days:
+            raise KeyError(f"{day} is outside the table ({self.first_date} + {self.days} days)")
+
+        r = self.records[city_id, index]
+        midnight = datetime.combine(day, datetime.min.time())
+        panchang = {
+            'location': self.cities[city_id]['name'],
+            'tithi': tithi_entry(int(r['tithi'])),
+            'vara': calculate_vara(day.strftime("%Y-%m-%d")),
+            'nakshatra': NAKSHATRAS[r['nakshatra']],
+            'yoga': YOGA_NAMES[r['yoga']],
+            'karana': KARANA_NAMES[r['karana']],
+            'ends': {
+                key: (midnight + timedelta(seconds=int(r[f'{key}_end']))).strftime("%Y-%m-%d %H:%M:%S")
+                for key in PANCHANG_ELEMENTS
+            }
+        }
+        if r['sunrise'] == MISSING:
+            panchang['error'] = 'The Sun does not rise or set on this date'
+            return panchang
+
+        panchang.update({
+            'sunrise': _clock(r['sunrise'], "%H:%M"),
+            'sunset': _clock(r['sunset'], "%H:%M")
+        })
+        for key, segments in PERIODS.items():
+            panchang[key] = {'start': _clock(r[f'{key}_start']), 'end': _clock(r[f'{key}_end'])}
+            if segments is not None:
+                panchang[key]['period_index'] = segments[day.weekday()]
+        panchang['rahu_kaal']['note'] = "Exact Rahu Kaal timing derived from sunrise-sunset segmentation"
+        return panchang
+
+        midnight = datetime.combine(day, datetime.min.time())
+        panchang.update({
+            'sunrise': _clock(r['sunrise'], "%H:%M"),
+            'sunset': _clock(r['sunset'], "%H:%M"),
+            'rahu_kaal': {
+                'period_index': RAHU_KAAL_SEGMENT[day.weekday()],
+                'start': _clock(r['rahu_start']),
+                'end': _clock(r['rahu_end']),
+                'note': "Exact Rahu Kaal timing derived from sunrise-sunset segmentation"
+            },
+            'ends': {
+                'tithi': (midnight + timedelta(seconds=int(r['tithi_end']))).strftime("%Y-%m-%d %H:%M:%S"),
+                'nakshatra': (midnight + timedelta(seconds=int(r['nakshatra_end']))).strftime("%Y-%m-%d %H:%M:%S")
+            }
+        })
+        return panchang
+
+    def close(self):
+        self.records = None
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query prebuilt panchang tables")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Precompute tables for a city list and date range")
+    build.add_argument("--cities", help="CSV: name,latitude,longitude[,timezone] (default: built-in list)")
+    build.add_argument("--start", required=True, help="First date, YYYY-MM-DD")
+    build.add_argument("--years", type=int, default=1)
+    build.add_argument("--output", required=True)
+
+    lookup = sub.add_parser("lookup", help="Read one (city, date) record")
+    lookup.add_argument("--table", required=True)
+    lookup.add_argument("--city", required=True)
+    lookup.add_argument("--date", required=True)
+
+    args = parser.parse_args()
+    if args.command == "build":
+        import time
+        cities = read_cities(args.cities) if args.cities else DEFAULT_CITIES
+        first = datetime.strptime(args.start, "%Y-%m-%d").date()
+        # A 29 February start ends on 28 February, like any other anniversary
+        last = date_cls(first.year + args.years, first.month,
+                    min(first.day, monthrange(first.year + args.years, first.month)[1]))
+        start = time.perf_counter()
+        build_tables(cities, args.start, (last - first).days, args.output)
+        print(f"Wrote {args.output}: {len(cities)} cities x {(last - first).days} days "
+              f"({os.path.getsize(args.output):,} bytes) in {time.perf_counter() - start:.1f} s")
+    else:
+        from pprint import pprint
+        with PanchangTables(args.table) as tables:
+            pprint(tables.lookup(args.city, args.date))
+
+
+if __name__ == "__main__":
+    main()
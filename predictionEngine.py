@@ -5,33 +5,119 @@ Rule-based, deterministic prediction engine.
 NO Streamlit code should exist in this file.
 """
 
-def generate_predictions(kundli, dasha, doshas):
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BASE_DIR, "dosha"))
+sys.path.append(os.path.join(BASE_DIR, "Swiss_Ephemeris"))
+
+from fixedLongitude import RASHIS
+from ruleEngine import SIGN_LORDS, compile_rules
+
+# Confidence / outlook adjustments, each reported as a factor when it
+# applies; facts: mahadasha planet, detected dosha names, combust and
+# retrograde planets, state of the mahadasha lord
+CAREER_RULES = compile_rules([
+    {
+        "name": "Career-supporting Mahadasha",
+        "when": {"fact": ["mahadasha", ["Sun", "Mars", "Jupiter"]]},
+        "adjust": {"confidence": 10, "outlook": "Favorable",
+                   "description": "Sun, Mars or Jupiter Mahadasha supports career growth"}
+    },
+    {
+        "name": "Mangal Dosha",
+        "when": {"fact": ["doshas", ["Mangal Dosha"]]},
+        "adjust": {"confidence": -5, "description": "Mars in a Mangal Dosha house"}
+    },
+    {
+        "name": "Combust Mahadasha lord",
+        "when": {"fact": ["mahadasha_state", ["combust"]]},
+        "adjust": {"confidence": -5, "description": "The Mahadasha lord is combust (too close to the Sun)"}
+    }
+])
+
+MARRIAGE_RULES = compile_rules([
+    {
+        "name": "Marriage-supporting Mahadasha",
+        "when": {"fact": ["mahadasha", ["Venus", "Jupiter", "Moon"]]},
+        "adjust": {"confidence": 10, "outlook": "Supportive Period",
+                   "description": "Venus, Jupiter or Moon Mahadasha supports marriage"}
+    },
+    {
+        "name": "Mangal Dosha",
+        "when": {"fact": ["doshas", ["Mangal Dosha"]]},
+        "adjust": {"confidence": -10, "description": "Mars in a Mangal Dosha house"}
+    },
+    {
+        "name": "Combust Venus",
+        "when": {"fact": ["combust", ["Venus"]]},
+        "adjust": {"confidence": -5, "description": "Venus, the marriage significator, is combust"}
+    }
+])
+
+def generate_predictions(kundli, dasha, doshas, shadbala=None):
     """
     Generate structured, time-bound predictions
     based on verified Kundli, Dasha, and Dosha data.
+    With calculate_shadbala() output, factor strengths are the
+    computed strengths of the planets involved.
     """
 
     predictions = {
-        "career": generate_career_prediction(kundli, dasha, doshas),
-        "marriage": generate_marriage_prediction(kundli, dasha, doshas)
+        "career": generate_career_prediction(kundli, dasha, doshas, shadbala),
+        "marriage": generate_marriage_prediction(kundli, dasha, doshas, shadbala)
     }
 
     return predictions
 
 
-def generate_career_prediction(kundli, dasha, doshas):
-    tenth_house = kundli["houses"].get(10, [])
+def house_lord(kundli, house):
+    """Lord of the sign on a house (whole signs from the lagna)"""
+    return SIGN_LORDS[(RASHIS.index(kundli["lagna"]["rashi"]) + house - 1) % 12]
+
+
+def planet_strength(shadbala, planet, default):
+    """Shadbala strength (0..100) of a planet; default without shadbala or for the nodes"""
+    if shadbala is None or planet not in shadbala:
+        return default
+    return shadbala[planet]["strength"]
+
+
+def apply_rules(rules, kundli, dasha, doshas, confidence, outlook):
+    """
+    Base confidence and outlook with the adjustments of every rule that
+    holds, and one factor entry per applied rule
+    """
+    planets = kundli["planets"]
     mahadasha = dasha["mahadasha"]["planet"]
+    facts = {
+        "mahadasha": mahadasha,
+        "doshas": [d["name"] for d in doshas],
+        "combust": [p for p, data in planets.items() if data.get("combust")],
+        "retrograde": [p for p, data in planets.items() if data.get("retrograde")],
+        "mahadasha_state": [state for state in ("combust", "retrograde") if planets[mahadasha].get(state)]
+    }
+    factors = []
+    for rule in rules.fired(kundli, **facts):
+        adjust = rule["adjust"]
+        confidence += adjust.get("confidence", 0)
+        outlook = adjust.get("outlook", outlook)
+        factors.append({
+            "name": rule["name"],
+            "description": adjust["description"],
+            "adjustment": adjust.get("confidence", 0)
+        })
+    return confidence, outlook, factors
 
-    confidence = 70
-    outlook = "Moderately Favorable"
 
-    if mahadasha in ["Sun", "Mars", "Jupiter"]:
-        confidence += 10
-        outlook = "Favorable"
+def generate_career_prediction(kundli, dasha, doshas, shadbala=None):
+    tenth_house = kundli["houses"].get(10, [])
+    mahadasha = dasha["mahadasha"]["planet"]
 
-    if any(d["name"] == "Mangal Dosha" for d in doshas):
-        confidence -= 5
+    confidence, outlook, adjustments = apply_rules(
+        CAREER_RULES, kundli, dasha, doshas, 70, "Moderately Favorable"
+    )
 
     return {
         "area": "Career",
@@ -41,15 +127,16 @@ def generate_career_prediction(kundli, dasha, doshas):
             {
                 "name": "10th House",
                 "description": f"Planets present: {', '.join(p['planet'] for p in tenth_house) or 'None'}",
-                "strength": 70,
+                "strength": planet_strength(shadbala, house_lord(kundli, 10), 70),
                 "weight": 0.4
             },
             {
                 "name": "Current Mahadasha",
                 "description": mahadasha,
-                "strength": 75,
+                "strength": planet_strength(shadbala, mahadasha, 75),
                 "weight": 0.6
-            }
+            },
+            *adjustments
         ],
         "timeline": [
             {
@@ -71,19 +158,13 @@ def generate_career_prediction(kundli, dasha, doshas):
     }
 
 
-def generate_marriage_prediction(kundli, dasha, doshas):
+def generate_marriage_prediction(kundli, dasha, doshas, shadbala=None):
     seventh_house = kundli["houses"].get(7, [])
     mahadasha = dasha["mahadasha"]["planet"]
 
-    confidence = 65
-    outlook = "Needs Patience"
-
-    if mahadasha in ["Venus", "Jupiter", "Moon"]:
-        confidence += 10
-        outlook = "Supportive Period"
-
-    if any(d["name"] == "Mangal Dosha" for d in doshas):
-        confidence -= 10
+    confidence, outlook, adjustments = apply_rules(
+        MARRIAGE_RULES, kundli, dasha, doshas, 65, "Needs Patience"
+    )
 
     return {
         "area": "Marriage",
@@ -93,13 +174,14 @@ def generate_marriage_prediction(kundli, dasha, doshas):
             {
                 "name": "7th House",
                 "description": f"Planets present: {', '.join(p['planet'] for p in seventh_house) or 'None'}",
-                "strength": 65
+                "strength": planet_strength(shadbala, house_lord(kundli, 7), 65)
             },
             {
                 "name": "Current Mahadasha",
                 "description": mahadasha,
-                "strength": 70
-            }
+                "strength": planet_strength(shadbala, mahadasha, 70)
+            },
+            *adjustments
         ],
         "timeline": [
             {
@@ -0,0 +1,391 @@
+"""
+reportGenerator.py
+------------------
+PDF report builder (FPDF): kundli chart, planetary table, doshas,
+dasha timeline and panchang, plus a parallel batch CLI.
+NO Streamlit code should exist in this file.
+
+Everything that is identical across reports is rendered once per process
+and replayed as raw PDF content: the chart frame and the static
+"About this report" page. Fonts are registered in a fixed order so the
+cached content's font references are valid in every document.
+
+Batch usage:
+    python reportGenerator.py --input people.csv --out-dir reports --workers 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from functools import lru_cache
+
+from fpdf import FPDF
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BASE_DIR, "kundliGenerator"))
+sys.path.append(os.path.join(BASE_DIR, "dosha"))
+sys.path.append(os.path.join(BASE_DIR, "panchang"))
+
+from GenerateKundli import generate_kundli
+from doshaAnalyzer import detect_doshas
+from dashaCalculator import calculate_vimshottari_dasha, get_mahadasha_timeline
+from panchangCalculator import calculate_panchang
+from birthRecords import iter_birth_records, to_birth_input
+from kundliSvgRenderer import PLANET_ABBR, RASHI_INDEX, NORTH_CELLS, NORTH_LINES
+
+# Fonts used anywhere in a report, registered in this order in every document
+_FONTS = (("Helvetica", "", 10), ("Helvetica", "B", 10), ("Helvetica", "I", 10))
+
+CHART_X = 15
+CHART_Y = 42
+CHART_SIZE = 90
+
+ABOUT_TEXT = (
+    "How this report was generated",
+    [
+        "Planetary positions are calculated with the Swiss Ephemeris for the "
+        "exact date, time and place of birth.",
+        "Houses are counted from the Lagna (ascendant). Doshas and the "
+        "Vimshottari Dasha are derived by fixed, reproducible rules - the same "
+        "birth details always produce the same report.",
+        "Dasha dates use the simplified full-period rule from birth; consult an "
+        "astrologer for balance-of-dasha precision.",
+        "VedicAI is designed for educational and entertainment purposes. "
+        "Astrological readings should not be considered professional medical, "
+        "financial, or legal advice.",
+    ]
+)
+
+
+def _latin1(text):
+    """FPDF core fonts are Latin-1 only"""
+    return str(text).encode("latin-1", "replace").decode("latin-1")
+
+
+def _register_fonts(pdf):
+    for family, style, size in _FONTS:
+        pdf.set_font(family, style, size)
+
+
+def _new_document():
+    pdf = FPDF(format="A4")
+    pdf.set_auto_page_break(True, margin=15)
+    pdf.set_margins(15, 15, 15)
+    pdf.add_page()
+    _register_fonts(pdf)
+    return pdf
+
+
+def _capture(draw):
+    """Render draw(pdf) on a scratch document and return the raw content it emitted"""
+    pdf = _new_document()
+    pdf.font_family = ""  # force set_font inside draw() to be emitted
+    before = len(pdf.pages[pdf.page])
+    draw(pdf)
+    return pdf.pages[pdf.page][before:]
+
+
+def _replay(pdf, content):
+    """Append cached raw content to the current page"""
+    pdf.pages[pdf.page] += content
+    # The replayed content changed the graphics/font state behind FPDF's back
+    pdf.font_family = ""
+
+
+def _draw_chart_frame(pdf):
+    pdf.set_draw_color(124, 45, 18)
+    pdf.set_line_width(0.4)
+    pdf.rect(CHART_X, CHART_Y, CHART_SIZE, CHART_SIZE)
+    for (x1, y1), (x2, y2) in NORTH_LINES:
+        pdf.line(
+            CHART_X + x1 * CHART_SIZE, CHART_Y + y1 * CHART_SIZE,
+            CHART_X + x2 * CHART_SIZE, CHART_Y + y2 * CHART_SIZE
+        )
+    pdf.set_draw_color(0)
+    pdf.set_line_width(0.2)
+
+
+def _draw_about_page(pdf):
+    title, paragraphs = ABOUT_TEXT
+    pdf.set_font("Helvetica", "B", 14)
+    pdf.cell(0, 10, title, ln=1)
+    pdf.set_font("Helvetica", "", 10)
+    for paragraph in paragraphs:
+        pdf.multi_cell(0, 5, _latin1(paragraph))
+        pdf.ln(2)
+
+
+@lru_cache(maxsize=None)
+def _chart_frame_content():
+    return _capture(_draw_chart_frame)
+
+
+@lru_cache(maxsize=None)
+def _about_page_content():
+    return _capture(_draw_about_page)
+
+
+def compute_analysis(birth_datetime, birth_location, name=None, current_date=None):
+    """Run the full pipeline and return the dict consumed by build_report"""
+    kundli = generate_kundli(birth_datetime, birth_location)
+    return {
+        "birth_details": {
+            "name": name or birth_location["name"],
+            "date": birth_datetime["date"],
+            "time": birth_datetime["time"],
+            "place": birth_location["name"],
+            "latitude": birth_location["latitude"],
+            "longitude": birth_location["longitude"]
+        },
+        "kundli": kundli,
+        "doshas": detect_doshas(kundli),
+        "dasha": calculate_vimshottari_dasha(
+            kundli, current_date or datetime.now().strftime("%Y-%m-%d")
+        ),
+        "panchang": calculate_panchang(birth_datetime["date"], birth_location)
+    }
+
+
+def _heading(pdf, text):
+    pdf.set_font("Helvetica", "B", 12)
+    pdf.set_fill_color(255, 247, 237)
+    pdf.cell(0, 8, _latin1(text), ln=1, fill=True)
+    pdf.set_font("Helvetica", "", 10)
+
+
+def _draw_chart(pdf, kundli):
+    _replay(pdf, _chart_frame_content())
+    lagna_index = RASHI_INDEX[kundli["lagna"]["rashi"]]
+    houses = kundli["houses"]
+
+    for house in range(1, 13):
+        (px, py), (lx, ly) = NORTH_CELLS[house - 1]
+        pdf.set_font("Helvetica", "", 7)
+        pdf.set_text_color(154, 52, 18)
+        sign_no = str((lagna_index + house - 1) % 12 + 1)
+        pdf.text(CHART_X + lx * CHART_SIZE - 1, CHART_Y + ly * CHART_SIZE + 1, sign_no)
+
+        planets = [PLANET_ABBR[p["planet"]] for p in houses.get(house, [])]
+        pdf.set_font("Helvetica", "B", 8)
+        pdf.set_text_color(0)
+        for i in range(0, len(planets), 3):
+            text = " ".join(planets[i:i + 3])
+            line_y = CHART_Y + py * CHART_SIZE + (i // 3) * 3.5
+            pdf.text(
+                CHART_X + px * CHART_SIZE - pdf.get_string_width(text) / 2,
+                line_y, text
+            )
+
+
+def _planet_house(kundli, planet):
+    for house, planets in kundli["houses"].items():
+        if any(p["planet"] == planet for p in planets):
+            return house
+    return "-"
+
+
+def _planet_state(data):
+    """Retrograde / combust marks of a position (empty for charts without speeds)"""
+    return " ".join(mark for key, mark in (("retrograde", "Retro"), ("combust", "Combust")) if data.get(key))
+
+
+def build_report(analysis):
+    """
+    Build the PDF for one analysis dict
+    (keys: birth_details, kundli, doshas, dasha, panchang)
+    """
+    details = analysis["birth_details"]
+    kundli = analysis["kundli"]
+    panchang = analysis["panchang"]
+    dasha = analysis["dasha"]
+
+    pdf = _new_document()
+
+    # --- Page 1: chart, birth details, planets ---
+    pdf.set_font("Helvetica", "B", 18)
+    pdf.cell(0, 10, "VedicAI Kundli Report", ln=1)
+    pdf.set_font("Helvetica", "", 10)
+    pdf.cell(0, 6, _latin1(
+        f"{details['name']}  |  {details['date']} {details['time']}  |  {details['place']}"
+    ), ln=1)
+    pdf.cell(0, 6, f"Latitude {float(details['latitude']):.4f}, "
+                   f"Longitude {float(details['longitude']):.4f}", ln=1)
+
+    _draw_chart(pdf, kundli)
+
+    pdf.set_xy(CHART_X + CHART_SIZE + 10, CHART_Y)
+    side_x = pdf.get_x()
+    lines = [
+        ("Lagna", f"{kundli['lagna']['rashi']} ({kundli['lagna']['nakshatra']})"),
+        ("Moon Sign", kundli["planets"]["Moon"]["rashi"]),
+        ("Vara", panchang["vara"]),
+        ("Tithi", f"{panchang['tithi']['paksha']} {panchang['tithi']['name']}"),
+        ("Nakshatra", panchang["nakshatra"]),
+        ("Yoga", panchang["yoga"]),
+        ("Karana", panchang["karana"]),
+        ("Sunrise", panchang["sunrise"]),
+        ("Sunset", panchang["sunset"]),
+        ("Rahu Kaal", f"{panchang['rahu_kaal']['start'][:5]} - {panchang['rahu_kaal']['end'][:5]}"),
+    ]
+    for label, value in lines:
+        pdf.set_x(side_x)
+        pdf.set_font("Helvetica", "B", 10)
+        pdf.cell(25, 7, label)
+        pdf.set_font("Helvetica", "", 10)
+        pdf.cell(0, 7, _latin1(value), ln=1)
+
+    pdf.set_y(CHART_Y + CHART_SIZE + 8)
+    _heading(pdf, "Planetary Positions")
+    widths = (30, 35, 45, 25, 20, 30)
+    pdf.set_font("Helvetica", "B", 10)
+    for width, title in zip(widths, ("Planet", "Rashi", "Nakshatra", "Degrees", "House", "State")):
+        pdf.cell(width, 7, title, border="B")
+    pdf.ln()
+    pdf.set_font("Helvetica", "", 10)
+    for planet, data in kundli["planets"].items():
+        row = (
+            planet, data["rashi"], data["nakshatra"],
+            f"{data['degrees']:.2f}", str(_planet_house(kundli, planet)), _planet_state(data)
+        )
+        for width, value in zip(widths, row):
+            pdf.cell(width, 6, _latin1(value))
+        pdf.ln()
+
+    # --- Page 2: doshas and dasha ---
+    pdf.add_page()
+    _heading(pdf, "Dosha Analysis")
+    doshas = analysis["doshas"]
+    if not doshas:
+        pdf.multi_cell(0, 6, "No major doshas detected in the chart.")
+    for dosha in doshas:
+        pdf.set_font("Helvetica", "B", 10)
+        pdf.cell(0, 6, _latin1(f"{dosha['name']} - Severity: {dosha['severity']}"), ln=1)
+        pdf.set_font("Helvetica", "", 10)
+        pdf.multi_cell(0, 5, _latin1(f"{dosha['description']}. {dosha['impact']}."))
+        pdf.multi_cell(0, 5, _latin1("Remedies: " + "; ".join(dosha["remedies"])))
+        pdf.ln(2)
+
+    pdf.ln(2)
+    _heading(pdf, "Vimshottari Dasha")
+    maha = dasha["mahadasha"]
+    pdf.multi_cell(0, 6, _latin1(
+        f"Current Mahadasha: {maha['planet']} ({maha['start_date']} to {maha['end_date']}), "
+        f"{maha['years_remaining']} years remaining. "
+        f"Current Antardasha: {dasha['antardasha']['planet']}."
+    ))
+    interp = dasha.get("interpretation", {})
+    if interp.get("general"):
+        pdf.multi_cell(0, 5, _latin1(interp["general"]))
+    pdf.ln(2)
+
+    pdf.set_font("Helvetica", "B", 10)
+    for width, title in zip((35, 40, 40, 20), ("Mahadasha", "Start", "End", "Years")):
+        pdf.cell(width, 7, title, border="B")
+    pdf.ln()
+    pdf.set_font("Helvetica", "", 10)
+    for period in get_mahadasha_timeline(kundli):
+        current = period["planet"] == maha["planet"] and period["start_date"] == maha["start_date"]
+        pdf.set_font("Helvetica", "B" if current else "", 10)
+        for width, value in zip(
+            (35, 40, 40, 20),
+            (period["planet"], period["start_date"], period["end_date"], str(period["years"]))
+        ):
+            pdf.cell(width, 6, value)
+        pdf.ln()
+
+    # --- Page 3: static about page ---
+    pdf.add_page()
+    _replay(pdf, _about_page_content())
+
+    return pdf
+
+
+def render_report_pdf(analysis):
+    """PDF bytes for one analysis dict"""
+    return build_report(analysis).output(dest="S").encode("latin-1")
+
+
+def write_report(path, analysis):
+    build_report(analysis).output(path, "F")
+    return path
+
+
+# =========================
+# Batch CLI
+# =========================
+def _report_filename(index, name):
+    safe = "".join(c if c.isalnum() else "_" for c in str(name)).strip("_")[:40]
+    return f"{index:06d}_{safe or 'report'}.pdf"
+
+
+def _render_record(index, record, out_dir, current_date):
+    """Worker: compute + render one record straight to disk"""
+    birth_datetime, birth_location, name = to_birth_input(record)
+    analysis = compute_analysis(birth_datetime, birth_location, name, current_date)
+    path = os.path.join(out_dir, _report_filename(index, name))
+    write_report(path, analysis)
+    return path
+
+
+def _warm_worker():
+    _chart_frame_content()
+    _about_page_content()
+
+
+def run_batch(input_path, out_dir, workers=None, current_date=None, max_pending=None):
+    """
+    Render one PDF per input record across a process pool.
+    Reports are written by the workers as they finish; at most
+    max_pending records are in flight, so input is streamed.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 4
+    done = failed = 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker) as pool:
+        pending = {}
+
+        def drain(return_when):
+            nonlocal done, failed
+            finished, _ = wait(pending, return_when=return_when)
+            for future in finished:
+                index = pending.pop(future)
+                try:
+                    future.result()
+                    done += 1
+                except Exception as e:
+                    failed += 1
+                    print(f"[ERROR] Record {index} failed: {e}", file=sys.stderr)
+
+        for index, record in enumerate(iter_birth_records(input_path), 1):
+            if len(pending) >= max_pending:
+                drain(FIRST_COMPLETED)
+            future = pool.submit(_render_record, index, record, out_dir, current_date)
+            pending[future] = index
+        while pending:
+            drain(FIRST_COMPLETED)
+
+    elapsed = time.perf_counter() - start
+    print(f"Rendered {done} report(s), {failed} failed, in {elapsed:.1f}s -> {out_dir}")
+    return done, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render VedicAI PDF reports in bulk")
+    parser.add_argument("--input", required=True, help="CSV or JSONL birth records")
+    parser.add_argument("--out-dir", required=True, help="Directory for the PDF files")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--current-date", default=None, help="Date for the running dasha (YYYY-MM-DD)")
+    args = parser.parse_args(argv)
+
+    _, failed = run_batch(args.input, args.out_dir, args.workers, args.current_date)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
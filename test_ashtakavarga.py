@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Checks for the packed Ashtakavarga tables (dosha/ashtakavarga.py): every
+chart's BAV totals are fixed (Sun 48, Moon 49, Mars 39, Mercury 54,
+Jupiter 56, Venus 52, Saturn 39; SAV 337), and the table matches a
+house-by-house count straight from BAV_HOUSES.
+Run with pytest, or directly: python test_ashtakavarga.py
+"""
+
+import os
+import sys
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BASE_DIR, "Swiss_Ephemeris"))
+sys.path.append(os.path.join(BASE_DIR, "kundliGenerator"))
+sys.path.append(os.path.join(BASE_DIR, "dosha"))
+
+from ashtakavarga import (
+    AV_PLANETS, BAV_HOUSES, CONTRIBUTORS, SAV, ashtakavarga_batch, ashtakavarga_from_signs,
+    ashtakavarga_table, calculate_ashtakavarga, contributor_signs
+)
+from compactChart import Chart
+from fixedLongitude import FULL_CIRCLE
+from GenerateKundli import CHART_BODIES, chart_longitudes, generate_kundli
+
+EXPECTED_TOTALS = [48, 49, 39, 54, 56, 52, 39]
+EXPECTED_SAV = 337
+
+DELHI = {"name": "Delhi", "latitude": 28.6139, "longitude": 77.2090}
+BIRTHS = [("1995-08-15", "10:30:00"), ("1957-10-28", "02:30:00"), ("1989-12-17", "04:15:00"),
+          ("2004-07-16", "11:45:00"), ("2017-12-16", "04:00:00")]
+
+
+def _reference(signs):
+    """Bindus counted house by house from BAV_HOUSES"""
+    return [
+        [sum((sign - signs[c]) % 12 + 1 in BAV_HOUSES[p][name] for c, name in enumerate(CONTRIBUTORS))
+         for sign in range(12)]
+        for p in AV_PLANETS
+    ]
+
+
+def test_totals_real_charts():
+    for date, time in BIRTHS:
+        av = calculate_ashtakavarga(generate_kundli({"date": date, "time": time}, DELHI))
+        assert av[:SAV].sum(axis=1).tolist() == EXPECTED_TOTALS, date
+        assert int(av[SAV].sum()) == EXPECTED_SAV, date
+
+
+def test_totals_every_sign_combination():
+    rng = np.random.default_rng(0)
+    av = ashtakavarga_from_signs(rng.integers(0, 12, (20_000, len(CONTRIBUTORS))))
+    assert (av[:, :SAV].sum(axis=2, dtype=int) == EXPECTED_TOTALS).all()
+    assert (av[:, SAV].sum(axis=1, dtype=int) == EXPECTED_SAV).all()
+    assert (av[:, SAV] == av[:, :SAV].sum(axis=1)).all()
+
+
+def test_matches_house_by_house_count():
+    rng = np.random.default_rng(1)
+    for signs in rng.integers(0, 12, (500, len(CONTRIBUTORS))):
+        assert ashtakavarga_from_signs(signs)[:SAV].tolist() == _reference(signs)
+
+
+def test_chart_and_batch_agree():
+    kundlis = [generate_kundli({"date": date, "time": time}, DELHI) for date, time in BIRTHS]
+    batch = ashtakavarga_batch(np.stack([chart_longitudes(k) for k in kundlis]))
+    for kundli, av in zip(kundlis, batch):
+        assert np.array_equal(calculate_ashtakavarga(kundli), av)
+        assert np.array_equal(calculate_ashtakavarga(Chart.from_kundli(kundli)), av)
+        assert contributor_signs(kundli).tolist() == contributor_signs(Chart.from_kundli(kundli)).tolist()
+
+
+def test_random_longitudes_batch():
+    rng = np.random.default_rng(48)
+    longitudes = rng.integers(0, FULL_CIRCLE, (10_000, len(CHART_BODIES)), dtype=np.int32)
+    av = ashtakavarga_batch(longitudes)
+    assert av.shape == (10_000, len(CONTRIBUTORS), 12)
+    assert (av[:, :SAV].sum(axis=2, dtype=int) == EXPECTED_TOTALS).all()
+    assert (av[:, SAV].sum(axis=1, dtype=int) == EXPECTED_SAV).all()
+
+
+def test_table_keys():
+    table = ashtakavarga_table(calculate_ashtakavarga(generate_kundli(
+        {"date": BIRTHS[0][0], "time": BIRTHS[0][1]}, DELHI)))
+    assert list(table) == AV_PLANETS + ['Sarva']
+    assert [sum(table[p]) for p in AV_PLANETS] == EXPECTED_TOTALS
+    assert sum(table['Sarva']) == EXPECTED_SAV
+
+
+if __name__ == "__main__":
+    print("[TEST] Ashtakavarga totals...")
+    print("=" * 60)
+    failed = 0
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            try:
+                test()
+                print(f"✅ [PASS] {name}")
+            except Exception as e:
+                failed += 1
+                print(f"❌ [FAIL] {name}: {type(e).__name__}: {e}")
+    print("=" * 60)
+    if failed:
+        print(f"{failed} test(s) failed")
+        exit(1)
+    print("✅ All Ashtakavarga tests passed!")
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Round-trip checks for the binary chart records (chartCodec.py):
+encode_result / decode_result for current (v2) records and for version 1
+records (13 x int32 chart block, no motion), which must still decode.
+Run with pytest, or directly: python test_chart_codec.py
+"""
+
+import os
+import struct
+import sys
+from datetime import date as date_cls
+from functools import lru_cache
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BASE_DIR, "Swiss_Ephemeris"))
+sys.path.append(os.path.join(BASE_DIR, "kundliGenerator"))
+sys.path.append(os.path.join(BASE_DIR, "dosha"))
+
+from chartCodec import (
+    HAS_MOTION, HEADER, LAYOUTS, MAGIC, POSITIONS, CodecError, decode_chart, decode_result,
+    encode_error, encode_result, encode_stream, iter_records
+)
+from compactChart import PLANETS
+from GenerateKundli import generate_kundli
+from doshaAnalyzer import detect_doshas
+from dashaCalculator import calculate_vimshottari_dasha
+
+HALF_MAS = 0.5 / 3_600_000 + 1e-12
+
+
+@lru_cache(maxsize=None)
+def _results():
+    """Real charts over a spread of birth dates / places, with doshas and dasha"""
+    rng = np.random.default_rng(46)
+    results = []
+    for i in range(60):
+        birth_datetime = {
+            "date": date_cls.fromordinal(int(rng.integers(711858, 739252))).isoformat(),
+            "time": f"{rng.integers(24):02d}:{rng.integers(60):02d}:00"
+        }
+        birth_location = {"name": f"Place {i}", "latitude": float(rng.uniform(-60, 60)),
+                          "longitude": float(rng.uniform(-180, 180))}
+        kundli = generate_kundli(birth_datetime, birth_location)
+        results.append({
+            "name": f"Person {i}",
+            "kundli": kundli,
+            "doshas": detect_doshas(kundli),
+            "dasha": calculate_vimshottari_dasha(kundli, "2026-01-18")
+        })
+    return results
+
+
+def _encode(result):
+    return encode_result(result["kundli"], result["doshas"], result["dasha"], result["name"])
+
+
+def _as_v1(record):
+    """The version 1 record of the same chart: 13-int chart block, no motion"""
+    _, _, sections, length = HEADER.unpack_from(record, 0)
+    v1, v2 = LAYOUTS[1], LAYOUTS[2]
+    return (HEADER.pack(MAGIC, 1, sections & ~HAS_MOTION, length - (v2.codes - v1.codes))
+            + record[HEADER.size:v1.codes] + record[v2.codes:])
+
+
+def _assert_same_chart(decoded, kundli, motion=True):
+    for planet in PLANETS:
+        got, expected = decoded["planets"][planet], kundli["planets"][planet]
+        assert abs(got["longitude"] - expected["longitude"]) < HALF_MAS, planet
+        assert (got["rashi"], got["nakshatra"]) == (expected["rashi"], expected["nakshatra"]), planet
+        for flag in ("retrograde", "combust"):
+            assert (got[flag] == expected[flag]) if motion else flag not in got, (planet, flag)
+    assert abs(decoded["lagna"]["longitude"] - kundli["lagna"]["longitude"]) < HALF_MAS
+    assert decoded["lagna"]["rashi"] == kundli["lagna"]["rashi"]
+    assert ({h: [p["planet"] for p in ps] for h, ps in decoded["houses"].items()}
+            == {h: [p["planet"] for p in ps] for h, ps in kundli["houses"].items()})
+    for key in ("date", "time", "place"):
+        assert decoded["birth_details"][key] == kundli["birth_details"][key], key
+
+
+def test_round_trip_v2():
+    for r in _results():
+        decoded = decode_result(_encode(r))
+        assert decoded["name"] == r["name"]
+        assert decoded["doshas"] == r["doshas"]
+        assert decoded["dasha"] == r["dasha"]
+        _assert_same_chart(decoded["kundli"], r["kundli"])
+        assert detect_doshas(decoded["kundli"]) == r["doshas"]
+
+
+def test_round_trip_v1():
+    for r in _results():
+        record = _as_v1(_encode(r))
+        assert record[2] == 1 and len(record) == HEADER.unpack_from(record, 0)[3]
+        decoded = decode_result(record)
+        assert decoded["name"] == r["name"]
+        assert decoded["doshas"] == r["doshas"]
+        assert decoded["dasha"] == r["dasha"]
+        _assert_same_chart(decoded["kundli"], r["kundli"], motion=False)
+        chart, name = decode_chart(record)
+        assert name == r["name"] and not chart.has_motion
+        assert len(chart.data) == POSITIONS.size // 4
+
+
+def test_optional_sections():
+    r = _results()[0]
+    decoded = decode_result(encode_result(r["kundli"]))
+    assert decoded["name"] is None and "doshas" not in decoded and "dasha" not in decoded
+    assert decode_result(encode_result(r["kundli"], [], None, r["name"]))["doshas"] == []
+
+
+def test_error_record():
+    assert decode_result(encode_error("ValueError: bad date")) == {"error": "ValueError: bad date"}
+
+
+def test_stream_round_trip():
+    records = [_encode(r) for r in _results()] + [_as_v1(_encode(_results()[0]))]
+    assert [bytes(record) for record in iter_records(encode_stream(records))] == records
+
+
+def test_unknown_version_rejected():
+    record = bytearray(_encode(_results()[0]))
+    struct.pack_into("<B", record, 2, 99)
+    try:
+        decode_result(bytes(record))
+    except CodecError:
+        return
+    raise AssertionError("version 99 record decoded")
+
+
+if __name__ == "__main__":
+    print("[TEST] Chart record round trips...")
+    print("=" * 60)
+    failed = 0
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            try:
+                test()
+                print(f"✅ [PASS] {name}")
+            except Exception as e:
+                failed += 1
+                print(f"❌ [FAIL] {name}: {type(e).__name__}: {e}")
+    print("=" * 60)
+    if failed:
+        print(f"{failed} test(s) failed")
+        exit(1)
+    print("✅ All chart codec tests passed!")
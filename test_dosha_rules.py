@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Regression checks for the rule-based dosha detection (dosha/doshaAnalyzer.py,
+dosha/ruleEngine.py) against outputs recorded from the original hand-written
+check_mangal_dosha / check_kaal_sarp_dosha / check_sade_sati.
+Run with pytest, or directly: python test_dosha_rules.py
+"""
+
+import os
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BASE_DIR, "Swiss_Ephemeris"))
+sys.path.append(os.path.join(BASE_DIR, "kundliGenerator"))
+sys.path.append(os.path.join(BASE_DIR, "dosha"))
+
+from GenerateKundli import chart_longitudes, generate_kundli
+from compactChart import Chart
+from doshaAnalyzer import (
+    check_kaal_sarp_dosha, check_mangal_dosha, check_sade_sati, detect_doshas, detect_doshas_batch
+)
+
+DELHI = {"name": "Delhi", "latitude": 28.6139, "longitude": 77.2090}
+
+# (date, time) in Delhi -> recorded doshas: (name, severity, description,
+# cancellations for Mangal Dosha / phase for Sade Sati). Together they cover
+# every Mangal house, severity and cancellation, Kaal Sarp, each Sade Sati
+# phase and a chart with no dosha.
+BASELINE = [
+    (("1951-04-01", "15:15:00"), [
+        ('Mangal Dosha', 'Medium', 'Mars is placed in the 8th house', ['Mars in own sign (reduces severity)']),
+    ]),
+    (("1955-08-25", "14:45:00"), [
+        ('Sade Sati', 'Medium', 'Saturn in 11th house, Moon in 12th house', 'Rising Phase (12th from Moon)'),
+    ]),
+    (("1956-01-18", "01:15:00"), [
+        ('Mangal Dosha', 'High', 'Mars is placed in the 1st house', ['No major cancellations detected']),
+    ]),
+    (("1956-04-05", "17:00:00"), [
+        ('Mangal Dosha', 'Low', 'Mars is placed in the 4th house', ['Mars is exalted (reduces severity)']),
+    ]),
+    (("1957-10-28", "02:30:00"), [
+        ('Sade Sati', 'Medium', 'Saturn in 4th house, Moon in 4th house', 'Peak Phase (1st from Moon)'),
+    ]),
+    (("1958-03-11", "03:45:00"), [
+        ('Mangal Dosha', 'Medium', 'Mars is placed in the 1st house', ['Mars is exalted (reduces severity)']),
+        ('Sade Sati', 'Medium', 'Saturn in 12th house, Moon in 11th house', 'Setting Phase (2nd from Moon)'),
+    ]),
+    (("1960-09-27", "12:30:00"), [
+        ('Mangal Dosha', 'Medium', 'Mars is placed in the 7th house', ['No major cancellations detected']),
+        ('Sade Sati', 'Medium', 'Saturn in 1st house, Moon in 12th house', 'Setting Phase (2nd from Moon)'),
+    ]),
+    (("1974-12-26", "07:00:00"), [
+        ('Mangal Dosha', 'High', 'Mars is placed in the 12th house', ['No major cancellations detected']),
+    ]),
+    (("1975-02-25", "14:00:00"), [
+        ('Mangal Dosha', 'Low', 'Mars is placed in the 7th house', ['Mars is exalted (reduces severity)']),
+        ('Sade Sati', 'Medium', 'Saturn in 1st house, Moon in 2nd house', 'Rising Phase (12th from Moon)'),
+    ]),
+    (("1982-12-23", "16:45:00"), [
+        ('Mangal Dosha', 'High', 'Mars is placed in the 8th house', ['No major cancellations detected']),
+    ]),
+    (("1984-01-18", "17:30:00"), [
+        ('Mangal Dosha', 'Low', 'Mars is placed in the 4th house', ['Mars in own sign (reduces severity)']),
+    ]),
+    (("1984-05-03", "05:15:00"), [
+        ('Mangal Dosha', 'Low', 'Mars is placed in the 7th house', ['Mars in own sign (reduces severity)']),
+    ]),
+    (("1988-04-04", "15:00:00"), []),
+    (("1989-07-20", "00:45:00"), [
+        ('Mangal Dosha', 'Medium', 'Mars is placed in the 4th house', ['No major cancellations detected']),
+        ('Sade Sati', 'Medium', 'Saturn in 8th house, Moon in 9th house', 'Rising Phase (12th from Moon)'),
+    ]),
+    (("1989-12-17", "04:15:00"), [
+        ('Mangal Dosha', 'Medium', 'Mars is placed in the 1st house', ['Mars in own sign (reduces severity)']),
+    ]),
+    (("2004-07-16", "11:45:00"), [
+        ('Kaal Sarp Dosha', 'Medium to High', 'All planets positioned between Rahu and Ketu axis'),
+        ('Sade Sati', 'Medium', 'Saturn in 10th house, Moon in 9th house', 'Setting Phase (2nd from Moon)'),
+    ]),
+    (("2007-04-25", "14:45:00"), [
+        ('Mangal Dosha', 'Medium', 'Mars is placed in the 7th house', ['No major cancellations detected']),
+        ('Sade Sati', 'Medium', 'Saturn in 12th house, Moon in 12th house', 'Peak Phase (1st from Moon)'),
+    ]),
+    (("2014-11-10", "17:30:00"), [
+        ('Mangal Dosha', 'Medium', 'Mars is placed in the 8th house', ['Mars is exalted (reduces severity)']),
+    ]),
+    (("2016-10-22", "13:15:00"), [
+        ('Mangal Dosha', 'Medium', 'Mars is placed in the 12th house', ['Mars is exalted (reduces severity)']),
+    ]),
+    (("2017-12-16", "04:00:00"), [
+        ('Mangal Dosha', 'Medium', 'Mars is placed in the 12th house', ['Mars in own sign (reduces severity)']),
+        ('Kaal Sarp Dosha', 'Medium to High', 'All planets positioned between Rahu and Ketu axis'),
+        ('Sade Sati', 'Medium', 'Saturn in 2nd house, Moon in 1st house', 'Setting Phase (2nd from Moon)'),
+    ]),
+]
+
+# Complete recorded output for 2017-12-16 04:00 (all three doshas)
+BASELINE_FULL = [
+    {'name': 'Mangal Dosha',
+     'detected': True,
+     'severity': 'Medium',
+     'house': 12,
+     'description': 'Mars is placed in the 12th house',
+     'impact': 'May cause delays or challenges in marriage and relationships',
+     'remedies': ['Recite Hanuman Chalisa daily',
+                  'Fast on Tuesdays',
+                  'Donate red lentils on Tuesdays',
+                  'Visit Hanuman temple',
+                  'Wear red coral (after astrological consultation)'],
+     'cancellations': ['Mars in own sign (reduces severity)']},
+    {'name': 'Kaal Sarp Dosha',
+     'detected': True,
+     'severity': 'Medium to High',
+     'description': 'All planets positioned between Rahu and Ketu axis',
+     'impact': 'May cause obstacles, delays, and challenges in life',
+     'remedies': ['Recite Mahamrityunjaya Mantra',
+                  'Visit Kaal Sarp Dosha temples (Trimbakeshwar, Ujjain)',
+                  'Perform Kaal Sarp Dosha Puja',
+                  'Donate on Nag Panchami',
+                  'Wear Gomed (Hessonite) after consultation']},
+    {'name': 'Sade Sati',
+     'detected': True,
+     'phase': 'Setting Phase (2nd from Moon)',
+     'severity': 'Medium',
+     'description': 'Saturn in 2nd house, Moon in 1st house',
+     'impact': 'Period of challenges, tests, and karmic lessons',
+     'remedies': ['Recite Shani Stotra or Hanuman Chalisa',
+                  'Donate to the needy on Saturdays',
+                  'Feed crows and dogs',
+                  'Wear blue sapphire (only after proper consultation)',
+                  'Light mustard oil lamp on Saturdays']},
+]
+
+
+@lru_cache(maxsize=None)
+def _kundli(date, time):
+    return generate_kundli({"date": date, "time": time}, DELHI)
+
+
+def _summary(dosha):
+    if dosha['name'] == 'Mangal Dosha':
+        return (dosha['name'], dosha['severity'], dosha['description'], dosha['cancellations'])
+    if dosha['name'] == 'Sade Sati':
+        return (dosha['name'], dosha['severity'], dosha['description'], dosha['phase'])
+    return (dosha['name'], dosha['severity'], dosha['description'])
+
+
+def test_detect_doshas_matches_baseline():
+    for birth, expected in BASELINE:
+        assert [_summary(d) for d in detect_doshas(_kundli(*birth))] == expected, birth
+
+
+def test_full_output_matches_baseline():
+    assert detect_doshas(_kundli("2017-12-16", "04:00:00")) == BASELINE_FULL
+
+
+def test_mangal_house_field():
+    for birth, expected in BASELINE:
+        for dosha in detect_doshas(_kundli(*birth)):
+            if dosha['name'] == 'Mangal Dosha':
+                assert dosha['house'] == Chart.from_kundli(_kundli(*birth)).house('Mars'), birth
+
+
+def test_check_functions():
+    for birth, expected in BASELINE:
+        kundli = _kundli(*birth)
+        found = {d['name']: d for d in detect_doshas(kundli)}
+        assert check_mangal_dosha(kundli) == found.get('Mangal Dosha'), birth
+        assert check_kaal_sarp_dosha(kundli) == found.get('Kaal Sarp Dosha'), birth
+        assert check_sade_sati(kundli) == found.get('Sade Sati'), birth
+
+
+def test_chart_input_matches_dict():
+    for birth, _ in BASELINE:
+        kundli = _kundli(*birth)
+        assert detect_doshas(Chart.from_kundli(kundli)) == detect_doshas(kundli), birth
+
+
+def test_batch_matches_single():
+    kundlis = [_kundli(*birth) for birth, _ in BASELINE]
+    matrix = detect_doshas_batch(np.stack([chart_longitudes(k) for k in kundlis]))
+    for i, (birth, expected) in enumerate(BASELINE):
+        names = [d[0] for d in expected]
+        assert [name for name, hits in matrix.items() if hits[i]] == names, birth
+
+
+if __name__ == "__main__":
+    print("[TEST] Dosha rules against recorded outputs...")
+    print("=" * 60)
+    failed = 0
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            try:
+                test()
+                print(f"✅ [PASS] {name}")
+            except Exception as e:
+                failed += 1
+                print(f"❌ [FAIL] {name}: {type(e).__name__}: {e}")
+    print("=" * 60)
+    if failed:
+        print(f"{failed} test(s) failed")
+        exit(1)
+    print("✅ All dosha rule tests passed!")
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Boundary-exactness checks for the fixed-point longitude kernels
+(Swiss_Ephemeris/fixedLongitude.py) and the modules that use them.
+Run with pytest, or directly: python test_longitude_boundaries.py
+"""
+
+import os
+import sys
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BASE_DIR, "Swiss_Ephemeris"))
+sys.path.append(os.path.join(BASE_DIR, "kundliGenerator"))
+sys.path.append(os.path.join(BASE_DIR, "panchang"))
+
+from fixedLongitude import (
+    FULL_CIRCLE, MAS_PER_DEGREE, NAKSHATRA_SPAN, NAKSHATRAS, PADA_SPAN, RASHI_SPAN,
+    RASHIS, classify, house_number, karana_number, nakshatra_index, navamsa_index,
+    pada, rashi_index, tithi_number, to_mas, varga_index, yoga_index
+)
+import Swiss_Ephemeris
+import GenerateKundli
+import panchangCalculator
+
+GET_NAKSHATRA = {
+    'Swiss_Ephemeris': Swiss_Ephemeris.get_nakshatra,
+    'GenerateKundli': GenerateKundli.get_nakshatra,
+    'panchangCalculator': panchangCalculator.get_nakshatra
+}
+
+
+def test_spans_are_whole_mas():
+    assert FULL_CIRCLE == 1_296_000_000 < 2 ** 31
+    assert NAKSHATRA_SPAN * 27 == FULL_CIRCLE
+    assert PADA_SPAN * 108 == FULL_CIRCLE
+    assert RASHI_SPAN * 12 == FULL_CIRCLE
+
+
+def test_nakshatra_boundaries():
+    for k in range(27):
+        start = k * NAKSHATRA_SPAN
+        assert nakshatra_index(start) == k
+        assert nakshatra_index(start + NAKSHATRA_SPAN - 1) == k
+        assert nakshatra_index((start - 1) % FULL_CIRCLE) == (k - 1) % 27
+        # k * 13°20' as a float degree value lands on the boundary
+        assert nakshatra_index(to_mas(k * 40 / 3)) == k
+
+
+def test_truncated_constant_cases():
+    # int(26.666666 / 13.333333) == 2 put this in Krittika; it is 0.0024" short of it
+    assert NAKSHATRAS[nakshatra_index(to_mas(26.666666))] == "Bharani"
+    # int(359.9999 / 13.333333) == 27 used to raise IndexError
+    assert NAKSHATRAS[nakshatra_index(to_mas(359.9999))] == "Revati"
+    assert RASHIS[rashi_index(to_mas(359.9999))] == "Pisces"
+
+
+def test_get_nakshatra_copies_agree():
+    samples = [k * 40 / 3 + d for k in range(27) for d in (-1e-6, 0.0, 1e-6)]
+    samples += [0.0, 359.9999, 26.666666, 13.333333]
+    for longitude in samples:
+        expected = NAKSHATRAS[nakshatra_index(to_mas(longitude))]
+        for name, get_nakshatra in GET_NAKSHATRA.items():
+            assert get_nakshatra(longitude % 360) == expected, (name, longitude)
+
+
+def test_rashi_pada_navamsa_boundaries():
+    for sign in range(12):
+        start = sign * RASHI_SPAN
+        assert rashi_index(start) == sign
+        assert rashi_index(start - 1 if sign else FULL_CIRCLE - 1) == (sign - 1) % 12
+    for q in range(108):
+        start = q * PADA_SPAN
+        assert pada(start) == q % 4 + 1
+        assert pada(start + PADA_SPAN - 1) == q % 4 + 1
+        assert navamsa_index(start) == q % 12
+    # Navamsa of the first quarter of each sign: fire from Aries, earth from
+    # Capricorn, air from Libra, water from Cancer
+    assert [RASHIS[navamsa_index(s * RASHI_SPAN)] for s in range(4)] == \
+        ["Aries", "Capricorn", "Libra", "Cancer"]
+
+
+def test_vargas():
+    assert varga_index(0, 1) == 0
+    assert [varga_index(to_mas(d), 2) for d in (0, 15, 30, 45)] == [4, 3, 3, 4]
+    assert [varga_index(to_mas(d), 3) for d in (0, 10, 20, 29.9)] == [0, 4, 8, 8]
+    assert [varga_index(to_mas(d), 12) for d in (0, 2.5, 27.5, 32.5)] == [0, 1, 11, 2]
+    assert varga_index(to_mas(3 + 1 / 3), 9) == navamsa_index(PADA_SPAN)
+    # Saptamsa: Aries from Aries, Taurus from Scorpio; 30/7° parts are not whole mas
+    part = to_mas(30 / 7)
+    assert [varga_index(m, 7) for m in (0, part, part + 1, to_mas(29.99))] == [0, 0, 1, 6]
+    assert [varga_index(to_mas(30) + m, 7) for m in (0, part + 1)] == [7, 8]
+    # Trimsamsa: odd signs Mars/Saturn/Jupiter/Mercury/Venus at 5/10/18/25°, even reversed
+    assert [varga_index(to_mas(d), 30) for d in (0, 4.99, 5, 10, 18, 25, 29.99)] == [0, 0, 10, 8, 2, 6, 6]
+    assert [varga_index(to_mas(30 + d), 30) for d in (0, 5, 12, 20, 25)] == [1, 5, 11, 9, 7]
+    try:
+        varga_index(0, 5)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("D5 should be rejected")
+
+
+def test_rounding_and_wrap():
+    assert to_mas(-0.0) == 0
+    assert to_mas(360.0) == 0
+    assert to_mas(-30.0) == 330 * MAS_PER_DEGREE
+    # Rounded to the nearest mas
+    assert to_mas(0.6 / MAS_PER_DEGREE) == 1
+    assert to_mas(0.4 / MAS_PER_DEGREE) == 0
+
+
+def test_panchang_boundaries():
+    sun = to_mas(100.0)
+    assert tithi_number(to_mas(100.0), sun) == 1
+    assert tithi_number(to_mas(112.0), sun) == 2
+    assert tithi_number(to_mas(111.9999997), sun) == 1
+    assert tithi_number(to_mas(99.9999), sun) == 30
+    assert karana_number(to_mas(106.0), sun) == 1
+    # Sum overflows int32 in bulk arrays; must wrap correctly
+    moon = to_mas(np.array([359.0, 200.0]))
+    suns = to_mas(np.array([359.0, 160.0]))
+    assert yoga_index(moon, suns).tolist() == [26, 0]
+    assert panchangCalculator.calculate_yoga(26.666666, 0.0) == "Preeti"
+    assert panchangCalculator.calculate_tithi(112.0, 100.0)['number'] == 2
+
+
+def test_houses():
+    lagna = to_mas(15.0)
+    assert house_number(to_mas(15.0), lagna) == 1
+    assert house_number(to_mas(44.9999997), lagna) == 1
+    assert house_number(to_mas(45.0), lagna) == 2
+    assert house_number(to_mas(14.9999), lagna) == 12
+
+
+def test_vectorized_matches_scalar():
+    rng = np.random.default_rng(43)
+    boundaries = np.arange(0, 360, 10 / 3)
+    degrees = np.concatenate((rng.uniform(0, 360, 20000), boundaries,
+                              boundaries + 1e-7, boundaries - 1e-7))
+    mas = to_mas(degrees)
+    assert mas.dtype == np.int32
+    assert mas.min() >= 0 and mas.max() < FULL_CIRCLE
+    codes = classify(mas)
+    for i in range(0, len(degrees), 7):
+        scalar = classify(to_mas(float(degrees[i])))
+        for key, values in codes.items():
+            assert values[i] == scalar[key], (key, degrees[i])
+    for division in (1, 2, 3, 7, 9, 12, 30):
+        vector = varga_index(mas, division)
+        assert all(vector[i] == varga_index(int(mas[i]), division) for i in range(0, len(mas), 97))
+
+
+if __name__ == "__main__":
+    print("[TEST] Fixed-point longitude boundaries...")
+    print("=" * 60)
+    failed = 0
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            try:
+                test()
+                print(f"✅ [PASS] {name}")
+            except Exception as e:
+                failed += 1
+                print(f"❌ [FAIL] {name}: {type(e).__name__}: {e}")
+    print("=" * 60)
+    if failed:
+        print(f"{failed} test(s) failed")
+        exit(1)
+    print("✅ All boundary tests passed!")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Border checks for the coordinate -> time zone resolver
+(gazetteer/timezoneResolver.py): towns next to a zone boundary must get the
+zone they are in, and the raster must agree with the zone polygons.
+Run with pytest, or directly: python test_timezone_resolver.py
+"""
+
+import os
+import sys
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BASE_DIR, "gazetteer"))
+
+from timezoneResolver import load_resolver, resolve_timezone, utc_offset
+
+BORDER_TOWNS = [
+    # (name, latitude, longitude, zone)
+    ("Firozpur", 30.92, 74.61, "Asia/Kolkata"),
+    ("Kasur", 31.12, 74.45, "Asia/Karachi"),
+    ("Attari", 31.60, 74.60, "Asia/Kolkata"),
+    ("Wagah", 31.60, 74.57, "Asia/Karachi"),
+    ("Raxaul", 26.98, 84.85, "Asia/Kolkata"),
+    ("Birgunj", 27.01, 84.88, "Asia/Kathmandu"),
+    ("Petrapole", 23.04, 88.88, "Asia/Kolkata"),
+    ("Benapole", 23.04, 88.90, "Asia/Dhaka"),
+    ("El Paso", 31.76, -106.49, "America/Denver"),
+    ("Strasbourg", 48.5734, 7.7521, "Europe/Paris"),
+    ("Kehl", 48.5724, 7.8156, "Europe/Berlin"),
+    ("Basel", 47.5596, 7.5886, "Europe/Zurich"),
+]
+
+
+def test_border_towns():
+    for name, latitude, longitude, zone in BORDER_TOWNS:
+        assert resolve_timezone(latitude, longitude) == zone, name
+
+
+def test_border_towns_vectorized():
+    resolver = load_resolver()
+    latitudes = [t[1] for t in BORDER_TOWNS]
+    longitudes = [t[2] for t in BORDER_TOWNS]
+    assert list(resolver.resolve_many(latitudes, longitudes)) == [t[3] for t in BORDER_TOWNS]
+
+
+def test_border_offsets():
+    # Firozpur keeps IST; Strasbourg follows French, not Swiss, summer time (1980)
+    assert utc_offset(resolve_timezone(30.92, 74.61), "1995-08-15", "10:30:00") == 5.5
+    assert utc_offset(resolve_timezone(48.5734, 7.7521), "1980-07-01", "12:00:00") == 2.0
+    assert utc_offset("Europe/Zurich", "1980-07-01", "12:00:00") == 1.0
+
+
+def test_raster_matches_polygons():
+    resolver = load_resolver()
+    rng = np.random.default_rng(0)
+    latitudes = np.concatenate([rng.uniform(-89.9, 89.9, 50_000), rng.uniform(20, 50, 50_000)])
+    longitudes = np.concatenate([rng.uniform(-180, 180, 50_000), rng.uniform(-10, 100, 50_000)])
+    expected = resolver.finder.timezone_ids_at(lngs=longitudes, lats=latitudes)
+    assert np.array_equal(resolver.resolve_ids(latitudes, longitudes), expected)
+
+
+if __name__ == "__main__":
+    print("[TEST] Time zone resolution at borders...")
+    print("=" * 60)
+    failed = 0
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            try:
+                test()
+                print(f"✅ [PASS] {name}")
+            except Exception as e:
+                failed += 1
+                print(f"❌ [FAIL] {name}: {type(e).__name__}: {e}")
+    print("=" * 60)
+    if failed:
+        print(f"{failed} test(s) failed")
+        exit(1)
+    print("✅ All time zone tests passed!")